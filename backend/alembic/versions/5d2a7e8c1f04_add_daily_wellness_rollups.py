@@ -0,0 +1,50 @@
+"""Add daily_wellness_rollups table
+
+Revision ID: 5d2a7e8c1f04
+Revises: b41f0c2d9e7a
+Create Date: 2026-10-18 11:03:17.000000
+
+Populate it afterwards with `python -m backend.backfill_rollups`.
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '5d2a7e8c1f04'
+down_revision: Union[str, Sequence[str], None] = 'b41f0c2d9e7a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COUNTERS = (
+    ("mood_sum", sa.Float()),
+    ("mood_count", sa.Integer()),
+    ("tiredness_sum", sa.Integer()),
+    ("tiredness_count", sa.Integer()),
+    ("water_glasses", sa.Integer()),
+    ("coffee_cups", sa.Integer()),
+    ("daily_goal", sa.Integer()),
+    ("coding_minutes", sa.Integer()),
+    ("coding_sessions", sa.Integer()),
+    ("focus_minutes", sa.Integer()),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "daily_wellness_rollups",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        *[sa.Column(name, type_, nullable=False, server_default="0") for name, type_ in COUNTERS],
+    )
+    op.create_index("ix_daily_wellness_rollups_id", "daily_wellness_rollups", ["id"])
+    op.create_index("ix_daily_wellness_rollups_user_id_day", "daily_wellness_rollups", ["user_id", "day"], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_daily_wellness_rollups_user_id_day", table_name="daily_wellness_rollups")
+    op.drop_index("ix_daily_wellness_rollups_id", table_name="daily_wellness_rollups")
+    op.drop_table("daily_wellness_rollups")
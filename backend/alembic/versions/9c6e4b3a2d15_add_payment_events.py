@@ -0,0 +1,43 @@
+"""Add payment_events table
+
+Revision ID: 9c6e4b3a2d15
+Revises: 5d2a7e8c1f04
+Create Date: 2026-10-18 14:41:02.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.sql import func
+
+# revision identifiers, used by Alembic.
+revision: str = '9c6e4b3a2d15'
+down_revision: Union[str, Sequence[str], None] = '5d2a7e8c1f04'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "payment_events",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("reference", sa.String(), nullable=False),
+        sa.Column("event", sa.String(), nullable=False),
+        sa.Column("payload", sa.Text(), nullable=False),
+        sa.Column("status", sa.String(), nullable=False, server_default="pending"),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("received_at", sa.DateTime(timezone=True), server_default=func.now()),
+        sa.Column("processed_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index("ix_payment_events_id", "payment_events", ["id"])
+    op.create_index("ix_payment_events_reference_event", "payment_events", ["reference", "event"], unique=True)
+    op.create_index("ix_payment_events_status_id", "payment_events", ["status", "id"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_payment_events_status_id", table_name="payment_events")
+    op.drop_index("ix_payment_events_reference_event", table_name="payment_events")
+    op.drop_index("ix_payment_events_id", table_name="payment_events")
+    op.drop_table("payment_events")
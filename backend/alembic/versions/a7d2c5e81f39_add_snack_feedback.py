@@ -0,0 +1,40 @@
+"""Add snack_feedback table
+
+Revision ID: a7d2c5e81f39
+Revises: e3f1a7c90b62
+Create Date: 2026-10-18 19:12:44.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.sql import func
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7d2c5e81f39'
+down_revision: Union[str, Sequence[str], None] = 'e3f1a7c90b62'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "snack_feedback",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("diet", sa.String(), nullable=False),
+        sa.Column("suggestion", sa.String(), nullable=False),
+        sa.Column("likes", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("dislikes", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=func.now()),
+    )
+    op.create_index("ix_snack_feedback_id", "snack_feedback", ["id"])
+    op.create_index("ix_snack_feedback_user_id_diet_suggestion", "snack_feedback", ["user_id", "diet", "suggestion"], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_snack_feedback_user_id_diet_suggestion", table_name="snack_feedback")
+    op.drop_index("ix_snack_feedback_id", table_name="snack_feedback")
+    op.drop_table("snack_feedback")
@@ -0,0 +1,31 @@
+"""Add (user_id, created_at) indexes to log tables and user_profiles.user_id index
+
+Revision ID: b41f0c2d9e7a
+Revises: 777cfdabd5bb
+Create Date: 2026-10-18 09:12:40.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'b41f0c2d9e7a'
+down_revision: Union[str, Sequence[str], None] = '777cfdabd5bb'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+LOG_TABLES = ("mood_logs", "hydration_logs", "coding_sessions", "focus_sessions")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in LOG_TABLES:
+        op.create_index(f"ix_{table}_user_id_created_at", table, ["user_id", "created_at"])
+    op.create_index("ix_user_profiles_user_id", "user_profiles", ["user_id"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_user_profiles_user_id", table_name="user_profiles")
+    for table in LOG_TABLES:
+        op.drop_index(f"ix_{table}_user_id_created_at", table_name=table)
@@ -0,0 +1,28 @@
+"""Add next_attempt_at to payment_events
+
+Revision ID: c5b81e3d4a27
+Revises: a7d2c5e81f39
+Create Date: 2026-10-18 22:02:15.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5b81e3d4a27'
+down_revision: Union[str, Sequence[str], None] = 'a7d2c5e81f39'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table("payment_events") as batch_op:
+        batch_op.add_column(sa.Column("next_attempt_at", sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("payment_events") as batch_op:
+        batch_op.drop_column("next_attempt_at")
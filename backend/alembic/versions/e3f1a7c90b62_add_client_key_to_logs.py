@@ -0,0 +1,38 @@
+"""Add client_key idempotency column to log tables
+
+Revision ID: e3f1a7c90b62
+Revises: 9c6e4b3a2d15
+Create Date: 2026-10-18 16:05:37.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3f1a7c90b62'
+down_revision: Union[str, Sequence[str], None] = '9c6e4b3a2d15'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ("mood_logs", "hydration_logs", "coding_sessions", "focus_sessions")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    where = sa.text("client_key IS NOT NULL")
+    for table in TABLES:
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.add_column(sa.Column("client_key", sa.String(), nullable=True))
+        op.create_index(
+            f"ix_{table}_user_id_client_key", table, ["user_id", "client_key"],
+            unique=True, sqlite_where=where, postgresql_where=where,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in reversed(TABLES):
+        op.drop_index(f"ix_{table}_user_id_client_key", table_name=table)
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_column("client_key")
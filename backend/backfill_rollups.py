@@ -0,0 +1,22 @@
+# backend/backfill_rollups.py
+# Rebuilds daily_wellness_rollups from the raw log tables. Run once after the
+# daily rollups migration, or any time the rollups are suspected to be out of sync.
+#
+#   python -m backend.backfill_rollups [--user-id N]
+import argparse
+from backend.crud import rebuild_daily_rollups
+from backend.database import SessionLocal
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild daily wellness rollups from raw logs")
+    parser.add_argument("--user-id", type=int, default=None, help="Only rebuild this user's rollups")
+    args = parser.parse_args()
+    db = SessionLocal()
+    try:
+        written = rebuild_daily_rollups(db, args.user_id)
+    finally:
+        db.close()
+    print(f"Rebuilt {written} daily rollup rows")
+
+if __name__ == "__main__":
+    main()
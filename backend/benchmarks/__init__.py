@@ -0,0 +1,13 @@
+# backend/benchmarks/__init__.py
+# Standalone performance scripts, run with `python -m backend.benchmarks.<name>`.
+# They build their own throwaway SQLite database and never touch devwell.db.
+# The app binds its engines when backend.database is first imported, so this package
+# points SQLALCHEMY_DATABASE_URL at a temporary file before any script imports it,
+# and fills in the secrets the app refuses to start without.
+import os
+import tempfile
+
+os.environ["SQLALCHEMY_DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(prefix="devwell-app-"), "app.db")
+os.environ["READ_REPLICA_URLS"] = "[]"
+os.environ.setdefault("PAYSTACK_SECRET_KEY", "sk_test_benchmarks")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
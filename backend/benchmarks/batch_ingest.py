@@ -0,0 +1,79 @@
+# backend/benchmarks/batch_ingest.py
+# Rows/sec for N individual crud.create_* calls (one transaction each, as the
+# per-type /log endpoints do) vs a single crud.create_logs_batch call.
+#
+#   python -m backend.benchmarks.batch_ingest [--sizes 10,100,1000] [--repeat 3]
+import argparse
+import random
+import statistics
+import time
+from pydantic import TypeAdapter
+from backend import crud
+from backend.benchmarks.seed import make_session_factory, create_user_with_profile
+from backend.schemas import BatchEntry, MoodLogCreate, HydrationLogCreate, CodingSessionCreate, FocusSessionCreate
+
+SINGLE = {
+    "mood": (crud.create_mood_log, MoodLogCreate),
+    "hydration": (crud.create_hydration_log, HydrationLogCreate),
+    "coding": (crud.create_coding_session, CodingSessionCreate),
+    "focus": (crud.create_focus_session, FocusSessionCreate),
+}
+
+def make_entries(n: int, seed: int = 0):
+    rng = random.Random(seed)
+    entries = []
+    for i in range(n):
+        kind = rng.choice(list(SINGLE))
+        values = {
+            "mood": lambda: {"mood_score": rng.randint(1, 5), "tiredness_level": rng.randint(0, 10)},
+            "hydration": lambda: {"water_glasses": rng.randint(0, 3), "coffee_cups": rng.randint(0, 2), "daily_goal": 8},
+            "coding": lambda: {"duration_minutes": rng.randint(1, 180)},
+            "focus": lambda: {"duration_minutes": rng.randint(1, 90)},
+        }[kind]()
+        entries.append({"type": kind, "client_key": f"k{i}", **values})
+    return entries
+
+def time_single(entries) -> float:
+    engine, Session = make_session_factory()
+    with Session() as db:
+        user = create_user_with_profile(db, "single@example.com")
+        start = time.perf_counter()
+        for entry in entries:
+            create, schema = SINGLE[entry["type"]]
+            create(db, user.id, schema(**entry))
+        elapsed = time.perf_counter() - start
+    engine.dispose()
+    return elapsed
+
+def time_batch(entries) -> float:
+    engine, Session = make_session_factory()
+    with Session() as db:
+        user = create_user_with_profile(db, "batch@example.com")
+        start = time.perf_counter()
+        parsed = TypeAdapter(list[BatchEntry]).validate_python(entries)
+        crud.create_logs_batch(db, user.id, parsed)
+        elapsed = time.perf_counter() - start
+    engine.dispose()
+    return elapsed
+
+def run(sizes, repeat: int):
+    results = []
+    for size in sizes:
+        entries = make_entries(size)
+        single = statistics.median(time_single(entries) for _ in range(repeat))
+        batch = statistics.median(time_batch(entries) for _ in range(repeat))
+        results.append((size, size / single, size / batch))
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark single-row log inserts against crud.create_logs_batch")
+    parser.add_argument("--sizes", default="10,100,1000")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    sizes = [int(s) for s in args.sizes.split(",")]
+    print(f"{'entries':>8} {'single rows/s':>14} {'batch rows/s':>13} {'speedup':>8}")
+    for size, single, batch in run(sizes, args.repeat):
+        print(f"{size:>8} {single:>14.0f} {batch:>13.0f} {batch / single:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
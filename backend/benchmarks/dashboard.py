@@ -0,0 +1,43 @@
+# backend/benchmarks/dashboard.py
+# Latency of crud.get_dashboard_stats as one user's log volume grows.
+#
+#   python -m backend.benchmarks.dashboard [--sizes 10,100,1000,10000,100000] [--repeat 20]
+import argparse
+import statistics
+import time
+from backend import crud
+from backend.benchmarks.seed import make_session_factory, seed_user_logs, create_user_with_profile
+
+def run(sizes, repeat: int):
+    results = []
+    for size in sizes:
+        engine, Session = make_session_factory()
+        with Session() as db:
+            user = create_user_with_profile(db, f"bench{size}@example.com")
+            # Noise from another user so the per-user filter actually has to filter
+            other = create_user_with_profile(db, f"other{size}@example.com")
+            seed_user_logs(db, user.id, size)
+            seed_user_logs(db, other.id, size, seed=1)
+            crud.rebuild_daily_rollups(db)
+            crud.get_dashboard_stats(db, user.id)  # warm up
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                crud.get_dashboard_stats(db, user.id)
+                timings.append((time.perf_counter() - start) * 1000)
+        engine.dispose()
+        results.append((size, statistics.median(timings), max(timings)))
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark crud.get_dashboard_stats against growing log volumes")
+    parser.add_argument("--sizes", default="10,100,1000,10000,100000")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    sizes = [int(s) for s in args.sizes.split(",")]
+    print(f"{'logs/table':>12} {'median ms':>10} {'max ms':>10}")
+    for size, median, worst in run(sizes, args.repeat):
+        print(f"{size:>12} {median:>10.2f} {worst:>10.2f}")
+
+if __name__ == "__main__":
+    main()
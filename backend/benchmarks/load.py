@@ -0,0 +1,111 @@
+# backend/benchmarks/load.py
+# In-process load test of the whole app: requests go through httpx's ASGITransport into
+# backend.main.app (middleware, auth, routing, serialization, lifespan background
+# workers), with no network or server in between. Seeds users and logs (seed.py),
+# then `--concurrency` clients send `--requests` requests drawn from MIX for random
+# seeded users. Reports throughput and p50/p95/p99 per endpoint and overall.
+#
+#   python -m backend.benchmarks.load [--users 20] [--logs 500] [--concurrency 16] [--requests 2000] [--json out.json]
+import argparse
+import asyncio
+import json
+import random
+import time
+from collections import defaultdict
+import httpx
+from backend.benchmarks.seed import make_session_factory, seed_dataset
+from backend.benchmarks.timing import summarize
+from backend.database import engine
+from backend.main import app
+from backend.passwords import pwd_context
+from backend.security import create_access_token
+
+PASSWORD = "bench-password"
+
+# name -> (weight, method, path, JSON body); roughly what the pages send
+MIX = {
+    "dashboard.overview": (10, "GET", "/api/dashboard/overview", None),
+    "dashboard.stats": (5, "GET", "/api/dashboard/stats", None),
+    "mood.weekly-trends": (10, "GET", "/api/mood/weekly-trends", None),
+    "hydration.weekly-trends": (10, "GET", "/api/hydration/weekly-trends", None),
+    "coding.weekly-trends": (10, "GET", "/api/coding/weekly-trends", None),
+    "mood.latest": (10, "GET", "/api/mood/latest", None),
+    "hydration.latest": (10, "GET", "/api/hydration/latest", None),
+    "mood.log": (5, "POST", "/api/mood/log", {"mood_score": 4, "tiredness_level": 5}),
+    "hydration.log": (5, "POST", "/api/hydration/log", {"water_glasses": 1, "coffee_cups": 0, "daily_goal": 8}),
+    "coding.log": (3, "POST", "/api/coding/log", {"duration_minutes": 25}),
+    "auth.login": (1, "POST", "/api/auth/login", None),
+}
+
+async def run(users: int, logs: int, concurrency: int, requests: int, seed: int) -> dict:
+    # Seed the app's own (throwaway) database; see backend/benchmarks/__init__.py
+    _, Session = make_session_factory(engine.url.database)
+    with Session() as db:
+        user_ids = seed_dataset(db, users, logs, seed=seed, hashed_password=pwd_context.hash(PASSWORD))
+    emails = {user_id: f"user{i}@example.com" for i, user_id in enumerate(user_ids)}
+    headers = {
+        user_id: {"Authorization": f"Bearer {create_access_token({'sub': email, 'uid': user_id})}"}
+        for user_id, email in emails.items()
+    }
+    rng = random.Random(seed)
+    names = list(MIX)
+    plan = [
+        (name, rng.choice(user_ids))
+        for name in rng.choices(names, weights=[MIX[name][0] for name in names], k=requests)
+    ]
+    timings = defaultdict(list)
+    errors = defaultdict(int)
+
+    async def send(client, name, user_id):
+        _, method, path, body = MIX[name]
+        if name == "auth.login":
+            body = {"email": emails[user_id], "password": PASSWORD}
+        start = time.perf_counter()
+        response = await client.request(method, path, json=body, headers=headers[user_id])
+        elapsed = (time.perf_counter() - start) * 1000
+        if response.status_code >= 400:
+            errors[name] += 1
+        else:
+            timings[name].append(elapsed)
+
+    async def worker(client, jobs):
+        for name, user_id in jobs:
+            await send(client, name, user_id)
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://loadtest") as client:
+            for name in names:  # Warm-up: import paths, statement caches, pools
+                await send(client, name, user_ids[0])
+            timings.clear()
+            errors.clear()
+            start = time.perf_counter()
+            await asyncio.gather(*[worker(client, plan[i::concurrency]) for i in range(concurrency)])
+            elapsed = time.perf_counter() - start
+
+    results = {name: {**summarize(timings[name], elapsed), "errors": errors[name]} for name in names}
+    results["all"] = {
+        **summarize([t for name in names for t in timings[name]], elapsed),
+        "errors": sum(errors.values()),
+    }
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="In-process ASGI load test with per-endpoint throughput and latency percentiles")
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--logs", type=int, default=500, help="logs per user in each log table")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+    results = asyncio.run(run(args.users, args.logs, args.concurrency, args.requests, args.seed))
+    print(f"{'endpoint':<24} {'requests':>8} {'errors':>6} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for name, r in results.items():
+        print(f"{name:<24} {r['n']:>8} {r['errors']:>6} {r['rps']:>8.1f} {r['p50']:>8.2f} {r['p95']:>8.2f} {r['p99']:>8.2f}")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+if __name__ == "__main__":
+    main()
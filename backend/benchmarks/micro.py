@@ -0,0 +1,98 @@
+# backend/benchmarks/micro.py
+# Single-call latency of the hot read paths and auth, against a seeded database
+# (seed.seed_dataset). Handlers are called directly, without HTTP or auth:
+#   dashboard.stats         crud.get_dashboard_stats
+#   <domain>.weekly-trends  the router handler, result cache off ("uncached") and warm
+#   <domain>.latest         the router handler
+#   auth.signup/auth.login  the auth handlers, bcrypt in the password pool included
+# Each call goes to the next seeded user in turn, so the cached variants hit only once
+# every user has been seen.
+#
+#   python -m backend.benchmarks.micro [--users 20] [--logs 500] [--repeat 100] [--json out.json]
+import argparse
+import asyncio
+import json
+import os
+import time
+from fastapi import Response
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from backend import crud, passwords, result_cache
+from backend.benchmarks.seed import make_session_factory, seed_dataset
+from backend.benchmarks.timing import summarize
+from backend.routers import auth, coding, hydration, mood
+from backend.schemas import UserCreate, UserLogin
+
+PASSWORD = "bench-password"
+
+async def time_calls(Sessions, repeat: int, call):
+    # call(db, i) -> awaitable; one fresh session per call, like a request
+    timings = []
+    for i in range(repeat):
+        async with Sessions() as db:
+            start = time.perf_counter()
+            await call(db, i)
+            timings.append((time.perf_counter() - start) * 1000)
+    return summarize(timings)
+
+async def run(users: int, logs: int, repeat: int, auth_repeat: int) -> dict:
+    engine, Session = make_session_factory()
+    hashed_password = passwords.pwd_context.hash(PASSWORD)
+    with Session() as db:
+        user_ids = seed_dataset(db, users, logs, hashed_password=hashed_password)
+    path = engine.url.database
+    engine.dispose()
+
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    Sessions = async_sessionmaker(bind=async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+    user = lambda i: user_ids[i % len(user_ids)]
+    trends = {
+        "mood": mood.get_weekly_mood_trends,
+        "hydration": hydration.get_weekly_hydration_trends,
+        "coding": coding.get_weekly_coding_trends,
+    }
+    results = {}
+    results["dashboard.stats"] = await time_calls(Sessions, repeat, lambda db, i: db.run_sync(crud.get_dashboard_stats, user(i)))
+    for domain, handler in trends.items():
+        result_cache.set_backend(None)
+        results[f"{domain}.weekly-trends uncached"] = await time_calls(
+            Sessions, repeat, lambda db, i, handler=handler: handler(response=Response(), user_id=user(i), db=db))
+        result_cache.set_backend(result_cache.build_backend())
+        # Fill the cache for every user first, so only hits are timed
+        for i in range(len(user_ids)):
+            async with Sessions() as db:
+                await handler(response=Response(), user_id=user(i), db=db)
+        results[f"{domain}.weekly-trends cached"] = await time_calls(
+            Sessions, repeat, lambda db, i, handler=handler: handler(response=Response(), user_id=user(i), db=db))
+    results["mood.latest"] = await time_calls(Sessions, repeat, lambda db, i: mood.get_latest_mood(user_id=user(i), db=db))
+    results["hydration.latest"] = await time_calls(Sessions, repeat, lambda db, i: hydration.get_latest_hydration(user_id=user(i), db=db))
+
+    passwords.start()
+    try:
+        results["auth.signup"] = await time_calls(
+            Sessions, auth_repeat, lambda db, i: auth.signup(UserCreate(email=f"signup{i}@example.com", password=PASSWORD), db=db))
+        results["auth.login"] = await time_calls(
+            Sessions, auth_repeat, lambda db, i: auth.login(UserLogin(email=f"user{i % users}@example.com", password=PASSWORD), db=db))
+    finally:
+        passwords.shutdown()
+    await async_engine.dispose()
+    os.remove(path)
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-benchmarks of dashboard stats, trend/latest handlers and auth")
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--logs", type=int, default=500, help="logs per user in each log table")
+    parser.add_argument("--repeat", type=int, default=100)
+    parser.add_argument("--auth-repeat", type=int, default=10, help="calls for signup/login, which are bcrypt-bound")
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+    results = asyncio.run(run(args.users, args.logs, args.repeat, args.auth_repeat))
+    print(f"{'benchmark':<34} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for name, r in results.items():
+        print(f"{name:<34} {r['p50']:>8.2f} {r['p95']:>8.2f} {r['p99']:>8.2f}")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+# backend/benchmarks/query_plans.py
+# Checks that every hot per-user query is answered from the (user_id, created_at)
+# log indexes (plus the profile and daily rollup indexes): runs the real crud code paths against a seeded SQLite database,
+# captures the SQL they emit and inspects EXPLAIN QUERY PLAN for each statement.
+# Exits non-zero if any access to those tables is a full scan or needs a temp sort.
+#
+#   python -m backend.benchmarks.query_plans
+import sys
+from datetime import datetime, timedelta
+from sqlalchemy import event
+from backend import crud
+from backend.benchmarks.seed import make_session_factory, seed_user_logs, create_user_with_profile
+from backend.models import MoodLog, HydrationLog, CodingSession, FocusSession
+
+# table -> index every access to it must go through
+INDEXED_TABLES = {
+    "mood_logs": "ix_mood_logs_user_id_created_at",
+    "hydration_logs": "ix_hydration_logs_user_id_created_at",
+    "coding_sessions": "ix_coding_sessions_user_id_created_at",
+    "focus_sessions": "ix_focus_sessions_user_id_created_at",
+    "user_profiles": "ix_user_profiles_user_id",
+    "daily_wellness_rollups": "ix_daily_wellness_rollups_user_id_day",
+}
+
+def capture_statements(engine, fn):
+    captured = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        captured.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        fn()
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+    return captured
+
+def plan_problems(db, statement, parameters):
+    plan = [row[-1] for row in db.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)]
+    problems = []
+    for detail in plan:
+        for table, index in INDEXED_TABLES.items():
+            if detail.startswith((f"SCAN {table}", f"SEARCH {table}")) and index not in detail:
+                problems.append(detail)
+        if "USE TEMP B-TREE" in detail:
+            problems.append(detail)
+    return plan, problems
+
+def main():
+    engine, Session = make_session_factory()
+    failures = 0
+    with Session() as db:
+        user = create_user_with_profile(db, "plans@example.com")
+        seed_user_logs(db, user.id, 1000)
+        crud.rebuild_daily_rollups(db, user.id)
+        cutoff = datetime.utcnow() - timedelta(days=7)
+        hot_paths = {
+            "get_recent_mood_logs": lambda: crud.get_recent_mood_logs(db, user.id),
+            "get_recent_hydration_logs": lambda: crud.get_recent_hydration_logs(db, user.id),
+            "get_recent_coding_sessions": lambda: crud.get_recent_coding_sessions(db, user.id),
+            "get_recent_focus_sessions": lambda: crud.get_recent_focus_sessions(db, user.id),
+            "get_dashboard_stats": lambda: crud.get_dashboard_stats(db, user.id),
+            "get_daily_rollups": lambda: crud.get_daily_rollups(db, user.id),
+        }
+        for model in (MoodLog, HydrationLog, CodingSession, FocusSession):
+            hot_paths[f"weekly-trends {model.__tablename__}"] = lambda model=model: db.scalars(crud.recent_logs_query(model, user.id, cutoff)).all()
+            hot_paths[f"latest {model.__tablename__}"] = lambda model=model: db.scalar(crud.latest_log_query(model, user.id))
+            hot_paths[f"history {model.__tablename__}"] = lambda model=model: crud.get_log_history(
+                db, model, user.id, ["id", "created_at"], 50, after=(datetime.utcnow() - timedelta(days=30), 500))
+        for name, fn in hot_paths.items():
+            for statement, parameters in capture_statements(engine, fn):
+                plan, problems = plan_problems(db, statement, parameters)
+                status = "FAIL" if problems else "ok"
+                print(f"[{status}] {name}")
+                for detail in plan:
+                    print(f"       {detail}")
+                failures += bool(problems)
+    engine.dispose()
+    if failures:
+        print(f"{failures} statement(s) not using the expected indexes")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+# backend/benchmarks/rollup_check.py
+# Checks that every hydration write path leaves the same daily rollup: one user logs
+# LOGS one request at a time (crud_async.create_hydration_log), one through the
+# write-behind buffer with a flush after every FLUSH_EVERY logs (backend.hydration_buffer),
+# and one in a single batch (crud.create_logs_batch). Their rollups must match each
+# other and what rebuild_daily_rollups computes from the stored logs.
+# Exits non-zero on any difference.
+#
+#   python -m backend.benchmarks.rollup_check
+import asyncio
+import sys
+from backend import crud, hydration_buffer
+from backend.benchmarks.seed import create_user_with_profile, make_session_factory
+from backend.config import settings
+from backend.crud_async import create_hydration_log
+from backend.database import AsyncSessionLocal, engine
+from backend.schemas import BatchLogRequest, HydrationLogCreate
+
+# (water_glasses, coffee_cups, daily_goal); the goal changes during the day, both ways
+LOGS = [(1, 0, 8), (2, 1, 8), (0, 1, 10), (1, 0, 10), (3, 0, 6), (1, 1, 6), (2, 0, 8)]
+FLUSH_EVERY = 3
+
+def rollups(db, user_id: int) -> list:
+    return [
+        {"day": row.day.isoformat(), **{counter: getattr(row, counter) for counter in crud.ROLLUP_COUNTERS}}
+        for row in crud.get_daily_rollups(db, user_id, 1)
+    ]
+
+async def write(user_ids: dict) -> None:
+    for glasses, cups, goal in LOGS:
+        async with AsyncSessionLocal() as db:
+            await create_hydration_log(db, user_ids["sync"], HydrationLogCreate(water_glasses=glasses, coffee_cups=cups, daily_goal=goal))
+
+    settings.HYDRATION_WRITE_BEHIND = True
+    hydration_buffer.start()
+    try:
+        for i, (glasses, cups, goal) in enumerate(LOGS, 1):
+            await hydration_buffer.add(user_ids["write-behind"], HydrationLogCreate(water_glasses=glasses, coffee_cups=cups, daily_goal=goal))
+            if i % FLUSH_EVERY == 0:
+                await hydration_buffer.flush()
+    finally:
+        await hydration_buffer.stop()
+
+    batch = BatchLogRequest(entries=[
+        {"type": "hydration", "water_glasses": glasses, "coffee_cups": cups, "daily_goal": goal} for glasses, cups, goal in LOGS
+    ])
+    async with AsyncSessionLocal() as db:
+        await db.run_sync(crud.create_logs_batch, user_ids["batch"], batch.entries)
+
+def main():
+    _, Session = make_session_factory(engine.url.database)
+    with Session() as db:
+        user_ids = {path: create_user_with_profile(db, f"{path}@example.com").id for path in ("sync", "write-behind", "batch")}
+    asyncio.run(write(user_ids))
+
+    failures = 0
+    with Session() as db:
+        written = {path: rollups(db, user_id) for path, user_id in user_ids.items()}
+        crud.rebuild_daily_rollups(db)
+        rebuilt = {path: rollups(db, user_id) for path, user_id in user_ids.items()}
+    expected = written["sync"]
+    print(f"sync rollup: {expected}")
+    for path in user_ids:
+        for name, actual in ((path, written[path]), (f"{path} rebuilt", rebuilt[path])):
+            status = "ok" if actual == expected else "FAIL"
+            print(f"[{status}] {name}")
+            if actual != expected:
+                print(f"       {actual}")
+                failures += 1
+    if failures:
+        print(f"{failures} rollup(s) differ from the synchronous path")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
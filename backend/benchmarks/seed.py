@@ -0,0 +1,96 @@
+# backend/benchmarks/seed.py
+# Synthetic data for the benchmarks. As a script it fills a SQLite file with N users
+# (with profiles) x M logs per log table, reproducibly for a given --seed:
+#
+#   python -m backend.benchmarks.seed --users 100 --logs 1000 [--days 30] [--db path]
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import List, Optional
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+from backend import crud
+from backend.database import Base
+from backend.models import User, MoodLog, HydrationLog, CodingSession, FocusSession, UserProfile
+
+DIETS = ["vegetarian", "vegan", "protein-focused", "balanced", "other"]
+
+def make_session_factory(path: str = None):
+    """Create a fresh SQLite database with the full schema and return (engine, sessionmaker)."""
+    if path is None:
+        path = os.path.join(tempfile.mkdtemp(prefix="devwell-bench-"), "bench.db")
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    return engine, sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+def seed_user_logs(db, user_id: int, logs_per_table: int, days: int = 365, seed: int = 0):
+    """Insert `logs_per_table` rows into each log table for one user, spread over `days`."""
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+
+    def stamp():
+        return now - timedelta(seconds=rng.randrange(days * 86400))
+
+    db.execute(insert(MoodLog), [
+        {"user_id": user_id, "mood_score": rng.randint(1, 5), "tiredness_level": rng.choice([None, rng.randint(0, 10)]), "created_at": stamp()}
+        for _ in range(logs_per_table)
+    ])
+    db.execute(insert(HydrationLog), [
+        {"user_id": user_id, "water_glasses": rng.randint(0, 3), "coffee_cups": rng.randint(0, 2), "daily_goal": 8, "created_at": stamp()}
+        for _ in range(logs_per_table)
+    ])
+    db.execute(insert(CodingSession), [
+        {"user_id": user_id, "duration_minutes": rng.randint(1, 180), "created_at": stamp()}
+        for _ in range(logs_per_table)
+    ])
+    db.execute(insert(FocusSession), [
+        {"user_id": user_id, "duration_minutes": rng.randint(1, 90), "created_at": stamp()}
+        for _ in range(logs_per_table)
+    ])
+    db.commit()
+
+def create_user_with_profile(db, email: str, diet_preference: str = "balanced", hashed_password: str = "not-a-real-hash") -> User:
+    user = User(email=email, hashed_password=hashed_password)
+    db.add(user)
+    db.flush()
+    db.add(UserProfile(
+        user_id=user.id, nickname=email.split("@")[0], timezone="UTC",
+        work_hours_start="09:00", work_hours_end="17:00", coding_style="pomodoro",
+        wellness_goals="hydration", diet_preference=diet_preference, reminder_frequency="balanced",
+    ))
+    db.commit()
+    return user
+
+def seed_dataset(db, users: int, logs_per_table: int, days: int = 30, seed: int = 0, hashed_password: Optional[str] = None) -> List[int]:
+    """Create users user0@example.com.. with profiles (diets in rotation), `logs_per_table`
+    logs per table each over the last `days`, and their rollups. Returns the user ids.
+    Pass a real `hashed_password` for benchmarks that log in."""
+    user_ids = []
+    for i in range(users):
+        user = create_user_with_profile(db, f"user{i}@example.com", DIETS[i % len(DIETS)], hashed_password or "not-a-real-hash")
+        seed_user_logs(db, user.id, logs_per_table, days=days, seed=seed + i)
+        user_ids.append(user.id)
+    crud.rebuild_daily_rollups(db)
+    return user_ids
+
+def main():
+    parser = argparse.ArgumentParser(description="Fill a SQLite database with synthetic users, profiles and logs")
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--logs", type=int, default=1000, help="logs per user in each of the four log tables")
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--db", help="SQLite file to create (default: a new temporary file)")
+    args = parser.parse_args()
+    path = args.db or os.path.join(tempfile.mkdtemp(prefix="devwell-seed-"), "seed.db")
+    engine, Session = make_session_factory(path)
+    start = time.perf_counter()
+    with Session() as db:
+        seed_dataset(db, args.users, args.logs, args.days, args.seed)
+    engine.dispose()
+    print(f"{args.users} users x {args.logs} logs/table in {time.perf_counter() - start:.1f}s -> {path}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+# backend/benchmarks/serialization.py
+# Cost of producing a /weekly-trends style JSON body from N mood logs:
+#   default  - ORM objects, response_model validation (from_attributes), stdlib json
+#              (what FastAPI does for `response_model=List[MoodLogOut]`)
+#   adapter  - column rows validated once by a TypeAdapter, dumped by pydantic-core
+#   fast     - column rows trusted as-is and rendered by orjson (backend.fast_json)
+# Reports query+serialize and serialize-only times.
+#
+#   python -m backend.benchmarks.serialization [--sizes 10,1000,10000] [--repeat 20]
+import argparse
+import json
+import statistics
+import time
+from datetime import datetime, timedelta
+from typing import List
+import orjson
+from pydantic import TypeAdapter
+from backend import crud, fast_json
+from backend.benchmarks.seed import make_session_factory, seed_user_logs, create_user_with_profile
+from backend.models import MoodLog
+from backend.schemas import MoodLogOut
+
+ADAPTER = TypeAdapter(List[MoodLogOut])
+
+def load_orm(db, user_id, cutoff):
+    return db.scalars(crud.recent_logs_query(MoodLog, user_id, cutoff)).all()
+
+def load_rows(db, user_id, cutoff):
+    return fast_json.rows(db.execute(crud.recent_logs_query(MoodLog, user_id, cutoff, fast_json.columns(MoodLogOut))))
+
+def render_default(logs) -> bytes:
+    validated = ADAPTER.validate_python(logs, from_attributes=True)
+    return json.dumps(ADAPTER.dump_python(validated, mode="json")).encode()
+
+def render_adapter(rows) -> bytes:
+    return ADAPTER.dump_json(ADAPTER.validate_python(rows))
+
+def render_fast(rows) -> bytes:
+    return orjson.dumps(rows)
+
+PATHS = {
+    "default": (load_orm, render_default),
+    "adapter": (load_rows, render_adapter),
+    "fast": (load_rows, render_fast),
+}
+
+def time_path(db, user_id, cutoff, load, render, repeat: int):
+    total, serialize = [], []
+    for _ in range(repeat):
+        db.expire_all()
+        start = time.perf_counter()
+        data = load(db, user_id, cutoff)
+        loaded = time.perf_counter()
+        render(data)
+        end = time.perf_counter()
+        total.append((end - start) * 1000)
+        serialize.append((end - loaded) * 1000)
+    return statistics.median(total), statistics.median(serialize)
+
+def run(sizes, repeat: int):
+    results = []
+    for size in sizes:
+        engine, Session = make_session_factory()
+        with Session() as db:
+            user = create_user_with_profile(db, f"ser{size}@example.com")
+            seed_user_logs(db, user.id, size, days=6)
+            cutoff = datetime.utcnow() - timedelta(days=7)
+            for name, (load, render) in PATHS.items():
+                render(load(db, user.id, cutoff))  # warm up
+                results.append((size, name, *time_path(db, user.id, cutoff, load, render, repeat)))
+        engine.dispose()
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark JSON serialization paths for list endpoints")
+    parser.add_argument("--sizes", default="10,1000,10000")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    sizes = [int(s) for s in args.sizes.split(",")]
+    print(f"{'rows':>6} {'path':>8} {'total ms':>9} {'serialize ms':>13}")
+    for size, name, total, serialize in run(sizes, args.repeat):
+        print(f"{size:>6} {name:>8} {total:>9.2f} {serialize:>13.2f}")
+
+if __name__ == "__main__":
+    main()
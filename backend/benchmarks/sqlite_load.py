@@ -0,0 +1,91 @@
+# backend/benchmarks/sqlite_load.py
+# Concurrent write/read load against SQLite through the async crud layer, with
+# SQLite's defaults ("baseline") and with SQLITE_PRAGMAS plus the single-writer
+# queue ("tuned"). Reports write throughput and write/read latency percentiles.
+#
+#   python -m backend.benchmarks.sqlite_load [--writers 32] [--writes 50] [--readers 8]
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from backend import crud, crud_async, write_queue
+from backend.benchmarks.seed import make_session_factory, create_user_with_profile
+from backend.benchmarks.timing import percentile
+from backend.config import settings
+from backend.database import apply_sqlite_pragmas
+from backend.schemas import MoodLogCreate
+
+PROFILES = {
+    "baseline": ({}, False),
+    "tuned": (settings.SQLITE_PRAGMAS, True),
+}
+
+async def run_profile(pragmas, single_writer: bool, writers: int, writes: int, readers: int):
+    path = os.path.join(tempfile.mkdtemp(prefix="devwell-load-"), "load.db")
+    engine, Session = make_session_factory(path)
+    with Session() as db:
+        user_ids = [create_user_with_profile(db, f"load{i}@example.com").id for i in range(writers)]
+    engine.dispose()
+
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}", pool_size=writers + readers)
+    apply_sqlite_pragmas(async_engine.sync_engine, pragmas)
+    Sessions = async_sessionmaker(bind=async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+    write_queue.start(single_writer)
+    write_latencies, read_latencies, errors = [], [], 0
+    done = asyncio.Event()
+
+    async def writer(user_id: int):
+        nonlocal errors
+        for i in range(writes):
+            start = time.perf_counter()
+            try:
+                async with Sessions() as db:
+                    await crud_async.create_mood_log(db, user_id, MoodLogCreate(mood_score=i % 5, tiredness_level=i % 10))
+                write_latencies.append((time.perf_counter() - start) * 1000)
+            except Exception:
+                errors += 1
+
+    async def reader(user_id: int):
+        nonlocal errors
+        while not done.is_set():
+            start = time.perf_counter()
+            try:
+                async with Sessions() as db:
+                    await db.run_sync(crud.get_dashboard_stats, user_id)
+                read_latencies.append((time.perf_counter() - start) * 1000)
+            except Exception:
+                errors += 1
+
+    reader_tasks = [asyncio.create_task(reader(user_ids[i % writers])) for i in range(readers)]
+    start = time.perf_counter()
+    await asyncio.gather(*[writer(user_id) for user_id in user_ids])
+    elapsed = time.perf_counter() - start
+    done.set()
+    await asyncio.gather(*reader_tasks)
+    await write_queue.stop()
+    await async_engine.dispose()
+    return {
+        "writes/s": len(write_latencies) / elapsed,
+        "write p50": statistics.median(write_latencies) if write_latencies else float("nan"),
+        "write p99": percentile(write_latencies, 0.99),
+        "read p99": percentile(read_latencies, 0.99),
+        "reads": len(read_latencies),
+        "errors": errors,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="SQLite concurrent write/read load: default settings vs tuned pragmas and single writer")
+    parser.add_argument("--writers", type=int, default=32)
+    parser.add_argument("--writes", type=int, default=50)
+    parser.add_argument("--readers", type=int, default=8)
+    args = parser.parse_args()
+    print(f"{'profile':>9} {'writes/s':>9} {'write p50':>10} {'write p99':>10} {'read p99':>9} {'reads':>6} {'errors':>6}")
+    for name, (pragmas, single_writer) in PROFILES.items():
+        r = asyncio.run(run_profile(pragmas, single_writer, args.writers, args.writes, args.readers))
+        print(f"{name:>9} {r['writes/s']:>9.0f} {r['write p50']:>8.1f}ms {r['write p99']:>8.1f}ms {r['read p99']:>7.1f}ms {r['reads']:>6} {r['errors']:>6}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+# backend/benchmarks/suite.py
+# The perf suite: runs micro.py and load.py, each in its own process so neither
+# inherits the other's caches or pools, and compares the results with baselines.json.
+# Each benchmark runs --runs times and keeps the best value of every metric, which
+# filters out most scheduler noise. Gated metrics are p50 for micro-benchmarks (one
+# call at a time) and p95 and throughput for load endpoints; metrics from fewer than
+# MIN_SAMPLES calls are reported but not gated. A metric more than --tolerance worse
+# than its baseline (latency also at least MIN_SLOWDOWN_MS slower), or any new error,
+# fails the run (exit 1).
+# Baselines only mean something on the machine that recorded them: after moving to a
+# new machine, or after an intended change in performance, record them again.
+#
+#   python -m backend.benchmarks.suite [--runs 3] [--tolerance 0.3]
+#   python -m backend.benchmarks.suite --save-baseline
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+BASELINES = Path(__file__).with_name("baselines.json")
+# Arguments are part of the baseline: results from other sizes are not comparable
+BENCHMARKS = {
+    "micro": ["--users", "20", "--logs", "500", "--repeat", "100", "--auth-repeat", "10"],
+    "load": ["--users", "20", "--logs", "500", "--concurrency", "16", "--requests", "1000"],
+}
+# Latency percentile gated per benchmark
+GATES = {"micro": "p50", "load": "p95"}
+# Differences this small are timer and scheduler noise, whatever the ratio
+MIN_SLOWDOWN_MS = 1.0
+# Percentiles of fewer requests than this are reported but not gated
+MIN_SAMPLES = 50
+
+def run_benchmark(name: str, args) -> dict:
+    fd, path = tempfile.mkstemp(suffix=".json")
+    os.close(fd)
+    try:
+        subprocess.run([sys.executable, "-m", f"backend.benchmarks.{name}", *args, "--json", path], check=True)
+        with open(path) as f:
+            return json.load(f)
+    finally:
+        os.remove(path)
+
+def best_of(runs) -> dict:
+    # Lowest latencies and errors, highest throughput, per metric across runs
+    best = {}
+    for metric in runs[0]:
+        values = [run[metric] for run in runs]
+        best[metric] = {key: (max if key == "rps" else min)(value[key] for value in values) for key in values[0]}
+    return best
+
+def regressions(name: str, current: dict, baseline: dict, tolerance: float):
+    gate = GATES[name]
+    for metric, base in baseline.items():
+        now = current.get(metric)
+        if now is None:
+            yield f"{name}/{metric}: missing from this run"
+            continue
+        if base["n"] >= MIN_SAMPLES:
+            if now[gate] > base[gate] * (1 + tolerance) and now[gate] - base[gate] >= MIN_SLOWDOWN_MS:
+                yield f"{name}/{metric}: {gate} {now[gate]:.2f}ms, baseline {base[gate]:.2f}ms"
+            if "rps" in base and now["rps"] < base["rps"] * (1 - tolerance):
+                yield f"{name}/{metric}: {now['rps']:.1f} req/s, baseline {base['rps']:.1f} req/s"
+        if now.get("errors", 0) > base.get("errors", 0):
+            yield f"{name}/{metric}: {now['errors']} errors, baseline {base.get('errors', 0)}"
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the benchmark suite and fail on regressions against stored baselines")
+    parser.add_argument("--runs", type=int, default=3, help="runs per benchmark; the best value of each metric counts")
+    parser.add_argument("--tolerance", type=float, default=0.3, help="allowed relative slowdown (0.3 = 30%%)")
+    parser.add_argument("--save-baseline", action="store_true", help=f"record this run as the baseline in {BASELINES.name}")
+    args = parser.parse_args()
+    results = {
+        name: best_of([run_benchmark(name, bench_args) for _ in range(args.runs)])
+        for name, bench_args in BENCHMARKS.items()
+    }
+
+    if args.save_baseline:
+        with open(BASELINES, "w") as f:
+            json.dump({"args": BENCHMARKS, "results": results}, f, indent=2)
+            f.write("\n")
+        print(f"Saved baseline to {BASELINES}")
+        return
+    if not BASELINES.exists():
+        sys.exit(f"No {BASELINES.name}; record one with --save-baseline")
+    with open(BASELINES) as f:
+        stored = json.load(f)
+    if stored["args"] != BENCHMARKS:
+        sys.exit(f"{BASELINES.name} was recorded with different benchmark arguments; record it again")
+    failures = [
+        failure
+        for name, baseline in stored["results"].items()
+        for failure in regressions(name, results[name], baseline, args.tolerance)
+    ]
+    for failure in failures:
+        print(f"REGRESSION {failure}")
+    if failures:
+        sys.exit(1)
+    print(f"No regressions beyond {args.tolerance:.0%} of the baseline")
+
+if __name__ == "__main__":
+    main()
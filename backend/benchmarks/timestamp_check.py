@@ -0,0 +1,60 @@
+# backend/benchmarks/timestamp_check.py
+# Checks that models.Timestamp keeps SQLite's text timestamps in chronological order
+# when whole-second values (server default, or bound with no fraction) and values with
+# a fraction are mixed: ORDER BY created_at matches the datetimes' order, equal
+# instants compare equal however they were bound, and keyset pagination
+# (crud.get_log_history) visits every row exactly once, newest first.
+# Exits non-zero on any difference.
+#
+#   python -m backend.benchmarks.timestamp_check
+import sys
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import select
+from backend import crud
+from backend.benchmarks.seed import create_user_with_profile, make_session_factory
+from backend.models import MoodLog
+
+BASE = datetime(2026, 1, 1, 12, 0, 0)
+OFFSETS_US = [0, 0, 1, 500000, 999999, 1000000, -1, -999999, -1000000, 1500000]
+
+def main():
+    engine, Session = make_session_factory()
+    failures = []
+    with Session() as db:
+        user = create_user_with_profile(db, "timestamps@example.com")
+        stamps = [BASE + timedelta(microseconds=offset) for offset in OFFSETS_US]
+        stamps.append(BASE.replace(tzinfo=timezone.utc))  # Aware, same instant as BASE
+        db.add_all([MoodLog(user_id=user.id, mood_score=3, created_at=stamp) for stamp in stamps])
+        db.add(MoodLog(user_id=user.id, mood_score=3))  # CURRENT_TIMESTAMP server default
+        # Text as CURRENT_TIMESTAMP writes it (strings are stored as given), same instant as BASE
+        db.add(MoodLog(user_id=user.id, mood_score=3, created_at=BASE.strftime("%Y-%m-%d %H:%M:%S")))
+        db.commit()
+
+        rows = db.execute(select(MoodLog.id, MoodLog.created_at).where(MoodLog.user_id == user.id).order_by(MoodLog.created_at, MoodLog.id)).all()
+        if [row.id for row in rows] != [row.id for row in sorted(rows, key=lambda row: (row.created_at, row.id))]:
+            failures.append(f"ORDER BY created_at is not chronological: {[row.created_at.isoformat() for row in rows]}")
+
+        equal = db.scalars(select(MoodLog.id).where(MoodLog.user_id == user.id, MoodLog.created_at == BASE)).all()
+        if len(equal) != 4:
+            failures.append(f"{len(equal)} rows equal to {BASE.isoformat()}, expected 4")
+
+        paged, after = [], None
+        for _ in range(len(rows)):  # A cursor that fails to advance would loop forever
+            page = crud.get_log_history(db, MoodLog, user.id, ["id", "created_at"], 2, after=after)
+            paged.extend((item["created_at"], item["id"]) for item in page.items)
+            if page.next_cursor is None:
+                break
+            after = (page.items[-1]["created_at"], page.items[-1]["id"])
+        expected = sorted(((row.created_at, row.id) for row in rows), reverse=True)
+        if paged != expected:
+            failures.append(f"Keyset pagination returned {len(paged)} rows out of order or repeated, expected {len(expected)}")
+    engine.dispose()
+
+    for failure in failures:
+        print(f"[FAIL] {failure}")
+    if failures:
+        sys.exit(1)
+    print(f"[ok] {len(rows)} timestamps with and without fractions sort, compare and paginate in order")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,21 @@
+# backend/benchmarks/timing.py
+# Latency summaries shared by the benchmark scripts. Timings are in milliseconds.
+import statistics
+from typing import List, Optional
+
+def percentile(values, p: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))] if values else float("nan")
+
+def summarize(timings: List[float], elapsed: Optional[float] = None) -> dict:
+    """p50/p95/p99/max of `timings`, plus requests per second when the wall time is given."""
+    summary = {
+        "n": len(timings),
+        "p50": statistics.median(timings) if timings else float("nan"),
+        "p95": percentile(timings, 0.95),
+        "p99": percentile(timings, 0.99),
+        "max": max(timings) if timings else float("nan"),
+    }
+    if elapsed is not None:
+        summary["rps"] = len(timings) / elapsed if elapsed > 0 else 0.0
+    return summary
@@ -1,11 +1,124 @@
 # backend/config.py
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from typing import List, Optional
+from typing import Dict, List, Optional
 import os
 
 class Settings(BaseSettings):
     SECRET_KEY: str = os.getenv("SECRET_KEY", os.urandom(32).hex())  # Secure default
     SQLALCHEMY_DATABASE_URL: str = os.getenv("SQLALCHEMY_DATABASE_URL", "sqlite:///./devwell.db")
+    # Async driver URL; derived from SQLALCHEMY_DATABASE_URL when unset (sqlite -> aiosqlite, postgresql -> asyncpg)
+    ASYNC_DATABASE_URL: Optional[str] = os.getenv("ASYNC_DATABASE_URL")
+
+    # Connection pool per engine (sync and async) and per worker process, so the
+    # database sees up to workers * 2 * (DB_POOL_SIZE + DB_MAX_OVERFLOW) connections.
+    # Pre-ping, recycle and the statement timeout only apply to network databases;
+    # DB_STATEMENT_TIMEOUT_MS = 0 disables the timeout (Postgres statement_timeout).
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT_SECONDS: float = 30.0
+    DB_POOL_PRE_PING: bool = True
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_CONNECT_TIMEOUT_SECONDS: int = 10
+    DB_STATEMENT_TIMEOUT_MS: int = 15000
+
+    # Read replicas for read-only endpoints (see backend/replicas.py); empty means
+    # everything uses the primary. Sync or async URLs; each gets its own pool.
+    # A user who wrote within READ_YOUR_WRITES_SECONDS keeps reading from the primary;
+# set it above the replicas' worst lag, since ETags rely on it too.
+    READ_REPLICA_URLS: List[str] = []
+    READ_REPLICA_HEALTH_SECONDS: float = 10.0
+    READ_YOUR_WRITES_SECONDS: float = 5.0
+    READ_YOUR_WRITES_MAX_USERS: int = 100000
+
+    # Per-user result cache for dashboard/trend reads (see backend/result_cache.py):
+    # "memory", "redis" (needs the redis package and REDIS_URL) or "none"
+    RESULT_CACHE_BACKEND: str = "memory"
+    RESULT_CACHE_TTL_SECONDS: float = 60.0
+    RESULT_CACHE_MAX_USERS: int = 10000
+    REDIS_URL: Optional[str] = None
+    # Users whose data version (see backend/user_versions.py) is remembered; beyond
+    # that the least recently used are forgotten and get fresh ETags
+    USER_VERSIONS_MAX_USERS: int = 100000
+
+    # SQLite only (see backend/database.py). PRAGMAs run on every new connection; an
+    # empty dict keeps SQLite's defaults. WAL lets readers run while a write commits.
+    SQLITE_PRAGMAS: Dict[str, str] = {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "busy_timeout": "5000",
+        "mmap_size": "268435456",
+        "cache_size": "-65536",  # KiB when negative, i.e. 64 MiB
+    }
+    # Funnel async writes through one queue (backend/write_queue.py) instead of
+    # letting concurrent requests fight over SQLite's single write lock
+    SQLITE_SINGLE_WRITER: bool = True
+    SQLITE_WRITE_QUEUE_SIZE: int = 1000
+
+    # Resolved User rows cached by id for handlers that need the full object
+    USER_CACHE_SIZE: int = 1024
+    USER_CACHE_TTL_SECONDS: int = 300
+
+    # Decoded JWT claims cached by token hash until the token expires
+    TOKEN_CACHE_SIZE: int = 4096
+
+    # bcrypt process pool; requests beyond MAX_PENDING queued hashes get a 503
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 32
+
+    # Logging (see backend/logging_config.py). LOG_SAMPLE_RATES maps a logger name
+    # prefix to the fraction of DEBUG/INFO records kept, e.g. {"backend.routers.mood": 0.1}
+    LOG_LEVEL: str = "INFO"
+    LOG_JSON: bool = True
+    LOG_QUEUE_SIZE: int = 10000
+    LOG_SAMPLE_RATES: Dict[str, float] = {}
+
+    # Paystack HTTP client (see backend/paystack.py)
+    PAYSTACK_API_URL: str = "https://api.paystack.co"
+    PAYSTACK_CONNECT_TIMEOUT: float = 3.0
+    PAYSTACK_READ_TIMEOUT: float = 10.0
+    PAYSTACK_MAX_CONNECTIONS: int = 20
+    PAYSTACK_VERIFY_RETRIES: int = 2
+    PAYSTACK_RETRY_BACKOFF: float = 0.25
+
+    # Webhook events are handled in batches by a background worker. A failed event is
+    # retried after PAYMENT_EVENT_RETRY_BASE_SECONDS, doubling per attempt up to the max.
+    PAYMENT_EVENT_BATCH_SIZE: int = 100
+    PAYMENT_EVENT_POLL_SECONDS: float = 5.0
+    PAYMENT_EVENT_MAX_ATTEMPTS: int = 5
+    PAYMENT_EVENT_RETRY_BASE_SECONDS: float = 30.0
+    PAYMENT_EVENT_RETRY_MAX_SECONDS: float = 3600.0
+
+    # Write-behind mode for /api/hydration/log (see backend/hydration_buffer.py)
+    HYDRATION_WRITE_BEHIND: bool = False
+    HYDRATION_FLUSH_SECONDS: float = 2.0
+    HYDRATION_BUFFER_MAX_ENTRIES: int = 10000
+
+    # /suggest-snack (see backend/snacks.py). The file is re-read when its mtime changes;
+    # sessions of at least SNACK_MEAL_AFTER_MINUTES get meal-sized suggestions.
+    SNACKS_FILE: Optional[str] = None  # Defaults to backend/snacks.json
+    SNACKS_RELOAD_SECONDS: float = 5.0
+    SNACK_MEAL_AFTER_MINUTES: int = 90
+
+    # /log-feedback and suggestion ranking (see backend/snack_feedback.py)
+    SNACK_FEEDBACK_FLUSH_SECONDS: float = 5.0
+    SNACK_FEEDBACK_MAX_PENDING: int = 10000
+    SNACK_BANDIT_PRIOR_WEIGHT: float = 10.0  # Most votes other users' feedback counts as
+
+    # Live updates over SSE (see backend/events.py). Streams that stay silent get a
+    # keepalive comment, which is also when a closed connection is noticed.
+    EVENTS_QUEUE_SIZE: int = 100
+    EVENTS_MAX_STREAMS_PER_USER: int = 5
+    EVENTS_KEEPALIVE_SECONDS: float = 15.0
+    EVENTS_RETRY_SECONDS: float = 3.0
+    EVENTS_MAX_STREAM_SECONDS: float = 300.0
+
+    # Metrics (see backend/metrics.py): Prometheus text on GET /metrics and a
+    # Server-Timing header on every response. Queries slower than SLOW_QUERY_MS are
+    # logged at WARNING (0 turns the log off).
+    METRICS_ENABLED: bool = True
+    SERVER_TIMING: bool = True
+    SLOW_QUERY_MS: float = 200.0
+    METRICS_LATENCY_BUCKETS: List[float] = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0]
 
     # ALLOWED_ORIGINS: List[str] = ["https://aidevwell.netlify.app"]
     ALLOWED_ORIGINS: List[str] = ["http://localhost:5173"]
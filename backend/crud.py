@@ -1,34 +1,175 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_
-from datetime import datetime, timedelta
-from backend.models import User, MoodLog, HydrationLog, CodingSession, FocusSession, UserProfile
-from passlib.context import CryptContext
-from backend.schemas import MoodLogCreate, HydrationLogCreate, CodingSessionCreate, FocusSessionCreate, DashboardResponse, DashboardStat, UserProfileCreate
-from typing import Optional, List
+from sqlalchemy import func, and_, or_, select, delete, case, cast, Float, Date
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from datetime import date, datetime, timedelta, timezone
+from backend.models import User, MoodLog, HydrationLog, CodingSession, FocusSession, UserProfile, DailyWellnessRollup, PaymentEvent, SnackFeedback
+from backend import snacks
+from backend.cache import TTLCache
+from backend.config import settings
+from backend.passwords import pwd_context
+from backend.pagination import encode_cursor
+from backend.schemas import MoodLogCreate, HydrationLogCreate, CodingSessionCreate, FocusSessionCreate, DashboardResponse, DashboardStat, UserProfileCreate, HistoryPage, BatchLogResult
+from typing import Optional, List, Tuple
+from collections import defaultdict
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Detached User rows (profile eagerly joined) keyed by id; served by
+# security.get_current_db_user and dropped whenever the account or profile changes
+user_cache = TTLCache(settings.USER_CACHE_SIZE, settings.USER_CACHE_TTL_SECONDS)
 
 def get_user_by_email(db: Session, email: str):
     return db.query(User).filter(User.email == email).first()
 
-def create_user(db: Session, email: str, password: str):
-    hashed_password = pwd_context.hash(password)
+def get_user(db: Session, user_id: int) -> Optional[User]:
+    return db.get(User, user_id)
+
+def create_user(db: Session, email: str, hashed_password: str):
+    # Hash with backend.passwords.hash_password first; bcrypt is kept off the DB path
     db_user = User(email=email, hashed_password=hashed_password)
     db.add(db_user)
     db.commit()
     db.refresh(db_user)
     return db_user
 
+def update_password_hash(db: Session, user: User, hashed_password: str):
+    user.hashed_password = hashed_password
+    db.commit()
+    user_cache.pop(user.id)
+
 def verify_password(plain_password: str, hashed_password: str):
     return pwd_context.verify(plain_password, hashed_password)
 
+ROLLUP_COUNTERS = (
+    "mood_sum", "mood_count", "tiredness_sum", "tiredness_count",
+    "water_glasses", "coffee_cups", "daily_goal",
+    "coding_minutes", "coding_sessions", "focus_minutes",
+)
+
+def upsert_insert(db: Session):
+    # Dialect-specific insert() that supports ON CONFLICT (SQLite and Postgres)
+    return postgresql_insert if db.get_bind().dialect.name == "postgresql" else sqlite_insert
+
+# Counters that keep the highest value seen instead of a sum. The day's hydration goal
+# is the highest goal logged that day, however many logs (or write-behind flushes)
+# carried it, so every write path and rebuild_daily_rollups agree.
+ROLLUP_MAXIMA = ("daily_goal",)
+
+def bump_daily_rollup(db: Session, user_id: int, day: date, **deltas):
+    # INSERT ... ON CONFLICT (user_id, day) DO UPDATE SET col = col + excluded.col
+    # (or the larger of the two for ROLLUP_MAXIMA).
+    # Runs inside the caller's transaction; the caller commits.
+    insert = upsert_insert(db)
+    values = {counter: 0 for counter in ROLLUP_COUNTERS}
+    values.update(deltas)
+    stmt = insert(DailyWellnessRollup).values(user_id=user_id, day=day, **values)
+
+    def merged(counter):
+        current, new = getattr(DailyWellnessRollup, counter), stmt.excluded[counter]
+        if counter in ROLLUP_MAXIMA:
+            return case((new > current, new), else_=current)
+        return current + new
+
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["user_id", "day"],
+        set_={counter: merged(counter) for counter in deltas},
+    )
+    db.execute(stmt)
+
+def get_daily_rollups(db: Session, user_id: int, days: int = 7) -> List[DailyWellnessRollup]:
+    since = datetime.utcnow().date() - timedelta(days=days - 1)
+    return db.query(DailyWellnessRollup).filter(
+        DailyWellnessRollup.user_id == user_id,
+        DailyWellnessRollup.day >= since
+    ).order_by(DailyWellnessRollup.day.asc()).all()
+
+def rebuild_daily_rollups(db: Session, user_id: Optional[int] = None) -> int:
+    """Recompute rollups from the raw log tables (all users, or one). Returns rows written."""
+    clear = delete(DailyWellnessRollup)
+    if user_id is not None:
+        clear = clear.where(DailyWellnessRollup.user_id == user_id)
+    db.execute(clear)
+
+    sources = [
+        (MoodLog, lambda log: {
+            "mood_sum": func.sum(log.mood_score),
+            "mood_count": func.count(log.id),
+            "tiredness_sum": func.coalesce(func.sum(log.tiredness_level), 0),
+            "tiredness_count": func.count(log.tiredness_level),
+        }),
+        (HydrationLog, lambda log: {
+            "water_glasses": func.sum(log.water_glasses),
+            "coffee_cups": func.sum(log.coffee_cups),
+            "daily_goal": func.max(log.daily_goal),
+        }),
+        (CodingSession, lambda log: {
+            "coding_minutes": func.sum(log.duration_minutes),
+            "coding_sessions": func.count(log.id),
+        }),
+        (FocusSession, lambda log: {
+            "focus_minutes": func.sum(log.duration_minutes),
+        }),
+    ]
+    days = set()
+    for model, aggregates in sources:
+        day = func.date(model.created_at, type_=Date)
+        columns = aggregates(model)
+        query = select(model.user_id, day.label("day"), *[agg.label(name) for name, agg in columns.items()]).group_by(model.user_id, day)
+        if user_id is not None:
+            query = query.where(model.user_id == user_id)
+        for row in db.execute(query):
+            bump_daily_rollup(db, row.user_id, row.day, **{name: getattr(row, name) for name in columns})
+            days.add((row.user_id, row.day))
+    db.commit()
+    return len(days)
+
 def create_hydration_log(db: Session, user_id: int, hydration_log: HydrationLogCreate):
     db_hydration = HydrationLog(**hydration_log.dict(), user_id=user_id)
     db.add(db_hydration)
+    bump_daily_rollup(
+        db, user_id, datetime.utcnow().date(),
+        water_glasses=hydration_log.water_glasses,
+        coffee_cups=hydration_log.coffee_cups,
+        daily_goal=hydration_log.daily_goal,
+    )
     db.commit()
     db.refresh(db_hydration)
     return db_hydration
 
+def write_behind_key(day: date) -> str:
+    # client_key of the single row a day's buffered hydration increments are merged into
+    return f"write-behind:{day.isoformat()}"
+
+def flush_hydration_increments(db: Session, increments: List[dict]) -> None:
+    """Apply coalesced hydration increments ({user_id, day, water_glasses, coffee_cups,
+    daily_goal, created_at}) as one UPSERT into each user's per-day write-behind row,
+    adding glasses/cups and keeping the highest goal. Rollups move by the same deltas."""
+    if not increments:
+        return
+    rows = [{
+        "user_id": inc["user_id"], "client_key": write_behind_key(inc["day"]), "created_at": inc["created_at"],
+        "water_glasses": inc["water_glasses"], "coffee_cups": inc["coffee_cups"], "daily_goal": inc["daily_goal"],
+    } for inc in increments]
+    insert = upsert_insert(db)
+    stmt = insert(HydrationLog)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["user_id", "client_key"],
+        index_where=HydrationLog.client_key.isnot(None),
+        set_={
+            "water_glasses": HydrationLog.water_glasses + stmt.excluded.water_glasses,
+            "coffee_cups": HydrationLog.coffee_cups + stmt.excluded.coffee_cups,
+            "daily_goal": case((stmt.excluded.daily_goal > HydrationLog.daily_goal, stmt.excluded.daily_goal), else_=HydrationLog.daily_goal),
+        },
+    )
+    db.execute(stmt, rows)
+    for inc in increments:
+        bump_daily_rollup(
+            db, inc["user_id"], inc["day"],
+            water_glasses=inc["water_glasses"],
+            coffee_cups=inc["coffee_cups"],
+            daily_goal=inc["daily_goal"],
+        )
+    db.commit()
+
 def get_recent_hydration_logs(db: Session, user_id: int, days: int = 7):
     cutoff = datetime.utcnow() - timedelta(days=days)
     return db.query(HydrationLog).filter(and_(HydrationLog.user_id == user_id, HydrationLog.created_at >= cutoff)).all()
@@ -36,6 +177,7 @@ def get_recent_hydration_logs(db: Session, user_id: int, days: int = 7):
 def create_coding_session(db: Session, user_id: int, session: CodingSessionCreate):
     db_session = CodingSession(**session.dict(), user_id=user_id)
     db.add(db_session)
+    bump_daily_rollup(db, user_id, datetime.utcnow().date(), coding_minutes=session.duration_minutes, coding_sessions=1)
     db.commit()
     db.refresh(db_session)
     return db_session
@@ -47,6 +189,7 @@ def get_recent_coding_sessions(db: Session, user_id: int, days: int = 7):
 def create_focus_session(db: Session, user_id: int, session: FocusSessionCreate):
     db_session = FocusSession(**session.dict(), user_id=user_id)
     db.add(db_session)
+    bump_daily_rollup(db, user_id, datetime.utcnow().date(), focus_minutes=session.duration_minutes)
     db.commit()
     db.refresh(db_session)
     return db_session
@@ -58,6 +201,8 @@ def get_recent_focus_sessions(db: Session, user_id: int, days: int = 7):
 def create_mood_log(db: Session, user_id: int, mood_log: MoodLogCreate):
     db_mood = MoodLog(**mood_log.dict(), user_id=user_id)
     db.add(db_mood)
+    tiredness = {} if mood_log.tiredness_level is None else {"tiredness_sum": mood_log.tiredness_level, "tiredness_count": 1}
+    bump_daily_rollup(db, user_id, datetime.utcnow().date(), mood_sum=mood_log.mood_score, mood_count=1, **tiredness)
     db.commit()
     db.refresh(db_mood)
     return db_mood
@@ -66,23 +211,155 @@ def get_recent_mood_logs(db: Session, user_id: int, days: int = 7):
     cutoff = datetime.utcnow() - timedelta(days=days)
     return db.query(MoodLog).filter(and_(MoodLog.user_id == user_id, MoodLog.created_at >= cutoff)).order_by(MoodLog.created_at.asc()).all()
 
+# Batch ingestion: entry type -> (model, value columns, rollup deltas for one stored row)
+BATCH_TYPES = {
+    "mood": (MoodLog, ("mood_score", "notes", "tiredness_level"), lambda row: {
+        "mood_sum": row.mood_score, "mood_count": 1,
+        **({} if row.tiredness_level is None else {"tiredness_sum": row.tiredness_level, "tiredness_count": 1}),
+    }),
+    "hydration": (HydrationLog, ("water_glasses", "coffee_cups", "daily_goal"), lambda row: {
+        "water_glasses": row.water_glasses, "coffee_cups": row.coffee_cups, "daily_goal": row.daily_goal,
+    }),
+    "coding": (CodingSession, ("duration_minutes", "notes"), lambda row: {
+        "coding_minutes": row.duration_minutes, "coding_sessions": 1,
+    }),
+    "focus": (FocusSession, ("duration_minutes", "notes"), lambda row: {
+        "focus_minutes": row.duration_minutes,
+    }),
+}
+
+def create_logs_batch(db: Session, user_id: int, entries) -> BatchLogResult:
+    """Insert mixed BatchEntry rows in one transaction: one multi-row INSERT ... RETURNING
+    per log table, entries whose client_key is already stored are skipped, and the daily
+    rollups are bumped once per (day) from the rows actually inserted."""
+    now = datetime.utcnow().replace(microsecond=0)
+    by_type = defaultdict(list)
+    duplicates, seen = [], set()
+    for entry in entries:
+        if entry.client_key is not None:
+            if (entry.type, entry.client_key) in seen:
+                duplicates.append(entry.client_key)
+                continue
+            seen.add((entry.type, entry.client_key))
+        created_at = entry.created_at or now
+        if created_at.tzinfo is not None:
+            created_at = created_at.astimezone(timezone.utc).replace(tzinfo=None)
+        by_type[entry.type].append(entry.model_dump(include=set(BATCH_TYPES[entry.type][1])) | {
+            "user_id": user_id, "client_key": entry.client_key, "created_at": created_at,
+        })
+
+    insert = upsert_insert(db)
+    inserted = {}
+    stored_keys = set()
+    deltas = defaultdict(lambda: defaultdict(float))
+    for entry_type, rows in by_type.items():
+        model, columns, rollup = BATCH_TYPES[entry_type]
+        stmt = insert(model).on_conflict_do_nothing(
+            index_elements=["user_id", "client_key"],
+            index_where=model.client_key.isnot(None),
+        ).returning(model.client_key, model.created_at, *[getattr(model, c) for c in columns])
+        # executemany with RETURNING: SQLAlchemy batches this into multi-row VALUES
+        result = db.execute(stmt, rows).all()
+        inserted[entry_type] = len(result)
+        for row in result:
+            if row.client_key is not None:
+                stored_keys.add((entry_type, row.client_key))
+            day_deltas = deltas[row.created_at.date()]
+            for counter, value in rollup(row).items():
+                day_deltas[counter] = max(day_deltas[counter], value) if counter in ROLLUP_MAXIMA else day_deltas[counter] + value
+        duplicates.extend(
+            row["client_key"] for row in rows
+            if row["client_key"] is not None and (entry_type, row["client_key"]) not in stored_keys
+        )
+
+    for day, counters in deltas.items():
+        bump_daily_rollup(db, user_id, day, **counters)
+    db.commit()
+    return BatchLogResult(inserted=inserted, duplicates=duplicates)
+
 def create_user_profile(db: Session, user_id: int, profile: UserProfileCreate):
     db_profile = UserProfile(**profile.dict(), user_id=user_id)
     db.add(db_profile)
     db.commit()
     db.refresh(db_profile)
+    user_cache.pop(user_id)
     return db_profile
 
 def get_user_profile(db: Session, user_id: int) -> Optional[UserProfile]:
     return db.query(UserProfile).filter(UserProfile.user_id == user_id).first()
 
+def window_start(today: date, days: int = 7) -> datetime:
+    # Start of the UTC day `days` back. Aligned to the day, unlike now() - days, so a
+    # window's contents change only with writes or the date (http_cache daily ETags)
+    return datetime.combine(today - timedelta(days=days), datetime.min.time())
+
+def recent_logs_query(model, user_id: int, cutoff: datetime, columns: Optional[List[str]] = None):
+    # columns: select plain rows instead of ORM objects (backend.fast_json)
+    entities = [getattr(model, column) for column in columns] if columns else [model]
+    return select(*entities).where(model.user_id == user_id, model.created_at >= cutoff).order_by(model.created_at.asc())
+
+def latest_log_query(model, user_id: int, limit: int = 1, since: Optional[datetime] = None):
+    query = select(model).where(model.user_id == user_id)
+    if since is not None:
+        query = query.where(model.created_at >= since)
+    return query.order_by(model.created_at.desc(), model.id.desc()).limit(limit)
+
+def get_latest_logs(db: Session, model, user_id: int, limit: int = 1, since: Optional[datetime] = None):
+    return db.scalars(latest_log_query(model, user_id, limit, since)).all()
+
+def history_query(model, user_id: int, columns: List[str], limit: int,
+                  since: Optional[datetime] = None, until: Optional[datetime] = None,
+                  after: Optional[Tuple[datetime, int]] = None):
+    # Newest first; `after` is the (created_at, id) of the previous page's last row.
+    # Seeks via the (user_id, created_at) index (id rides along as the rowid/heap tiebreak),
+    # so every page costs the same regardless of how deep into the history it is.
+    query = select(*[getattr(model, column) for column in columns]).where(model.user_id == user_id)
+    if since is not None:
+        query = query.where(model.created_at >= since)
+    if until is not None:
+        query = query.where(model.created_at < until)
+    if after is not None:
+        created_at, row_id = after
+        # The redundant created_at <= bound is what lets the planner range-seek the index
+        query = query.where(model.created_at <= created_at, or_(
+            model.created_at < created_at,
+            model.id < row_id,
+        ))
+    return query.order_by(model.created_at.desc(), model.id.desc()).limit(limit)
+
+def get_log_history(db: Session, model, user_id: int, columns: List[str], limit: int,
+                    since: Optional[datetime] = None, until: Optional[datetime] = None,
+                    after: Optional[Tuple[datetime, int]] = None) -> HistoryPage:
+    # One extra row tells us whether another page exists without a COUNT
+    rows = db.execute(history_query(model, user_id, columns, limit + 1, since, until, after)).mappings().all()
+    items = [dict(row) for row in rows[:limit]]
+    next_cursor = encode_cursor(items[-1]["created_at"], items[-1]["id"]) if len(rows) > limit else None
+    return HistoryPage(items=items, next_cursor=next_cursor)
+
+def dashboard_stats_query(user_id: int, since: date):
+    # Reads at most one rollup row per day in the window, however many raw logs exist.
+    rollup = DailyWellnessRollup
+    diet_preference = select(UserProfile.diet_preference).where(UserProfile.user_id == user_id).limit(1).scalar_subquery()
+    return select(
+        (cast(func.sum(rollup.mood_sum), Float) / func.nullif(func.sum(rollup.mood_count), 0)).label("avg_mood"),
+        (cast(func.sum(rollup.tiredness_sum), Float) / func.nullif(func.sum(rollup.tiredness_count), 0)).label("avg_tiredness"),
+        func.coalesce(func.sum(rollup.water_glasses), 0).label("total_glasses"),
+        func.coalesce(func.sum(rollup.coffee_cups), 0).label("total_coffee"),
+        func.coalesce(func.sum(rollup.daily_goal), 0).label("total_goal"),
+        func.coalesce(func.sum(rollup.coding_sessions), 0).label("total_sessions"),
+        func.coalesce(func.sum(rollup.coding_minutes), 0).label("total_coding_minutes"),
+        func.coalesce(func.sum(rollup.focus_minutes), 0).label("total_focus_minutes"),
+        diet_preference.label("diet_preference"),
+    ).where(rollup.user_id == user_id, rollup.day >= since)
+
 def get_dashboard_stats(db: Session, user_id: int, days: int = 7) -> DashboardResponse:
-    cutoff = datetime.utcnow() - timedelta(days=days)
+    # Window is the last `days` UTC calendar days, today included
+    since = datetime.utcnow().date() - timedelta(days=days - 1)
+    row = db.execute(dashboard_stats_query(user_id, since)).one()
 
     # Mood stats
-    mood_logs = get_recent_mood_logs(db, user_id, days)
-    avg_mood = sum(log.mood_score for log in mood_logs) / len(mood_logs) if mood_logs else 0
-    avg_tiredness = sum(log.tiredness_level for log in mood_logs if log.tiredness_level is not None) / len([log for log in mood_logs if log.tiredness_level is not None]) if any(log.tiredness_level is not None for log in mood_logs) else 0
+    avg_mood = row.avg_mood or 0
+    avg_tiredness = row.avg_tiredness or 0
     mood_stat = DashboardStat(
         title="Avg. Mood Score",
         value=f"{avg_mood:.1f}/5",
@@ -92,10 +369,9 @@ def get_dashboard_stats(db: Session, user_id: int, days: int = 7) -> DashboardRe
     )
 
     # Hydration stats
-    hydration_logs = get_recent_hydration_logs(db, user_id, days)
-    total_glasses = sum(log.water_glasses for log in hydration_logs)
-    total_coffee = sum(log.coffee_cups for log in hydration_logs)
-    total_goal = sum(log.daily_goal for log in hydration_logs)
+    total_glasses = row.total_glasses
+    total_coffee = row.total_coffee
+    total_goal = row.total_goal
     hydration_pct = (total_glasses / total_goal * 100) if total_goal > 0 else 0
     hydration_stat = DashboardStat(
         title="Hydration Goal",
@@ -106,9 +382,8 @@ def get_dashboard_stats(db: Session, user_id: int, days: int = 7) -> DashboardRe
     )
 
     # Coding sessions stats
-    coding_sessions = get_recent_coding_sessions(db, user_id, days)
-    total_sessions = len(coding_sessions)
-    total_coding_minutes = sum(session.duration_minutes for session in coding_sessions)
+    total_sessions = row.total_sessions
+    total_coding_minutes = row.total_coding_minutes
     coding_stat = DashboardStat(
         title="Coding Sessions",
         value=str(total_sessions),
@@ -118,8 +393,7 @@ def get_dashboard_stats(db: Session, user_id: int, days: int = 7) -> DashboardRe
     )
 
     # Focus time stats
-    focus_sessions = get_recent_focus_sessions(db, user_id, days)
-    total_focus_hours = sum(session.duration_minutes for session in focus_sessions) / 60
+    total_focus_hours = row.total_focus_minutes / 60
     avg_focus_hours = total_focus_hours / days if days > 0 else 0
     focus_stat = DashboardStat(
         title="Focus Time",
@@ -129,15 +403,8 @@ def get_dashboard_stats(db: Session, user_id: int, days: int = 7) -> DashboardRe
         color="productivity-high"
     )
 
-    # Get diet preference for snack suggestion
-    profile = get_user_profile(db, user_id)
-    snack = {
-        "vegetarian": "Dark Chocolate Almonds",
-        "vegan": "Roasted Chickpeas",
-        "protein-focused": "Beef Jerky",
-        "balanced": "Trail Mix",
-        "other": "Granola Bar"
-    }.get(profile.diet_preference if profile else "balanced", "Trail Mix")
+    # Snack for the tiredness insight; first candidate so the cached stats stay stable
+    snack = snacks.candidates(row.diet_preference, "tired")[1][0].name
 
     stats = [mood_stat, hydration_stat, coding_stat, focus_stat]
 
@@ -151,4 +418,41 @@ def get_dashboard_stats(db: Session, user_id: int, days: int = 7) -> DashboardRe
     if total_sessions > 20:
         insights.append("Impressive coding consistency. Consider adding short breaks for sustained productivity.")
 
-    return DashboardResponse(stats=stats, insights=insights)
\ No newline at end of file
+    return DashboardResponse(stats=stats, insights=insights)
+
+def record_payment_event(db: Session, reference: str, event: str, payload: str) -> bool:
+    """Stores a webhook delivery once per (reference, event). Returns False for a duplicate."""
+    stmt = upsert_insert(db)(PaymentEvent).values(reference=reference, event=event, payload=payload)
+    stmt = stmt.on_conflict_do_nothing(index_elements=["reference", "event"])
+    inserted = db.execute(stmt).rowcount == 1
+    db.commit()
+    return inserted
+
+def get_pending_payment_events(db: Session, limit: int) -> List[PaymentEvent]:
+    # Pending events that are due: never tried, or past their retry backoff
+    return db.query(PaymentEvent).filter(
+        PaymentEvent.status == "pending",
+        or_(PaymentEvent.next_attempt_at.is_(None), PaymentEvent.next_attempt_at <= datetime.utcnow()),
+    ).order_by(PaymentEvent.id.asc()).limit(limit).all()
+
+def flush_snack_feedback(db: Session, counts: List[dict]) -> None:
+    """Add buffered feedback ({user_id, diet, suggestion, likes, dislikes}) to each
+    row's counters with one UPSERT."""
+    if not counts:
+        return
+    stmt = upsert_insert(db)(SnackFeedback)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["user_id", "diet", "suggestion"],
+        set_={
+            "likes": SnackFeedback.likes + stmt.excluded.likes,
+            "dislikes": SnackFeedback.dislikes + stmt.excluded.dislikes,
+            "updated_at": func.now(),
+        },
+    )
+    db.execute(stmt, counts)
+    db.commit()
+
+def get_snack_feedback_counts(db: Session):
+    return db.execute(select(
+        SnackFeedback.user_id, SnackFeedback.diet, SnackFeedback.suggestion, SnackFeedback.likes, SnackFeedback.dislikes
+    )).all()
@@ -0,0 +1,139 @@
+# backend/crud_async.py
+# Async counterparts of backend.crud for handlers using AsyncSession.
+# Each function runs the sync implementation through AsyncSession.run_sync, so the
+# query logic stays in crud.py while the I/O goes through the async driver
+# (aiosqlite/asyncpg) instead of blocking the event loop.
+# Password hashing is CPU-bound and lives in backend.passwords (process pool);
+# create_user takes the already-computed hash.
+# Writes go through backend.write_queue, which serializes them on SQLite.
+# Committed writes are pushed to the user's open event streams (backend.events).
+import asyncio
+from sqlalchemy.ext.asyncio import AsyncSession
+from backend import crud, events, replicas, result_cache, user_versions, write_queue
+from backend.database import AsyncSessionLocal
+from backend.models import MoodLog, HydrationLog, CodingSession, FocusSession
+from backend.schemas import (
+    MoodLogCreate, HydrationLogCreate, CodingSessionCreate, FocusSessionCreate, DashboardResponse, UserProfileCreate, BatchLogResult,
+    MoodLogOut, HydrationLogOut, CodingSessionOut, FocusSessionOut, DailyRollupOut,
+)
+
+async def _write(db: AsyncSession, user_ids, fn, *args):
+    # Pin the users' reads to the primary (backend.replicas, read-your-writes) while
+    # writing, and again once committed so the window starts when the rows exist;
+    # then bump their data version (ETags) and drop their cached results
+    for user_id in user_ids:
+        replicas.mark_write(user_id)
+    result = await write_queue.run(db, fn, *args)
+    for user_id in user_ids:
+        replicas.mark_write(user_id)
+        user_versions.bump(user_id)
+        await result_cache.invalidate(user_id)
+    return result
+
+async def _publish_totals(user_id: int) -> None:
+    # Background half of a live update: today's rollup and the dashboard stats
+    today, stats = await asyncio.gather(
+        run_in_own_session(crud.get_daily_rollups, user_id, 1),
+        run_in_own_session(crud.get_dashboard_stats, user_id),
+    )
+    events.publish(user_id, "day", DailyRollupOut.model_validate(today[0]) if today else None)
+    events.publish(user_id, "stats", stats)
+
+# Entry model -> (kind, schema) of the "entry" event
+LIVE_ENTRIES = {
+    MoodLog: ("mood", MoodLogOut),
+    HydrationLog: ("hydration", HydrationLogOut),
+    CodingSession: ("coding", CodingSessionOut),
+    FocusSession: ("focus", FocusSessionOut),
+}
+
+def _publish_write(user_id: int, entry=None) -> None:
+    # The new entry goes out now; totals are recomputed in the background, once per burst
+    if not events.has_subscribers(user_id):
+        return
+    if entry is not None:
+        kind, schema = LIVE_ENTRIES[type(entry)]
+        events.publish(user_id, "entry", {"kind": kind, "entry": schema.model_validate(entry)})
+    events.refresh(user_id, _publish_totals)
+
+async def get_user_by_email(db: AsyncSession, email: str):
+    return await db.run_sync(crud.get_user_by_email, email)
+
+async def create_user(db: AsyncSession, email: str, hashed_password: str):
+    user = await write_queue.run(db, crud.create_user, email, hashed_password)
+    replicas.mark_write(user.id)  # After the commit: the id only exists now
+    return user
+
+async def update_password_hash(db: AsyncSession, user, hashed_password: str):
+    return await _write(db, [user.id], crud.update_password_hash, user, hashed_password)
+
+async def get_user(db: AsyncSession, user_id: int):
+    return await db.run_sync(crud.get_user, user_id)
+
+async def create_hydration_log(db: AsyncSession, user_id: int, hydration_log: HydrationLogCreate):
+    entry = await _write(db, [user_id], crud.create_hydration_log, user_id, hydration_log)
+    _publish_write(user_id, entry)
+    return entry
+
+async def flush_hydration_increments(db: AsyncSession, increments):
+    user_ids = {inc["user_id"] for inc in increments}
+    await _write(db, user_ids, crud.flush_hydration_increments, increments)
+    for user_id in user_ids:
+        _publish_write(user_id)
+
+async def create_coding_session(db: AsyncSession, user_id: int, session: CodingSessionCreate):
+    entry = await _write(db, [user_id], crud.create_coding_session, user_id, session)
+    _publish_write(user_id, entry)
+    return entry
+
+async def create_focus_session(db: AsyncSession, user_id: int, session: FocusSessionCreate):
+    entry = await _write(db, [user_id], crud.create_focus_session, user_id, session)
+    _publish_write(user_id, entry)
+    return entry
+
+async def create_mood_log(db: AsyncSession, user_id: int, mood_log: MoodLogCreate):
+    entry = await _write(db, [user_id], crud.create_mood_log, user_id, mood_log)
+    _publish_write(user_id, entry)
+    return entry
+
+async def create_user_profile(db: AsyncSession, user_id: int, profile: UserProfileCreate):
+    return await _write(db, [user_id], crud.create_user_profile, user_id, profile)
+
+async def get_user_profile(db: AsyncSession, user_id: int):
+    return await db.run_sync(crud.get_user_profile, user_id)
+
+async def get_daily_rollups(db: AsyncSession, user_id: int, days: int = 7):
+    return await db.run_sync(crud.get_daily_rollups, user_id, days)
+
+async def get_log_history(db: AsyncSession, model, user_id: int, columns, limit: int, since=None, until=None, after=None):
+    return await db.run_sync(crud.get_log_history, model, user_id, columns, limit, since, until, after)
+
+async def get_dashboard_stats(db: AsyncSession, user_id: int, days: int = 7) -> DashboardResponse:
+    return await db.run_sync(crud.get_dashboard_stats, user_id, days)
+
+async def record_payment_event(db: AsyncSession, reference: str, event: str, payload: str) -> bool:
+    return await write_queue.run(db, crud.record_payment_event, reference, event, payload)
+
+async def flush_snack_feedback(db: AsyncSession, counts):
+    # Feedback only reorders suggestions, so no cached results or ETags go stale
+    return await write_queue.run(db, crud.flush_snack_feedback, counts)
+
+async def get_snack_feedback_counts(db: AsyncSession):
+    return await db.run_sync(crud.get_snack_feedback_counts)
+
+async def create_logs_batch(db: AsyncSession, user_id: int, entries) -> BatchLogResult:
+    result = await _write(db, [user_id], crud.create_logs_batch, user_id, entries)
+    # Batches are for replaying offline logs; clients refetch rather than apply each entry
+    if sum(result.inserted.values()):
+        events.publish(user_id, "resync", {})
+    return result
+
+async def run_in_own_session(fn, *args):
+    # A session can only run one statement at a time; independent reads that should
+    # be awaited concurrently (asyncio.gather) each get their own session/connection.
+    async with AsyncSessionLocal() as db:
+        return await db.run_sync(fn, *args)
+
+async def run_in_read_session(user_id: int, fn, *args):
+    # run_in_own_session for reads that may be served by a replica
+    return await replicas.run_in_replica(user_id, fn, *args)
@@ -1,17 +1,151 @@
-# backend/database.py
-from sqlalchemy import create_engine
+import logging
+import time
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from backend.config import settings
+from backend.metrics import instrument_engine
 
-engine = create_engine(settings.SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+def apply_sqlite_pragmas(engine, pragmas=None) -> None:
+    """Run SQLite PRAGMAs (default settings.SQLITE_PRAGMAS) on every new DBAPI connection.
+    For an AsyncEngine pass engine.sync_engine. No-op for other dialects."""
+    pragmas = settings.SQLITE_PRAGMAS if pragmas is None else pragmas
+    if engine.dialect.name != "sqlite" or not pragmas:
+        return
+
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+class MeteredPoolMixin:
+    # Counts checkouts and the time spent waiting for a connection (a free one from
+    # the pool, or a new one being opened); read through pool_metrics()
+    checkouts = 0
+    timeouts = 0
+    wait_seconds_total = 0.0
+    wait_seconds_max = 0.0
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - start
+            self.checkouts += 1
+            self.wait_seconds_total += waited
+            self.wait_seconds_max = max(self.wait_seconds_max, waited)
+
+class MeteredQueuePool(MeteredPoolMixin, QueuePool):
+    pass
+
+class MeteredAsyncPool(MeteredPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+# SQLAlchemy names pool loggers after the pool class's module, so these would log
+# under "backend" at our INFO level; keep them at SQLAlchemy's default (WARNING)
+for pool_class in (MeteredQueuePool, MeteredAsyncPool):
+    logging.getLogger(f"{pool_class.__module__}.{pool_class.__name__}").setLevel(logging.WARNING)
+
+def engine_options(database_url: str, is_async: bool = False) -> dict:
+    """create_engine()/create_async_engine() keyword arguments for the URL's dialect and driver."""
+    url = make_url(database_url)
+    options = {}
+    if url.get_backend_name() == "sqlite":
+        if not is_async:
+            options["connect_args"] = {"check_same_thread": False}
+        if url.database in (None, "", ":memory:"):
+            return options  # In-memory databases live on a single connection; keep SQLAlchemy's pool
+    else:
+        # Network databases: drop connections the server or a proxy closed behind our back
+        options["pool_pre_ping"] = settings.DB_POOL_PRE_PING
+        options["pool_recycle"] = settings.DB_POOL_RECYCLE_SECONDS
+    if url.get_backend_name() == "postgresql":
+        timeout_ms = settings.DB_STATEMENT_TIMEOUT_MS
+        if url.get_driver_name() == "asyncpg":
+            options["connect_args"] = {"timeout": settings.DB_CONNECT_TIMEOUT_SECONDS}
+            if timeout_ms:
+                options["connect_args"]["server_settings"] = {"statement_timeout": str(timeout_ms)}
+        else:
+            options["connect_args"] = {"connect_timeout": settings.DB_CONNECT_TIMEOUT_SECONDS}
+            if timeout_ms:
+                options["connect_args"]["options"] = f"-c statement_timeout={timeout_ms}"
+    options.update(
+        poolclass=MeteredAsyncPool if is_async else MeteredQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+    )
+    return options
+
+engine = create_engine(settings.SQLALCHEMY_DATABASE_URL, **engine_options(settings.SQLALCHEMY_DATABASE_URL))
+apply_sqlite_pragmas(engine)
+instrument_engine(engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async drivers for each sync backend we support
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+
+def to_async_url(database_url: str) -> str:
+    url = make_url(database_url)
+    if url.get_driver_name() in ("aiosqlite", "asyncpg"):
+        return database_url
+    driver = ASYNC_DRIVERS.get(url.get_backend_name())
+    if driver is None:
+        raise ValueError(f"No async driver configured for {url.get_backend_name()!r}; set ASYNC_DATABASE_URL")
+    return url.set(drivername=driver).render_as_string(hide_password=False)
+
+def get_async_database_url() -> str:
+    if settings.ASYNC_DATABASE_URL:
+        return settings.ASYNC_DATABASE_URL
+    return to_async_url(settings.SQLALCHEMY_DATABASE_URL)
+
+async_database_url = get_async_database_url()
+async_engine = create_async_engine(async_database_url, **engine_options(async_database_url, is_async=True))
+apply_sqlite_pragmas(async_engine.sync_engine)
+instrument_engine(async_engine.sync_engine)
+# expire_on_commit=False: response models read attributes after the commit, and
+# an expired attribute would trigger lazy IO outside the async context
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
 Base = declarative_base()
 
+def pool_status(pool) -> dict:
+    status = {"pool": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        status.update(size=pool.size(), checked_out=pool.checkedout(), checked_in=pool.checkedin(), overflow=pool.overflow())
+    if isinstance(pool, MeteredPoolMixin):
+        status.update(
+            checkouts=pool.checkouts,
+            timeouts=pool.timeouts,
+            wait_ms_avg=round(pool.wait_seconds_total / pool.checkouts * 1000, 3) if pool.checkouts else 0.0,
+            wait_ms_max=round(pool.wait_seconds_max * 1000, 3),
+        )
+    return status
+
+def pool_metrics() -> dict:
+    """Connection pool state of both engines, for monitoring."""
+    return {"sync": pool_status(engine.pool), "async": pool_status(async_engine.pool)}
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
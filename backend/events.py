@@ -0,0 +1,148 @@
+# backend/events.py
+# Per-user live updates, streamed to clients over Server-Sent Events (GET /api/events).
+# Writes publish small deltas (backend.crud_async): the new entry right away, then the
+# day's rollup totals and the dashboard stats, recomputed off the request path and
+# coalesced so a burst of writes costs one recompute. Nothing is computed or
+# serialized for users without an open stream, and each event is serialized once
+# however many tabs the user has open.
+# Every connection has a bounded queue. Publishing never waits: when a slow client's
+# queue is full its backlog is dropped and replaced by a single "resync" event, which
+# tells the client to refetch once instead of replaying stale deltas.
+# A stream ends after EVENTS_MAX_STREAM_SECONDS and the client reconnects: uvicorn
+# waits for open responses before running the lifespan shutdown, so this bounds how
+# long a deploy waits on idle streams (or pass --timeout-graceful-shutdown).
+# Subscriptions live in this process; with several workers a client only sees writes
+# handled by the worker it is connected to (see backend/user_versions.py).
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, Optional, Set
+import orjson
+from fastapi.encoders import jsonable_encoder
+from backend.config import settings
+
+logger = logging.getLogger(__name__)
+
+RESYNC = b"event: resync\ndata: {}\n\n"
+KEEPALIVE = b": keepalive\n\n"
+
+class Subscription:
+    def __init__(self, user_id: int):
+        self.user_id = user_id
+        self.queue: "asyncio.Queue[Optional[bytes]]" = asyncio.Queue(settings.EVENTS_QUEUE_SIZE)
+        self.dropped = 0
+        self.closed = False
+
+    def put(self, message: Optional[bytes]) -> None:
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # Backpressure: the client is behind, so the deltas it missed are useless
+            self.dropped += self.queue.qsize()
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(RESYNC if message is not None else None)
+
+_subscriptions: Dict[int, Set[Subscription]] = {}
+# user id -> True if another refresh was requested while one is running
+_refreshing: Dict[int, bool] = {}
+_tasks: Set[asyncio.Task] = set()
+
+def subscribe(user_id: int) -> Optional[Subscription]:
+    """New stream for the user, or None if they already have EVENTS_MAX_STREAMS_PER_USER open."""
+    subscriptions = _subscriptions.setdefault(user_id, set())
+    if len(subscriptions) >= settings.EVENTS_MAX_STREAMS_PER_USER:
+        return None
+    subscription = Subscription(user_id)
+    subscriptions.add(subscription)
+    return subscription
+
+def unsubscribe(subscription: Subscription) -> None:
+    """Frees the stream's slot; safe to call more than once."""
+    if subscription.closed:
+        return
+    subscription.closed = True
+    subscriptions = _subscriptions.get(subscription.user_id)
+    if subscriptions is not None:
+        subscriptions.discard(subscription)
+        if not subscriptions:
+            del _subscriptions[subscription.user_id]
+    if subscription.dropped:
+        logger.info("Live update backlog dropped", extra={"fields": {"user_id": subscription.user_id, "dropped": subscription.dropped}})
+
+def has_subscribers(user_id: int) -> bool:
+    return user_id in _subscriptions
+
+def encode(event: str, data) -> bytes:
+    return b"event: " + event.encode() + b"\ndata: " + orjson.dumps(data, default=jsonable_encoder) + b"\n\n"
+
+def publish(user_id: int, event: str, data) -> None:
+    subscriptions = _subscriptions.get(user_id)
+    if not subscriptions:
+        return
+    message = encode(event, data)
+    for subscription in subscriptions:
+        subscription.put(message)
+
+def refresh(user_id: int, fn: Callable[[int], Awaitable[None]]) -> None:
+    """Run fn(user_id) in the background, at most once at a time per user; requests made
+    while it runs are folded into one more run."""
+    if not has_subscribers(user_id):
+        return
+    if user_id in _refreshing:
+        _refreshing[user_id] = True
+        return
+    _refreshing[user_id] = False
+    task = asyncio.get_running_loop().create_task(_refresh(user_id, fn))
+    _tasks.add(task)
+    task.add_done_callback(_tasks.discard)
+
+async def _refresh(user_id: int, fn: Callable[[int], Awaitable[None]]) -> None:
+    try:
+        while True:
+            await fn(user_id)
+            if not _refreshing.get(user_id):
+                break
+            _refreshing[user_id] = False
+    except Exception:
+        logger.exception("Live update refresh failed", extra={"fields": {"user_id": user_id}})
+    finally:
+        _refreshing.pop(user_id, None)
+
+async def stream(subscription: Subscription, is_disconnected: Callable[[], Awaitable[bool]]):
+    """SSE body for one connection; ends when the client leaves or the server stops."""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + settings.EVENTS_MAX_STREAM_SECONDS
+    try:
+        yield b"retry: %d\n\n" % int(settings.EVENTS_RETRY_SECONDS * 1000)
+        while True:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                message = await asyncio.wait_for(subscription.queue.get(), timeout=min(settings.EVENTS_KEEPALIVE_SECONDS, remaining))
+            except asyncio.TimeoutError:
+                if await is_disconnected():
+                    break
+                message = KEEPALIVE
+            if message is None:
+                break
+            yield message
+    finally:
+        unsubscribe(subscription)
+
+def stats() -> dict:
+    return {
+        "users": len(_subscriptions),
+        "streams": sum(len(subscriptions) for subscriptions in _subscriptions.values()),
+        "refreshing": len(_refreshing),
+    }
+
+async def stop() -> None:
+    # Ends every open stream so the server can shut down, and drops pending refreshes
+    for subscriptions in list(_subscriptions.values()):
+        for subscription in list(subscriptions):
+            subscription.put(None)
+    for task in list(_tasks):
+        task.cancel()
+    if _tasks:
+        await asyncio.gather(*_tasks, return_exceptions=True)
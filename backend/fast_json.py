@@ -0,0 +1,23 @@
+# backend/fast_json.py
+# Opt-in fast response path for list endpoints. The default path loads ORM objects,
+# validates each one against the response_model (from_attributes, per-row attribute
+# access), runs jsonable_encoder and then stdlib json. Handlers that opt in select
+# only the Out schema's columns as plain rows, trust them as-is (they come from our
+# own tables, typed by the column definitions) and render them with orjson.
+# backend/benchmarks/serialization.py measures the difference.
+from typing import Any, List
+from fastapi import Response
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+
+def columns(schema: type[BaseModel]) -> List[str]:
+    """Column names to select for `schema` (its fields, in declaration order)."""
+    return list(schema.model_fields)
+
+def rows(result) -> List[dict]:
+    return [dict(row) for row in result.mappings()]
+
+def respond(content: Any, response: Response) -> ORJSONResponse:
+    # Returning a Response skips response_model validation; keep the headers that
+    # dependencies set on the injected response (ETag, Cache-Control)
+    return ORJSONResponse(content, headers=dict(response.headers))
@@ -0,0 +1,37 @@
+# backend/http_cache.py
+# Conditional GETs for per-user read endpoints. The weak ETag of a cached endpoint
+# is derived from the user's data version (backend.user_versions), so a matching
+# If-None-Match is answered 304 by a route dependency, before the handler runs and
+# before any DB query. Bodies behind a new version are read from the primary
+# (see backend/replicas.py), so a lagging replica can't pin an old body to the tag.
+from datetime import datetime
+from fastapi import Depends, HTTPException, Request, Response
+from backend import user_versions
+from backend.security import get_current_user_id
+
+CACHE_CONTROL = "private, no-cache"  # Browser may store it, but must revalidate
+
+def make_etag(user_id: int, daily: bool = False) -> str:
+    tag = f"{user_versions.EPOCH}-{user_id}-{user_versions.get(user_id)}"
+    if daily:
+        tag += f"-{datetime.utcnow().date().isoformat()}"
+    return f'W/"{tag}"'
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    # Weak comparison (RFC 9110 13.1.2): ignore W/ prefixes
+    if if_none_match.strip() == "*":
+        return True
+    wanted = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == wanted for tag in if_none_match.split(","))
+
+def conditional(daily: bool = False):
+    """Route dependency: 304 when the client's ETag is current, else set ETag/Cache-Control.
+    daily=True for endpoints whose result also depends on the date (time windows)."""
+    async def check(request: Request, response: Response, user_id: int = Depends(get_current_user_id)):
+        etag = make_etag(user_id, daily)
+        headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and etag_matches(if_none_match, etag):
+            raise HTTPException(status_code=304, headers=headers)
+        response.headers.update(headers)
+    return Depends(check)
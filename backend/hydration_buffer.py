@@ -0,0 +1,147 @@
+# backend/hydration_buffer.py
+# Optional write-behind mode for /api/hydration/log (HYDRATION_WRITE_BEHIND).
+# Increments for the same user and UTC day are summed in memory and written every
+# HYDRATION_FLUSH_SECONDS, and on shutdown, as one UPSERT into a single per-day
+# HydrationLog row (crud.flush_hydration_increments) instead of one committed row
+# per glass. /api/hydration/latest reads through the buffer.
+# The buffer is per process. The UPSERT only adds, so several workers flushing into
+# the same row stay correct; a crash loses at most one interval of increments.
+import asyncio
+import logging
+from contextlib import AsyncExitStack
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+from backend import user_versions
+from backend.config import settings
+from backend.crud import latest_log_query, write_behind_key
+from backend.crud_async import flush_hydration_increments
+from backend.database import AsyncSessionLocal
+from backend.models import HydrationLog
+from backend.schemas import HydrationLogCreate, HydrationLogOut
+
+logger = logging.getLogger(__name__)
+
+LOCK_STRIPES = 64
+
+# (user_id, day) -> increment not yet written
+_pending: Dict[Tuple[int, date], dict] = {}
+# Striped per-user locks: held while a user's increments are added, flushed or read
+# through, so a reader never sees increments that left the buffer but are not committed
+_locks: Optional[List[asyncio.Lock]] = None
+_task: Optional[asyncio.Task] = None
+
+def enabled() -> bool:
+    return _locks is not None
+
+def _lock(user_id: int) -> asyncio.Lock:
+    return _locks[user_id % LOCK_STRIPES]
+
+def _user_pending(user_id: int) -> List[dict]:
+    return [inc for (uid, _), inc in _pending.items() if uid == user_id]
+
+async def add(user_id: int, hydration_log: HydrationLogCreate) -> dict:
+    """Buffer one increment; returns the user's unflushed totals for today."""
+    now = datetime.utcnow().replace(microsecond=0)
+    key = (user_id, now.date())
+    if key not in _pending and len(_pending) >= settings.HYDRATION_BUFFER_MAX_ENTRIES:
+        await flush()  # Bounded: a full buffer is written out before it grows
+    async with _lock(user_id):
+        inc = _pending.get(key)
+        if inc is None:
+            inc = _pending[key] = {"user_id": user_id, "day": key[1], "created_at": now, "water_glasses": 0, "coffee_cups": 0}
+        inc["water_glasses"] += hydration_log.water_glasses
+        inc["coffee_cups"] += hydration_log.coffee_cups
+        inc["daily_goal"] = max(inc.get("daily_goal", 0), hydration_log.daily_goal)
+        user_versions.bump(user_id)  # /latest reads through the buffer, so it changed
+        return dict(inc)
+
+async def _flush_locked(user_ids: Iterable[int]) -> int:
+    # Caller holds the locks of every user in user_ids
+    user_ids = set(user_ids)
+    keys = [key for key in _pending if key[0] in user_ids]
+    increments = [_pending.pop(key) for key in keys]
+    if not increments:
+        return 0
+    try:
+        async with AsyncSessionLocal() as db:
+            await flush_hydration_increments(db, increments)
+    except Exception:
+        # Put them back, merged with any increments buffered meanwhile
+        for key, inc in zip(keys, increments):
+            current = _pending.get(key)
+            if current is None:
+                _pending[key] = inc
+            else:
+                current["water_glasses"] += inc["water_glasses"]
+                current["coffee_cups"] += inc["coffee_cups"]
+                current["daily_goal"] = max(current["daily_goal"], inc["daily_goal"])
+                current["created_at"] = inc["created_at"]
+        raise
+    return len(increments)
+
+async def flush(user_ids: Optional[Iterable[int]] = None) -> int:
+    """Write buffered increments (all users, or some); returns the number of user-days written."""
+    if not enabled():
+        return 0
+    users = {key[0] for key in _pending} if user_ids is None else set(user_ids)
+    stripes = sorted({user_id % LOCK_STRIPES for user_id in users})
+    async with AsyncExitStack() as stack:
+        for stripe in stripes:  # Fixed order, so concurrent flushes cannot deadlock
+            await stack.enter_async_context(_locks[stripe])
+        return await _flush_locked(users)
+
+async def latest(db, user_id: int) -> Optional[HydrationLogOut]:
+    """Latest hydration log as it will look once the buffer is flushed."""
+    if not enabled():
+        return await db.scalar(latest_log_query(HydrationLog, user_id))
+    async with _lock(user_id):
+        row = await db.scalar(latest_log_query(HydrationLog, user_id))
+        pending = _user_pending(user_id)
+        if not pending:
+            return row
+        if len(pending) == 1 and row is not None and row.client_key == write_behind_key(pending[0]["day"]):
+            # Today's row already exists; add the unflushed part without writing
+            inc = pending[0]
+            return HydrationLogOut(
+                id=row.id,
+                created_at=row.created_at,
+                water_glasses=row.water_glasses + inc["water_glasses"],
+                coffee_cups=row.coffee_cups + inc["coffee_cups"],
+                daily_goal=max(row.daily_goal, inc["daily_goal"]),
+            )
+        # No row to merge into yet: write this user's increments now and read again.
+        # End the read transaction first so SQLite can take the write lock.
+        await db.rollback()
+        await _flush_locked([user_id])
+        return await db.scalar(latest_log_query(HydrationLog, user_id))
+
+async def _run() -> None:
+    while True:
+        await asyncio.sleep(settings.HYDRATION_FLUSH_SECONDS)
+        try:
+            written = await flush()
+            if written:
+                logger.debug("Flushed hydration buffer", extra={"fields": {"user_days": written}})
+        except Exception:
+            logger.exception("Hydration buffer flush failed", extra={"fields": {"pending": len(_pending)}})
+
+def start() -> None:
+    global _locks, _task
+    if settings.HYDRATION_WRITE_BEHIND and _task is None:
+        _locks = [asyncio.Lock() for _ in range(LOCK_STRIPES)]
+        _task = asyncio.get_running_loop().create_task(_run())
+
+async def stop() -> None:
+    global _locks, _task
+    if _task is not None:
+        _task.cancel()
+        try:
+            await _task
+        except asyncio.CancelledError:
+            pass
+        _task = None
+        try:
+            await flush()
+        except Exception:
+            logger.exception("Final hydration buffer flush failed", extra={"fields": {"pending": len(_pending)}})
+        _locks = None
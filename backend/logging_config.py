@@ -0,0 +1,98 @@
+# backend/logging_config.py
+# Structured, non-blocking logging. Handlers on the request path only enqueue the
+# record; a QueueListener thread formats JSON lines and writes them to stderr.
+# Records below WARNING can be sampled per logger (routers log under their module
+# name, e.g. "backend.routers.mood"), so chatty list endpoints can log 1-in-N.
+import atexit
+import json
+import logging
+import logging.handlers
+import queue
+import random
+import sys
+from datetime import datetime, timezone
+from typing import Dict, Optional
+from backend.config import settings
+
+class SamplingFilter(logging.Filter):
+    """Keeps DEBUG/INFO records with the rate configured for the longest matching logger prefix."""
+
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        # Longest prefix first so "backend.routers.mood" beats "backend.routers"
+        self.rates = sorted(rates.items(), key=lambda item: len(item[0]), reverse=True)
+
+    def rate_for(self, name: str) -> float:
+        for prefix, rate in self.rates:
+            if name == prefix or name.startswith(prefix + "."):
+                return rate
+        return 1.0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or not self.rates:
+            return True
+        rate = self.rate_for(record.name)
+        return rate >= 1.0 or random.random() < rate
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that drops (and counts) records when the queue is full instead of blocking."""
+
+    dropped = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            DroppingQueueHandler.dropped += 1
+
+class JsonFormatter(logging.Formatter):
+    # Structured fields are passed as logger.info("msg", extra={"fields": {...}})
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        fields = getattr(record, "fields", None)
+        if fields:
+            entry.update(fields)
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+def setup_logging() -> None:
+    """Installs the queue handler and starts its listener. Idempotent, and starts a new
+    listener after stop_logging (each app lifespan calls it)."""
+    global _listener
+    if _listener is not None:
+        return
+    stream = logging.StreamHandler(sys.stderr)
+    stream.setFormatter(JsonFormatter() if settings.LOG_JSON else logging.Formatter("%(levelname)s [%(name)s] %(message)s"))
+    log_queue = queue.Queue(maxsize=settings.LOG_QUEUE_SIZE)
+    handler = DroppingQueueHandler(log_queue)
+    handler.addFilter(SamplingFilter(settings.LOG_SAMPLE_RATES))
+    root = logging.getLogger()
+    root.handlers[:] = [handler]
+    root.setLevel(settings.LOG_LEVEL.upper())
+    _listener = logging.handlers.QueueListener(log_queue, stream, respect_handler_level=True)
+    _listener.start()
+
+def stop_logging() -> None:
+    """Flushes queued records and stops the listener; safe to call more than once.
+    Later records go straight to the listener's handlers, so nothing is lost between
+    one lifespan's shutdown and the next startup (tests, in-process benchmarks)."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        root = logging.getLogger()
+        filters = [f for handler in root.handlers for f in handler.filters]
+        for handler in _listener.handlers:
+            for f in filters:
+                handler.addFilter(f)
+        root.handlers[:] = list(_listener.handlers)
+        _listener = None
+
+atexit.register(stop_logging)
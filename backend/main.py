@@ -1,13 +1,47 @@
 # backend/main.py
+import logging
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from backend.routers import auth_router, users_router, wellness_router, dashboard_router, mood_router, hydration_router, coding_router, profile_router, coffee_router
-from backend.database import Base, engine
+from backend.routers import auth_router, users_router, wellness_router, dashboard_router, mood_router, hydration_router, coding_router, profile_router, coffee_router, logs_router, health_router, snacks_router, events_router, metrics_router
+from backend.database import Base, engine, async_engine
 from backend.config import settings
+from backend import events, passwords, paystack, payment_events, hydration_buffer, replicas, result_cache, snack_feedback, snacks, write_queue
+from backend.logging_config import setup_logging, stop_logging
+from backend.metrics import MetricsMiddleware
 from sqlalchemy.orm import configure_mappers
 
 
-app = FastAPI(title="DevWell API")
+setup_logging()
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    setup_logging()  # Again after a previous lifespan's stop_logging (tests, benchmarks)
+    passwords.start()
+    write_queue.start()
+    payment_events.start()
+    hydration_buffer.start()
+    replicas.start()
+    snacks.start()
+    await snack_feedback.start()
+    yield
+    await events.stop()
+    await snack_feedback.stop()
+    await snacks.stop()
+    await replicas.stop()
+    await hydration_buffer.stop()
+    await payment_events.stop()
+    await write_queue.stop()
+    passwords.shutdown()
+    await paystack.close_client()
+    await result_cache.close()
+    await async_engine.dispose()
+    stop_logging()
+
+
+app = FastAPI(title="DevWell API", lifespan=lifespan)
 
 configure_mappers()
 
@@ -21,6 +55,11 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Request metrics and Server-Timing headers; added last so it is outermost and
+# also times CORS and error handling
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
 # Create database tables
 Base.metadata.create_all(bind=engine)
 
@@ -34,5 +73,11 @@ app.include_router(hydration_router)  # Add this
 app.include_router(coding_router)  # Add this
 app.include_router(profile_router)  # Add this
 app.include_router(coffee_router)  # Add this
+app.include_router(logs_router)
+app.include_router(health_router)
+app.include_router(snacks_router)
+app.include_router(events_router)
+if settings.METRICS_ENABLED:
+    app.include_router(metrics_router)
 
-print("CORS origins:", settings.ALLOWED_ORIGINS)
+logger.info("CORS origins configured", extra={"fields": {"origins": settings.ALLOWED_ORIGINS}})
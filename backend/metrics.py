@@ -0,0 +1,236 @@
+# backend/metrics.py
+# Request and database metrics, exposed in the Prometheus text format on GET /metrics:
+#   devwell_http_requests_total                 requests by method, route and status
+#   devwell_http_request_duration_seconds       latency histogram by method and route (not SSE streams)
+#   devwell_http_requests_in_flight             requests being handled right now
+#   devwell_http_request_db_queries             queries per request, by method and route
+#   devwell_http_request_db_seconds             database time per request, by method and route
+#   devwell_db_queries_total, devwell_db_query_seconds_total, devwell_db_slow_queries_total
+#                                               every query, background work included
+# Routes are labelled with their template ("/api/mood/{log_id}"), never the raw path,
+# so the number of series stays bounded; requests that match no route share "unmatched".
+# Queries are timed by before/after_cursor_execute listeners on every engine
+# (instrument_engine) and added to the current request's totals through a ContextVar,
+# which follows the request into the threadpool, run_sync greenlets and the write queue.
+# Each response also gets a Server-Timing header (db time and query count, app time)
+# that browser devtools show per request, and queries slower than SLOW_QUERY_MS are
+# logged at WARNING. Written against the exposition format directly, so the
+# prometheus_client package isn't needed. Values are per process: with several
+# workers, scrape each one (or aggregate in the collector).
+import bisect
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Sequence, Tuple
+from sqlalchemy import event
+from backend.config import settings
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+EVENT_STREAM = b"text/event-stream"
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)) + "}"
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class _Metric(ABC):
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            lines.extend(self._samples())
+        return lines
+
+    @abstractmethod
+    def _samples(self) -> List[str]:
+        """Sample lines of every series; called with the lock held."""
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, labels: Tuple[str, ...] = (), amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def _samples(self) -> List[str]:
+        return [f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}" for labels, value in self._values.items()]
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, labels: Tuple[str, ...] = (), amount: float = 1) -> None:
+        self.inc(labels, -amount)
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = ()):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [per-bucket counts (the last one is +Inf), sum, count]
+        self._series: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, labels: Tuple[str, ...], value: float) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def _samples(self) -> List[str]:
+        lines = []
+        names = self.labelnames + ("le",)
+        for labels, (counts, total, count) in self._series.items():
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                lines.append(f"{self.name}_bucket{_format_labels(names, labels + (_format_value(bound),))} {cumulative}")
+            label_text = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_text} {_format_value(total)}")
+            lines.append(f"{self.name}_count{label_text} {count}")
+        return lines
+
+REQUESTS = Counter("devwell_http_requests_total", "HTTP requests handled.", ("method", "route", "status"))
+REQUEST_DURATION = Histogram(
+    "devwell_http_request_duration_seconds", "Time from receiving a request to the end of its response.",
+    ("method", "route"), settings.METRICS_LATENCY_BUCKETS,
+)
+IN_FLIGHT = Gauge("devwell_http_requests_in_flight", "HTTP requests currently being handled.")
+REQUEST_QUERIES = Histogram(
+    "devwell_http_request_db_queries", "Database queries run while handling a request.",
+    ("method", "route"), QUERY_COUNT_BUCKETS,
+)
+REQUEST_DB_SECONDS = Histogram(
+    "devwell_http_request_db_seconds", "Time spent in database queries while handling a request.",
+    ("method", "route"), settings.METRICS_LATENCY_BUCKETS,
+)
+QUERIES = Counter("devwell_db_queries_total", "Database queries run, including background work.")
+QUERY_SECONDS = Counter("devwell_db_query_seconds_total", "Time spent in database queries, including background work.")
+SLOW_QUERIES = Counter("devwell_db_slow_queries_total", "Database queries slower than SLOW_QUERY_MS.")
+ALL_METRICS = (REQUESTS, REQUEST_DURATION, IN_FLIGHT, REQUEST_QUERIES, REQUEST_DB_SECONDS, QUERIES, QUERY_SECONDS, SLOW_QUERIES)
+
+class RequestStats:
+    __slots__ = ("scope", "queries", "db_seconds")
+
+    def __init__(self, scope: dict):
+        self.scope = scope
+        self.queries = 0
+        self.db_seconds = 0.0
+
+    @property
+    def route(self) -> str:
+        # Set by the router once the request matched, so only read after routing
+        route = self.scope.get("route")
+        return getattr(route, "path", "unmatched")
+
+# The request being handled; None outside requests (startup, background workers)
+_current: ContextVar[Optional[RequestStats]] = ContextVar("devwell_request_stats", default=None)
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.get("query_started")
+    if not started:
+        return
+    elapsed = time.perf_counter() - started.pop()
+    QUERIES.inc()
+    QUERY_SECONDS.inc(amount=elapsed)
+    stats = _current.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.db_seconds += elapsed
+    if settings.SLOW_QUERY_MS > 0 and elapsed * 1000 >= settings.SLOW_QUERY_MS:
+        SLOW_QUERIES.inc()
+        # The statement only: parameters can hold personal data
+        logger.warning("Slow query", extra={"fields": {
+            "duration_ms": round(elapsed * 1000, 3),
+            "statement": statement[:1000],
+            "executemany": executemany,
+            "route": stats.route if stats is not None else None,
+        }})
+
+def instrument_engine(engine) -> None:
+    """Time every query run through the engine. For an AsyncEngine pass engine.sync_engine."""
+    if not settings.METRICS_ENABLED:
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+def _server_timing(stats: RequestStats, elapsed: float) -> bytes:
+    return b'db;dur=%.3f;desc="%d queries", app;dur=%.3f' % (stats.db_seconds * 1000, stats.queries, elapsed * 1000)
+
+class MetricsMiddleware:
+    """Pure ASGI middleware (unlike BaseHTTPMiddleware it doesn't buffer streaming
+    responses such as /api/events). Put it outermost so it times everything below it.
+    Server-Sent Event streams are counted but left out of the latency histogram and
+    get no Server-Timing header (see /api/health/events for open streams)."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        stats = RequestStats(scope)
+        token = _current.set(stats)
+        start = time.perf_counter()
+        status = 500  # If the app raises before starting a response
+        streaming = False
+
+        async def send_with_timing(message):
+            nonlocal status, streaming
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = list(message.get("headers", ()))
+                streaming = any(name == b"content-type" and value.startswith(EVENT_STREAM) for name, value in headers)
+                if settings.SERVER_TIMING and not streaming:
+                    headers.append((b"server-timing", _server_timing(stats, time.perf_counter() - start)))
+                    message = {**message, "headers": headers}
+            await send(message)
+
+        IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            elapsed = time.perf_counter() - start
+            IN_FLIGHT.dec()
+            _current.reset(token)
+            labels = (scope["method"], stats.route)
+            REQUESTS.inc(labels + (str(status),))
+            if not streaming:  # An event stream lasts minutes and would swamp the percentiles
+                REQUEST_DURATION.observe(labels, elapsed)
+            REQUEST_QUERIES.observe(labels, stats.queries)
+            REQUEST_DB_SECONDS.observe(labels, stats.db_seconds)
+
+def render() -> bytes:
+    lines = [line for metric in ALL_METRICS for line in metric.render()]
+    return ("\n".join(lines) + "\n").encode()
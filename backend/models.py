@@ -1,15 +1,53 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey
+from datetime import datetime, timezone
+from sqlalchemy import Column, Integer, String, Text, Float, Date, DateTime, ForeignKey, Index, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
+from sqlalchemy.types import TypeDecorator
 from backend.database import Base
 
+class Timestamp(TypeDecorator):
+    # DateTime(timezone=True) everywhere except SQLite, where values are stored as text.
+    # SQLite's CURRENT_TIMESTAMP (our server default) writes "YYYY-MM-DD HH:MM:SS" while
+    # the stock SQLite DateTime binds "YYYY-MM-DD HH:MM:SS.ffffff", so equal instants
+    # compared unequal. Here every instant has one spelling: whole seconds are bound
+    # without a fraction, like CURRENT_TIMESTAMP, and a ".ffffff" fraction is added only
+    # when it is non-zero. Equal instants then compare equal, and text order stays
+    # chronological, since a whole second sorts before the same second with a fraction
+    # (a prefix sorts first). Keyset pagination on (created_at, id) relies on both;
+    # benchmarks/timestamp_check.py checks them.
+    impl = DateTime(timezone=True)
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "sqlite":
+            return dialect.type_descriptor(String())
+        return dialect.type_descriptor(DateTime(timezone=True))
+
+    def process_bind_param(self, value, dialect):
+        if value is None or dialect.name != "sqlite" or isinstance(value, str):
+            return value
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value.strftime("%Y-%m-%d %H:%M:%S" if value.microsecond == 0 else "%Y-%m-%d %H:%M:%S.%f")
+
+    def process_result_value(self, value, dialect):
+        if value is None or dialect.name != "sqlite" or isinstance(value, datetime):
+            return value
+        return datetime.fromisoformat(value)
+
+def client_key_index(table: str) -> Index:
+    # Idempotency keys for batch ingestion (POST /api/logs/batch); unique per user
+    # when present, so a retried upload inserts each entry at most once
+    where = text("client_key IS NOT NULL")
+    return Index(f"ix_{table}_user_id_client_key", "user_id", "client_key", unique=True, sqlite_where=where, postgresql_where=where)
+
 class User(Base):
     __tablename__ = "users"
     __table_args__ = {'extend_existing': True}  # Prevent redefinition errors
     id = Column(Integer, primary_key=True, index=True)
     email = Column(String, unique=True, index=True, nullable=False)
     hashed_password = Column(String, nullable=False)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(Timestamp, server_default=func.now())
     mood_logs = relationship("MoodLog", order_by="MoodLog.created_at.desc()", back_populates="user")
     hydration_logs = relationship("HydrationLog", order_by="HydrationLog.created_at.desc()", back_populates="user")
     coding_sessions = relationship("CodingSession", order_by="CodingSession.created_at.desc()", back_populates="user")
@@ -18,51 +56,75 @@ class User(Base):
 
 class MoodLog(Base):
     __tablename__ = "mood_logs"
-    __table_args__ = {'extend_existing': True}  # Prevent redefinition errors
+    __table_args__ = (
+        # Serves every per-user time-window query and "latest first" lookup
+        Index("ix_mood_logs_user_id_created_at", "user_id", "created_at"),
+        client_key_index("mood_logs"),
+        {'extend_existing': True},  # Prevent redefinition errors
+    )
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     mood_score = Column(Float, nullable=False)
     notes = Column(String, nullable=True)
     tiredness_level = Column(Integer, nullable=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    client_key = Column(String, nullable=True)
+    created_at = Column(Timestamp, server_default=func.now())
     user = relationship("User", back_populates="mood_logs")
 
 class HydrationLog(Base):
     __tablename__ = "hydration_logs"
-    __table_args__ = {'extend_existing': True}  # Prevent redefinition errors
+    __table_args__ = (
+        # Serves every per-user time-window query and "latest first" lookup
+        Index("ix_hydration_logs_user_id_created_at", "user_id", "created_at"),
+        client_key_index("hydration_logs"),
+        {'extend_existing': True},  # Prevent redefinition errors
+    )
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     water_glasses = Column(Integer, nullable=False)
     coffee_cups = Column(Integer, nullable=False, default=0)
     daily_goal = Column(Integer, nullable=False, default=8)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    client_key = Column(String, nullable=True)
+    created_at = Column(Timestamp, server_default=func.now())
     user = relationship("User", back_populates="hydration_logs")
 
 class CodingSession(Base):
     __tablename__ = "coding_sessions"
-    __table_args__ = {'extend_existing': True}  # Prevent redefinition errors
+    __table_args__ = (
+        # Serves every per-user time-window query and "latest first" lookup
+        Index("ix_coding_sessions_user_id_created_at", "user_id", "created_at"),
+        client_key_index("coding_sessions"),
+        {'extend_existing': True},  # Prevent redefinition errors
+    )
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     duration_minutes = Column(Integer, nullable=False)
     notes = Column(String, nullable=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    client_key = Column(String, nullable=True)
+    created_at = Column(Timestamp, server_default=func.now())
     user = relationship("User", back_populates="coding_sessions")
 
 class FocusSession(Base):
     __tablename__ = "focus_sessions"
-    __table_args__ = {'extend_existing': True}  # Prevent redefinition errors
+    __table_args__ = (
+        # Serves every per-user time-window query and "latest first" lookup
+        Index("ix_focus_sessions_user_id_created_at", "user_id", "created_at"),
+        client_key_index("focus_sessions"),
+        {'extend_existing': True},  # Prevent redefinition errors
+    )
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     duration_minutes = Column(Integer, nullable=False)
     notes = Column(String, nullable=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    client_key = Column(String, nullable=True)
+    created_at = Column(Timestamp, server_default=func.now())
     user = relationship("User", back_populates="focus_sessions")
 
 class UserProfile(Base):
     __tablename__ = "user_profiles"
     __table_args__ = {'extend_existing': True}  # Prevent redefinition errors
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     nickname = Column(String, nullable=False)
     timezone = Column(String, nullable=False)
     work_hours_start = Column(String, nullable=False)  # e.g., "09:00"
@@ -73,5 +135,62 @@ class UserProfile(Base):
     reminder_frequency = Column(String, nullable=False)  # "minimal", "balanced", "frequent"
     age = Column(Integer, nullable=True)
     weight = Column(Float, nullable=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
-    user = relationship("User", back_populates="profile")
\ No newline at end of file
+    created_at = Column(Timestamp, server_default=func.now())
+    user = relationship("User", back_populates="profile")
+
+class DailyWellnessRollup(Base):
+    # Per-user per-day totals, bumped by the crud create_* functions in the same
+    # transaction as the raw log row (see crud.bump_daily_rollup)
+    __tablename__ = "daily_wellness_rollups"
+    __table_args__ = (
+        Index("ix_daily_wellness_rollups_user_id_day", "user_id", "day", unique=True),
+        {'extend_existing': True},  # Prevent redefinition errors
+    )
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    day = Column(Date, nullable=False)  # UTC day
+    mood_sum = Column(Float, nullable=False, default=0, server_default="0")
+    mood_count = Column(Integer, nullable=False, default=0, server_default="0")
+    tiredness_sum = Column(Integer, nullable=False, default=0, server_default="0")
+    tiredness_count = Column(Integer, nullable=False, default=0, server_default="0")
+    water_glasses = Column(Integer, nullable=False, default=0, server_default="0")
+    coffee_cups = Column(Integer, nullable=False, default=0, server_default="0")
+    daily_goal = Column(Integer, nullable=False, default=0, server_default="0")  # Highest goal logged that day (crud.ROLLUP_MAXIMA)
+    coding_minutes = Column(Integer, nullable=False, default=0, server_default="0")
+    coding_sessions = Column(Integer, nullable=False, default=0, server_default="0")
+    focus_minutes = Column(Integer, nullable=False, default=0, server_default="0")
+
+class PaymentEvent(Base):
+    # Paystack webhook deliveries, stored on receipt and handled later by
+    # backend/payment_events.py. Redeliveries hit the unique index and are ignored.
+    __tablename__ = "payment_events"
+    __table_args__ = (
+        Index("ix_payment_events_reference_event", "reference", "event", unique=True),
+        Index("ix_payment_events_status_id", "status", "id"),
+        {'extend_existing': True},  # Prevent redefinition errors
+    )
+    id = Column(Integer, primary_key=True, index=True)
+    reference = Column(String, nullable=False)
+    event = Column(String, nullable=False)        # e.g. "charge.success"
+    payload = Column(Text, nullable=False)        # Raw webhook body
+    status = Column(String, nullable=False, default="pending", server_default="pending")  # "pending", "processed", "failed"
+    attempts = Column(Integer, nullable=False, default=0, server_default="0")
+    received_at = Column(Timestamp, server_default=func.now())
+    processed_at = Column(Timestamp, nullable=True)
+    next_attempt_at = Column(Timestamp, nullable=True)  # Retry backoff; NULL means due now
+
+class SnackFeedback(Base):
+    # Like/dislike counts per user, diet section and suggestion, written in batches
+    # by backend/snack_feedback.py and read back at startup to seed the ranker.
+    __tablename__ = "snack_feedback"
+    __table_args__ = (
+        Index("ix_snack_feedback_user_id_diet_suggestion", "user_id", "diet", "suggestion", unique=True),
+        {'extend_existing': True},  # Prevent redefinition errors
+    )
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    diet = Column(String, nullable=False)        # snacks.json section the suggestion came from
+    suggestion = Column(String, nullable=False)  # Item name in snacks.json
+    likes = Column(Integer, nullable=False, default=0, server_default="0")
+    dislikes = Column(Integer, nullable=False, default=0, server_default="0")
+    updated_at = Column(Timestamp, server_default=func.now())
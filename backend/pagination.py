@@ -0,0 +1,31 @@
+# backend/pagination.py
+# Opaque keyset cursors for the /history endpoints. A cursor encodes the
+# (created_at, id) of the last row on a page; the next page continues strictly
+# after it in (created_at desc, id desc) order.
+import base64
+from datetime import datetime
+from typing import Iterable, List, Optional, Tuple
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    raw = f"{created_at.isoformat()}|{row_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Raises ValueError for anything that is not a cursor we issued."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, row_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (UnicodeDecodeError, base64.binascii.Error) as e:
+        raise ValueError("Malformed cursor") from e
+
+def parse_fields(fields: Optional[str], allowed: Iterable[str]) -> List[str]:
+    """Comma-separated projection; id and created_at are always returned (they form the cursor)."""
+    allowed = list(allowed)
+    if not fields:
+        return allowed
+    requested = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = [f for f in requested if f not in allowed]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    return ["id", "created_at"] + [f for f in requested if f not in ("id", "created_at")]
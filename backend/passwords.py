@@ -0,0 +1,85 @@
+# backend/passwords.py
+# bcrypt hashing/verification runs in a dedicated, size-limited process pool so
+# a login burst neither holds the GIL nor occupies Starlette's shared threadpool.
+# Workers are spawned, not forked: the app process already runs threads (the log
+# listener, asyncio's executor, aiosqlite), and a forked child can inherit locks
+# those threads held. A spawned worker starts a fresh interpreter and imports this
+# module, so it must stay free of DB imports; like any spawn pool, it also re-imports
+# the main script, which therefore needs an `if __name__ == "__main__"` guard.
+# A pool whose worker died (OOM kill, crash in bcrypt) refuses all further work, so
+# it is replaced and the job retried once; hashing has no side effects to repeat.
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional, Tuple
+from passlib.context import CryptContext
+from backend.config import settings
+
+# min_rounds makes weaker stored hashes count as outdated, so verify_and_update upgrades them
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__min_rounds=12)
+
+logger = logging.getLogger(__name__)
+
+class PasswordHasherBusy(Exception):
+    """Raised when PASSWORD_HASH_MAX_PENDING hash jobs are already queued or running."""
+
+_executor: Optional[ProcessPoolExecutor] = None
+_pending = 0
+
+def _hash(password: str) -> str:
+    return pwd_context.hash(password)
+
+def _verify_and_update(password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    return pwd_context.verify_and_update(password, hashed_password)
+
+def _warm_up() -> None:
+    pass
+
+def start():
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=settings.PASSWORD_HASH_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+        # Spawned workers take a while to import; start them now, not on the first login
+        _executor.submit(_warm_up)
+    return _executor
+
+def _replace_broken(executor: ProcessPoolExecutor) -> None:
+    global _executor
+    if _executor is executor:  # Concurrent jobs on the same pool see it break together
+        logger.warning("Password hashing pool broke, starting a new one")
+        executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+def shutdown():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+async def _submit(fn, *args):
+    global _pending
+    if _pending >= settings.PASSWORD_HASH_MAX_PENDING:
+        raise PasswordHasherBusy()
+    _pending += 1
+    try:
+        for _ in range(2):
+            executor = start()
+            try:
+                return await asyncio.get_running_loop().run_in_executor(executor, fn, *args)
+            except BrokenProcessPool:
+                _replace_broken(executor)
+        raise PasswordHasherBusy()  # Broke again: a 503 like a full queue, not a 500
+    finally:
+        _pending -= 1
+
+async def hash_password(password: str) -> str:
+    return await _submit(_hash, password)
+
+async def verify_and_update(password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """Returns (valid, new_hash); new_hash is set when the stored hash uses outdated settings."""
+    return await _submit(_verify_and_update, password, hashed_password)
+
+def pending() -> int:
+    return _pending
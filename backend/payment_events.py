@@ -0,0 +1,98 @@
+# backend/payment_events.py
+# Background worker for Paystack webhook events. The webhook route only verifies
+# the signature, stores the raw event in payment_events and calls notify(); this
+# worker picks pending events up in batches, off the request path. It also polls
+# every PAYMENT_EVENT_POLL_SECONDS so events stored while it was down get handled.
+# A failed event is retried with exponential backoff (next_attempt_at), so a failing
+# handler or database doesn't use up PAYMENT_EVENT_MAX_ATTEMPTS in one drain.
+import asyncio
+import json
+import logging
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Optional
+from backend.config import settings
+from backend.crud import get_pending_payment_events
+from backend.database import AsyncSessionLocal
+from backend import write_queue
+
+logger = logging.getLogger(__name__)
+
+def handle_charge_success(data: dict) -> None:
+    logger.info("Payment successful", extra={"fields": {"reference": data.get("reference"), "amount": data.get("amount")}})
+
+# event type -> handler(data); events without a handler are marked processed as-is
+HANDLERS: Dict[str, Callable[[dict], None]] = {
+    "charge.success": handle_charge_success,
+}
+
+_task: Optional[asyncio.Task] = None
+_wakeup: Optional[asyncio.Event] = None
+
+def retry_delay(attempts: int) -> timedelta:
+    """Backoff before the next try of an event that has failed `attempts` times."""
+    seconds = settings.PAYMENT_EVENT_RETRY_BASE_SECONDS * 2 ** (attempts - 1)
+    return timedelta(seconds=min(seconds, settings.PAYMENT_EVENT_RETRY_MAX_SECONDS))
+
+def process_events(db, events) -> None:
+    # Runs inside AsyncSession.run_sync; one commit per batch
+    for event in events:
+        try:
+            handler = HANDLERS.get(event.event)
+            if handler is not None:
+                handler(json.loads(event.payload).get("data") or {})
+            event.status = "processed"
+            event.processed_at = datetime.utcnow()
+            event.next_attempt_at = None
+        except Exception:
+            event.attempts += 1
+            if event.attempts >= settings.PAYMENT_EVENT_MAX_ATTEMPTS:
+                event.status = "failed"
+            else:
+                event.next_attempt_at = datetime.utcnow() + retry_delay(event.attempts)
+            logger.exception("Payment event handling failed", extra={"fields": {"payment_event_id": event.id, "attempts": event.attempts}})
+    db.commit()
+
+async def process_batch() -> int:
+    """Handles up to PAYMENT_EVENT_BATCH_SIZE pending events; returns how many were picked up."""
+    async with AsyncSessionLocal() as db:
+        def run(sync_db):
+            events = get_pending_payment_events(sync_db, settings.PAYMENT_EVENT_BATCH_SIZE)
+            process_events(sync_db, events)
+            return len(events)
+        return await write_queue.run(db, run)
+
+async def _run() -> None:
+    while True:
+        try:
+            await asyncio.wait_for(_wakeup.wait(), timeout=settings.PAYMENT_EVENT_POLL_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+        _wakeup.clear()
+        try:
+            # Drain everything due before sleeping again; events that just failed
+            # are not due until their backoff has passed
+            while await process_batch() == settings.PAYMENT_EVENT_BATCH_SIZE:
+                pass
+        except Exception:
+            logger.exception("Payment event batch failed")
+
+def start() -> None:
+    global _task, _wakeup
+    if _task is None:
+        _wakeup = asyncio.Event()
+        _task = asyncio.get_running_loop().create_task(_run())
+
+async def stop() -> None:
+    global _task, _wakeup
+    if _task is not None:
+        _task.cancel()
+        try:
+            await _task
+        except asyncio.CancelledError:
+            pass
+        _task = None
+        _wakeup = None
+
+def notify() -> None:
+    if _wakeup is not None:
+        _wakeup.set()
@@ -0,0 +1,64 @@
+# backend/paystack.py
+# Shared httpx.AsyncClient for the Paystack API: one keep-alive connection pool
+# per process, explicit connect/read timeouts and bounded retries for idempotent
+# calls. Point PAYSTACK_API_URL at backend/paystack_stub.py for local testing.
+import asyncio
+import logging
+import random
+from typing import Optional
+import httpx
+from backend.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Statuses worth retrying on an idempotent request
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+
+_client: Optional[httpx.AsyncClient] = None
+
+def build_client(transport: Optional[httpx.AsyncBaseTransport] = None) -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        base_url=settings.PAYSTACK_API_URL,
+        timeout=httpx.Timeout(settings.PAYSTACK_READ_TIMEOUT, connect=settings.PAYSTACK_CONNECT_TIMEOUT),
+        limits=httpx.Limits(
+            max_connections=settings.PAYSTACK_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.PAYSTACK_MAX_CONNECTIONS,
+        ),
+        transport=transport,
+    )
+
+def get_client() -> httpx.AsyncClient:
+    global _client
+    if _client is None:
+        _client = build_client()
+    return _client
+
+def set_client(client: Optional[httpx.AsyncClient]) -> None:
+    """Swap the shared client, e.g. for one backed by httpx.ASGITransport(paystack_stub.app)."""
+    global _client
+    _client = client
+
+async def close_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+async def request(method: str, url: str, *, retries: int = 0, **kwargs) -> httpx.Response:
+    """Send a request, retrying transport errors and RETRYABLE_STATUSES up to `retries` times
+    with jittered exponential backoff. Only pass retries > 0 for idempotent calls.
+    Non-retryable error statuses raise httpx.HTTPStatusError."""
+    attempt = 0
+    while True:
+        try:
+            response = await get_client().request(method, url, **kwargs)
+            if response.status_code not in RETRYABLE_STATUSES or attempt >= retries:
+                response.raise_for_status()
+                return response
+        except httpx.TransportError:
+            if attempt >= retries:
+                raise
+        delay = settings.PAYSTACK_RETRY_BACKOFF * (2 ** attempt) * (0.5 + random.random())
+        attempt += 1
+        logger.warning("Retrying Paystack request", extra={"fields": {"url": url, "attempt": attempt, "delay": round(delay, 3)}})
+        await asyncio.sleep(delay)
@@ -0,0 +1,58 @@
+# backend/paystack_stub.py
+# Local stand-in for the Paystack endpoints used by routers/coffee.py, for
+# development and load testing without touching the real API:
+#
+#   uvicorn backend.paystack_stub:app --port 8100
+#   PAYSTACK_API_URL=http://localhost:8100 uvicorn backend.main:app
+#
+# or in-process: paystack.set_client(paystack.build_client(httpx.ASGITransport(app=paystack_stub.app)))
+#
+# STUB_LATENCY (seconds) and STUB_FAIL_RATE (0-1, answered with 503) inject slowness and errors.
+import asyncio
+import os
+import random
+import uuid
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+app = FastAPI(title="Paystack stub")
+
+STUB_LATENCY = float(os.getenv("STUB_LATENCY", "0"))
+STUB_FAIL_RATE = float(os.getenv("STUB_FAIL_RATE", "0"))
+
+transactions = {}
+
+async def simulate():
+    if STUB_LATENCY:
+        await asyncio.sleep(STUB_LATENCY)
+    if STUB_FAIL_RATE and random.random() < STUB_FAIL_RATE:
+        return JSONResponse({"status": False, "message": "Stub failure"}, status_code=503)
+    return None
+
+@app.post("/transaction/initialize")
+async def initialize(request: Request):
+    failure = await simulate()
+    if failure:
+        return failure
+    body = await request.json()
+    reference = uuid.uuid4().hex[:12]
+    transactions[reference] = body
+    return {
+        "status": True,
+        "message": "Authorization URL created",
+        "data": {"access_code": f"stub_{reference}", "reference": reference, "authorization_url": f"https://checkout.stub/{reference}"},
+    }
+
+@app.get("/transaction/verify/{reference}")
+async def verify(reference: str):
+    failure = await simulate()
+    if failure:
+        return failure
+    body = transactions.get(reference)
+    if body is None:
+        return JSONResponse({"status": False, "message": "Transaction reference not found"}, status_code=400)
+    return {
+        "status": True,
+        "message": "Verification successful",
+        "data": {"reference": reference, "status": "success", "amount": body.get("amount"), "currency": body.get("currency"), "customer": {"email": body.get("email")}},
+    }
@@ -0,0 +1,156 @@
+# backend/replicas.py
+# Read-replica routing. Read-only endpoints take their session from
+# security.get_read_db, which asks read_session() for one:
+#   - round-robin over READ_REPLICA_URLS, skipping replicas marked down
+#   - the primary when there are no replicas or none is up
+#   - the primary for a user who wrote within READ_YOUR_WRITES_SECONDS, so a user
+#     never reads data older than their own last write (replication lag)
+#   - the primary for a user whose data version (backend.user_versions) changed
+#     within READ_YOUR_WRITES_SECONDS, so an ETag for the new version
+#     (backend.http_cache) is never issued over a replica's older body and then
+#     answered with 304s for good. READ_YOUR_WRITES_SECONDS must therefore cover
+#     the replicas' worst replication lag.
+# Replicas are marked down when a connection to them fails, and re-checked with
+# SELECT 1 every READ_REPLICA_HEALTH_SECONDS by a background task. read_session
+# connects before handing the session out, so a replica that can't be reached
+# falls back to the primary instead of failing the request; run_in_replica also
+# retries a read on the primary when the replica connection breaks mid-query.
+import asyncio
+import itertools
+import logging
+from contextlib import asynccontextmanager
+from typing import List, Optional
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError, InterfaceError, OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from backend import user_versions
+from backend.cache import TTLCache
+from backend.config import settings
+from backend.database import AsyncSessionLocal, apply_sqlite_pragmas, engine_options, to_async_url
+from backend.metrics import instrument_engine
+
+logger = logging.getLogger(__name__)
+
+class Replica:
+    def __init__(self, url: str):
+        url = to_async_url(url)
+        self.engine = create_async_engine(url, **engine_options(url, is_async=True))
+        apply_sqlite_pragmas(self.engine.sync_engine)
+        instrument_engine(self.engine.sync_engine)
+        self.sessions = async_sessionmaker(bind=self.engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+        self.name = self.engine.url.render_as_string(hide_password=True)
+        self.healthy = True
+
+    def mark(self, healthy: bool) -> None:
+        if healthy != self.healthy:
+            if healthy:
+                logger.info("Read replica up", extra={"fields": {"replica": self.name}})
+            else:
+                logger.warning("Read replica down", extra={"fields": {"replica": self.name}})
+        self.healthy = healthy
+
+_replicas: List[Replica] = [Replica(url) for url in settings.READ_REPLICA_URLS]
+_round_robin = itertools.count()
+# user_id -> True for users who wrote recently; the TTL is the stickiness window
+_recent_writers = TTLCache(settings.READ_YOUR_WRITES_MAX_USERS, settings.READ_YOUR_WRITES_SECONDS)
+_task: Optional[asyncio.Task] = None
+
+def mark_write(user_id: int) -> None:
+    if _replicas:
+        _recent_writers.set(user_id, True)
+
+def choose(user_id: Optional[int] = None) -> Optional[Replica]:
+    """The replica to read from, or None for the primary."""
+    if not _replicas:
+        return None
+    if user_id is not None and (
+        _recent_writers.get(user_id) or user_versions.changed_within(user_id, settings.READ_YOUR_WRITES_SECONDS)
+    ):
+        return None
+    start = next(_round_robin)
+    for offset in range(len(_replicas)):
+        replica = _replicas[(start + offset) % len(_replicas)]
+        if replica.healthy:
+            return replica
+    return None
+
+def _is_connection_error(error: Exception) -> bool:
+    if isinstance(error, DBAPIError):
+        return error.connection_invalidated or isinstance(error, (OperationalError, InterfaceError))
+    return isinstance(error, (OSError, asyncio.TimeoutError))
+
+@asynccontextmanager
+async def read_session(user_id: Optional[int] = None):
+    replica = choose(user_id)
+    if replica is not None:
+        db = replica.sessions()
+        try:
+            await db.connection()
+        except Exception as e:
+            await db.close()
+            if not _is_connection_error(e):
+                raise
+            replica.mark(False)
+            replica = None
+    if replica is None:
+        db = AsyncSessionLocal()
+    async with db:
+        try:
+            yield db
+        except Exception as e:
+            # Too late to retry here (the handler's work is done); later requests
+            # skip this replica until it passes a check
+            if replica is not None and _is_connection_error(e):
+                replica.mark(False)
+            raise
+
+async def run_in_replica(user_id: int, fn, *args):
+    """AsyncSession.run_sync(fn, *args) on a read session, retried once on the
+    primary if the replica connection fails."""
+    replica = choose(user_id)
+    if replica is not None:
+        try:
+            async with replica.sessions() as db:
+                return await db.run_sync(fn, *args)
+        except Exception as e:
+            if not _is_connection_error(e):
+                raise
+            replica.mark(False)
+    async with AsyncSessionLocal() as db:
+        return await db.run_sync(fn, *args)
+
+async def check(replica: Replica) -> bool:
+    try:
+        async with replica.engine.connect() as conn:
+            await asyncio.wait_for(conn.execute(text("SELECT 1")), timeout=settings.DB_CONNECT_TIMEOUT_SECONDS)
+        replica.mark(True)
+    except Exception as e:
+        if not _is_connection_error(e):
+            logger.exception("Read replica check failed", extra={"fields": {"replica": replica.name}})
+        replica.mark(False)
+    return replica.healthy
+
+async def _run() -> None:
+    while True:
+        await asyncio.gather(*[check(replica) for replica in _replicas])
+        await asyncio.sleep(settings.READ_REPLICA_HEALTH_SECONDS)
+
+def status() -> List[dict]:
+    return [{"replica": replica.name, "healthy": replica.healthy} for replica in _replicas]
+
+def start() -> None:
+    global _task
+    if _replicas and _task is None:
+        _task = asyncio.get_running_loop().create_task(_run())
+
+async def stop() -> None:
+    global _task
+    if _task is not None:
+        _task.cancel()
+        try:
+            await _task
+        except asyncio.CancelledError:
+            pass
+        _task = None
+    for replica in _replicas:
+        await replica.engine.dispose()
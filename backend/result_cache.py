@@ -0,0 +1,139 @@
+# backend/result_cache.py
+# Per-user cache of computed read results (dashboard stats, weekly trends), keyed by
+# user and endpoint. crud_async drops a user's entries after each committed write,
+# so a read after a read skips the database; entries also expire after
+# RESULT_CACHE_TTL_SECONDS, which bounds staleness of time windows and of writes
+# made by other processes when the cache is not shared.
+# Backends (RESULT_CACHE_BACKEND):
+#   "memory" - in-process LRU with TTL (default)
+#   "redis"  - one hash per user on a Redis-compatible server (REDIS_URL); needs the
+#              optional `redis` package. Shared by all workers, so their writes
+#              invalidate each other's entries. Any client with async
+#              hget/hset/expire/delete works (see set_backend), e.g. a local stand-in.
+#   "none"   - disabled
+# Values are normalized to JSON-compatible data (orjson, falling back to
+# jsonable_encoder for models), the same for every backend.
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+import orjson
+from fastapi.encoders import jsonable_encoder
+from backend import user_versions
+from backend.cache import TTLCache
+from backend.config import settings
+
+logger = logging.getLogger(__name__)
+
+class MemoryBackend:
+    name = "memory"
+
+    def __init__(self, max_users: int, ttl: float):
+        # user_id -> {key: (expires_at, value)}; dropping the user entry invalidates everything
+        self._users = TTLCache(max_users, ttl)
+
+    async def get(self, user_id: int, key: str) -> Optional[Any]:
+        entry = (self._users.get(user_id) or {}).get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            return None
+        return entry[1]
+
+    async def set(self, user_id: int, key: str, value: Any, ttl: float) -> None:
+        entries = dict(self._users.get(user_id) or {})
+        entries[key] = (time.monotonic() + ttl, value)
+        self._users.set(user_id, entries)
+
+    async def invalidate(self, user_id: int) -> None:
+        self._users.pop(user_id)
+
+    async def close(self) -> None:
+        self._users.clear()
+
+class RedisBackend:
+    name = "redis"
+
+    def __init__(self, client, prefix: str = "devwell:results:"):
+        self.client = client
+        self.prefix = prefix
+
+    async def get(self, user_id: int, key: str) -> Optional[Any]:
+        raw = await self.client.hget(f"{self.prefix}{user_id}", key)
+        return None if raw is None else orjson.loads(raw)
+
+    async def set(self, user_id: int, key: str, value: Any, ttl: float) -> None:
+        name = f"{self.prefix}{user_id}"
+        await self.client.hset(name, key, orjson.dumps(value))
+        await self.client.expire(name, max(1, int(ttl)))
+
+    async def invalidate(self, user_id: int) -> None:
+        await self.client.delete(f"{self.prefix}{user_id}")
+
+    async def close(self) -> None:
+        close = getattr(self.client, "aclose", None)
+        if close is not None:
+            await close()
+
+def build_backend():
+    if settings.RESULT_CACHE_BACKEND == "none":
+        return None
+    if settings.RESULT_CACHE_BACKEND == "redis":
+        try:
+            import redis.asyncio as redis
+        except ImportError as e:
+            raise RuntimeError("RESULT_CACHE_BACKEND=redis needs the 'redis' package") from e
+        return RedisBackend(redis.from_url(settings.REDIS_URL))
+    return MemoryBackend(settings.RESULT_CACHE_MAX_USERS, settings.RESULT_CACHE_TTL_SECONDS)
+
+_backend = build_backend()
+# endpoint -> {"hits": n, "misses": n}
+_stats: Dict[str, Dict[str, int]] = {}
+
+def set_backend(backend) -> None:
+    """Swap the backend (None disables caching), e.g. RedisBackend(stand_in_client)."""
+    global _backend
+    _backend = backend
+
+async def cached(user_id: int, endpoint: str, compute: Callable[[], Awaitable[Any]], variant: str = "") -> Any:
+    """Cached JSON-compatible result of `compute()` for this user and endpoint.
+    `variant` separates results of the same endpoint, e.g. the day of a time window."""
+    if _backend is None:
+        return await compute()
+    key = f"{endpoint}:{variant}" if variant else endpoint
+    counters = _stats.setdefault(endpoint, {"hits": 0, "misses": 0})
+    try:
+        value = await _backend.get(user_id, key)
+    except Exception:
+        logger.exception("Result cache read failed", extra={"fields": {"backend": _backend.name, "endpoint": endpoint}})
+        value = None
+    if value is not None:
+        counters["hits"] += 1
+        return value
+    counters["misses"] += 1
+    version = user_versions.get(user_id)
+    value = orjson.loads(orjson.dumps(await compute(), default=jsonable_encoder))
+    # A write that committed while computing may not be in `value`; don't store it
+    if user_versions.get(user_id) == version:
+        try:
+            await _backend.set(user_id, key, value, settings.RESULT_CACHE_TTL_SECONDS)
+        except Exception:
+            logger.exception("Result cache write failed", extra={"fields": {"backend": _backend.name, "endpoint": endpoint}})
+    return value
+
+async def invalidate(user_id: int) -> None:
+    if _backend is None:
+        return
+    try:
+        await _backend.invalidate(user_id)
+    except Exception:
+        # Entries still expire after RESULT_CACHE_TTL_SECONDS
+        logger.exception("Result cache invalidation failed", extra={"fields": {"backend": _backend.name, "user_id": user_id}})
+
+def stats() -> dict:
+    endpoints = {
+        endpoint: {**counters, "hit_rate": round(counters["hits"] / total, 4) if (total := counters["hits"] + counters["misses"]) else 0.0}
+        for endpoint, counters in _stats.items()
+    }
+    return {"backend": _backend.name if _backend is not None else "none", "endpoints": endpoints}
+
+async def close() -> None:
+    if _backend is not None:
+        await _backend.close()
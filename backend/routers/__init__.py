@@ -8,5 +8,10 @@ from .hydration import router as hydration_router  # Add this
 from .coding import router as coding_router  # Add this
 from .profile import router as profile_router  # Add this
 from .coffee import router as coffee_router  # Add this
+from .logs import router as logs_router
+from .health import router as health_router
+from .snacks import router as snacks_router
+from .events import router as events_router
+from .metrics import router as metrics_router
 
 
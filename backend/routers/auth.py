@@ -1,60 +1,79 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from backend.schemas import UserCreate, UserLogin, Token
-from backend.crud import get_user_by_email, create_user, verify_password, get_user_profile
+from backend.crud_async import get_user_by_email, create_user, update_password_hash
+from backend.passwords import PasswordHasherBusy, hash_password, verify_and_update
 from backend.security import create_access_token
-from backend.database import get_db
+from backend.database import get_async_db
 import logging
 
 router = APIRouter(prefix="/api/auth", tags=["auth"])
-
-# Set up logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+def hasher_busy_exception():
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many authentication requests, please retry shortly",
+        headers={"Retry-After": "1"},
+    )
+
 @router.post("/signup", response_model=Token)
-def signup(user: UserCreate, db: Session = Depends(get_db)):
+async def signup(user: UserCreate, db: AsyncSession = Depends(get_async_db)):
     try:
-        db_user = get_user_by_email(db, user.email)
+        db_user = await get_user_by_email(db, user.email)
         if db_user:
-            logger.error(f"Signup failed: Email already registered: {user.email}")
+            logger.info("Signup rejected, email already registered", extra={"fields": {"email": user.email}})
             raise HTTPException(status_code=400, detail="Email already registered")
-        db_user = create_user(db, user.email, user.password)
-        access_token = create_access_token(data={"sub": user.email}, remember_me=False)  # Default remember_me to False for signup
-        logger.info(f"Signup successful for user: {user.email}, needs_onboarding: true")
+        hashed_password = await hash_password(user.password)
+        db_user = await create_user(db, user.email, hashed_password)
+        access_token = create_access_token(data={"sub": user.email, "uid": db_user.id}, remember_me=False)  # Default remember_me to False for signup
+        logger.info("Signup successful", extra={"fields": {"user_id": db_user.id, "needs_onboarding": True}})
         return {
             "access_token": access_token,
             "token_type": "bearer",
             "needs_onboarding": True  # New users need onboarding
         }
-    except Exception as e:
-        logger.error(f"Unexpected error during signup for email {user.email}: {str(e)}")
+    except HTTPException:
+        raise
+    except PasswordHasherBusy:
+        logger.warning("Signup shed, password hasher queue full", extra={"fields": {"email": user.email}})
+        raise hasher_busy_exception()
+    except Exception:
+        logger.exception("Unexpected error during signup", extra={"fields": {"email": user.email}})
         raise HTTPException(status_code=500, detail="Internal server error")
 
 @router.post("/login", response_model=Token)
-def login(user: UserLogin, db: Session = Depends(get_db)):
+async def login(user: UserLogin, db: AsyncSession = Depends(get_async_db)):
     try:
-        db_user = get_user_by_email(db, user.email)
-        if not db_user or not verify_password(user.password, db_user.hashed_password):
-            logger.error(f"Login failed for email: {user.email}")
+        db_user = await get_user_by_email(db, user.email)
+        valid, new_hash = (False, None)
+        if db_user:
+            valid, new_hash = await verify_and_update(user.password, db_user.hashed_password)
+        if not valid:
+            logger.info("Login failed", extra={"fields": {"email": user.email}})
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Incorrect email or password",
                 headers={"WWW-Authenticate": "Bearer"},
             )
-        access_token = create_access_token(data={"sub": user.email}, remember_me=user.remember_me)
-        try:
-            profile = get_user_profile(db, db_user.id)
-            needs_onboarding = profile is None
-            logger.info(f"Login successful for user: {user.email}, needs_onboarding: {needs_onboarding}")
-        except Exception as e:
-            logger.error(f"Error fetching user profile for user_id {db_user.id}: {str(e)}")
-            needs_onboarding = True  # Default to True if profile fetch fails
+        if new_hash:
+            # Stored hash predates the current CryptContext policy; upgrade it transparently
+            await update_password_hash(db, db_user, new_hash)
+            logger.info("Rehashed outdated password hash", extra={"fields": {"user_id": db_user.id}})
+        access_token = create_access_token(data={"sub": user.email, "uid": db_user.id}, remember_me=user.remember_me)
+        # The profile is joined-loaded with the user, so this costs no extra query
+        needs_onboarding = db_user.profile is None
+        logger.info("Login successful", extra={"fields": {"user_id": db_user.id, "needs_onboarding": needs_onboarding}})
         return {
             "access_token": access_token,
             "token_type": "bearer",
             "needs_onboarding": needs_onboarding
         }
-    except Exception as e:
-        logger.error(f"Unexpected error during login for email {user.email}: {str(e)}")
-        raise HTTPException(status_code=500, detail="Internal server error")
\ No newline at end of file
+    except HTTPException:
+        raise
+    except PasswordHasherBusy:
+        logger.warning("Login shed, password hasher queue full", extra={"fields": {"email": user.email}})
+        raise hasher_busy_exception()
+    except Exception:
+        logger.exception("Unexpected error during login", extra={"fields": {"email": user.email}})
+        raise HTTPException(status_code=500, detail="Internal server error")
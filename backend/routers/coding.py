@@ -1,44 +1,63 @@
 # backend/routers/coding.py
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from datetime import datetime, timedelta
-from typing import List
-from backend.schemas import CodingSessionCreate, CodingSessionOut
-from backend.crud import create_coding_session, get_user_by_email
-from backend.database import get_db
-from backend.security import get_current_user
+import logging
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime
+from typing import List, Optional
+from backend.schemas import CodingSessionCreate, CodingSessionOut, HistoryPage
+from backend.crud import recent_logs_query, window_start
+from backend.crud_async import get_log_history, create_coding_session
+from backend.database import get_async_db
+from backend.pagination import decode_cursor, parse_fields
+from backend.security import get_current_user_id, get_read_db
+from backend.http_cache import conditional
+from backend import fast_json, result_cache
 from backend.models import CodingSession
 
 router = APIRouter(prefix="/api/coding", tags=["coding"])
+logger = logging.getLogger(__name__)
 
 @router.post("/log", response_model=CodingSessionOut)
 async def log_coding_session(
     coding_session: CodingSessionCreate,
-    current_user: str = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    print("Received coding session payload:", coding_session.dict())
-    user = get_user_by_email(db, current_user)
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
     if coding_session.duration_minutes < 1:
         raise HTTPException(status_code=422, detail="Duration must be at least 1 minute")
-    db_session = create_coding_session(db, user.id, coding_session)
-    print("Created coding session:", db_session.__dict__)
+    db_session = await create_coding_session(db, user_id, coding_session)
+    logger.debug("Created coding session", extra={"fields": {"user_id": user_id, "coding_session_id": db_session.id, "duration_minutes": db_session.duration_minutes}})
     return db_session
 
-@router.get("/weekly-trends", response_model=List[CodingSessionOut])
+@router.get("/weekly-trends", response_model=List[CodingSessionOut], dependencies=[conditional(daily=True)])
 async def get_weekly_coding_trends(
-    current_user: str = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    response: Response,
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_read_db)
 ):
-    user = get_user_by_email(db, current_user)
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    cutoff = datetime.utcnow() - timedelta(days=7)
-    trends = db.query(CodingSession).filter(
-        CodingSession.user_id == user.id,
-        CodingSession.created_at >= cutoff
-    ).order_by(CodingSession.created_at.asc()).all()
-    print("Coding trends:", [t.__dict__ for t in trends])
-    return trends
\ No newline at end of file
+    today = datetime.utcnow().date()
+    async def load():
+        cutoff = window_start(today)
+        return fast_json.rows(await db.execute(recent_logs_query(CodingSession, user_id, cutoff, fast_json.columns(CodingSessionOut))))
+    trends = await result_cache.cached(user_id, "coding.weekly-trends", load, variant=today.isoformat())
+    logger.debug("Coding trends", extra={"fields": {"user_id": user_id, "count": len(trends)}})
+    return fast_json.respond(trends, response)
+
+@router.get("/history", response_model=HistoryPage)
+async def get_coding_history(
+    response: Response,
+    cursor: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    limit: int = Query(50, ge=1, le=500),
+    fields: Optional[str] = Query(None, description="Comma-separated subset of CodingSessionOut fields"),
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_read_db)
+):
+    try:
+        columns = parse_fields(fields, CodingSessionOut.model_fields)
+        after = decode_cursor(cursor) if cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    page = await get_log_history(db, CodingSession, user_id, columns, limit, since, until, after)
+    return fast_json.respond(dict(page), response)
@@ -1,19 +1,25 @@
-from fastapi import APIRouter, HTTPException, Request, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from dotenv import load_dotenv
-import requests
+from sqlalchemy.ext.asyncio import AsyncSession
+import httpx
 import os
 import hmac
 import hashlib
 import json
+import logging
 from pathlib import Path
+from backend import paystack, payment_events
+from backend.crud_async import record_payment_event
+from backend.database import get_async_db
+from backend.config import settings
 
 # Load .env file from the backend directory
 load_dotenv(dotenv_path=Path(__file__).parent.parent / ".env")
 
 router = APIRouter(prefix="/api/payments", tags=["payments"])
+logger = logging.getLogger(__name__)
 
 PAYSTACK_SECRET_KEY = os.getenv("PAYSTACK_SECRET_KEY")
-PAYSTACK_API_URL = "https://api.paystack.co"
 
 if not PAYSTACK_SECRET_KEY:
     raise ValueError("PAYSTACK_SECRET_KEY environment variable is not set")
@@ -52,13 +58,15 @@ async def initialize_payment(payment_data: dict):
     }
 
     try:
-        response = requests.post(f"{PAYSTACK_API_URL}/transaction/initialize", headers=headers, json=payload)
-        response.raise_for_status()
+        # Not retried: initializing twice would create two transactions
+        response = await paystack.request("POST", "/transaction/initialize", headers=headers, json=payload)
         data = response.json()
         if not data.get("status"):
             raise HTTPException(status_code=500, detail=data.get("message", "Failed to initialize transaction"))
         return {"access_code": data["data"]["access_code"]}
-    except requests.RequestException as e:
+    except httpx.TimeoutException:
+        raise HTTPException(status_code=504, detail="Payment provider timed out")
+    except httpx.HTTPError as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/verify/{reference}")
@@ -68,17 +76,20 @@ async def verify_payment(reference: str):
     }
 
     try:
-        response = requests.get(f"{PAYSTACK_API_URL}/transaction/verify/{reference}", headers=headers)
-        response.raise_for_status()
+        response = await paystack.request(
+            "GET", f"/transaction/verify/{reference}", headers=headers, retries=settings.PAYSTACK_VERIFY_RETRIES
+        )
         data = response.json()
         if not data.get("status"):
             raise HTTPException(status_code=500, detail=data.get("message", "Verification failed"))
         return data["data"]
-    except requests.RequestException as e:
+    except httpx.TimeoutException:
+        raise HTTPException(status_code=504, detail="Payment provider timed out")
+    except httpx.HTTPError as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/webhook")
-async def payment_webhook(request: Request):
+async def payment_webhook(request: Request, db: AsyncSession = Depends(get_async_db)):
     payload = await request.body()
     signature = request.headers.get("x-paystack-signature")
 
@@ -92,14 +103,22 @@ async def payment_webhook(request: Request):
         hashlib.sha512
     ).hexdigest()
 
-    if signature != computed_signature:
+    if not hmac.compare_digest(signature.encode(), computed_signature.encode()):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid signature")
 
-    event = json.loads(payload)
-
-    # Handle the event (e.g., charge.success)
-    if event["event"] == "charge.success":
-        # Process successful payment, e.g., update database
-        print("Payment successful:", event["data"])
-
-    return {"status": "success"}
\ No newline at end of file
+    try:
+        event = json.loads(payload)
+        event_type = event["event"]
+        reference = str(event["data"]["reference"])
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Malformed event")
+
+    # Persist and acknowledge; payment_events handles it in the background.
+    # A redelivered event is a no-op here, so Paystack retries are safe.
+    inserted = await record_payment_event(db, reference, event_type, payload.decode())
+    if inserted:
+        payment_events.notify()
+    else:
+        logger.info("Duplicate payment event ignored", extra={"fields": {"reference": reference, "event": event_type}})
+
+    return {"status": "success"}
@@ -1,65 +1,105 @@
 # backend/routers/dashboard.py
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from backend import schemas, crud
-from backend.database import get_db
-from backend.security import get_current_user
+import asyncio
+import functools
+from datetime import datetime
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List
+from backend import schemas, crud, crud_async
+from backend.models import MoodLog, HydrationLog, CodingSession
+from backend.database import get_async_db
+from backend.security import get_current_user_id, get_read_db
+from backend.http_cache import conditional
+from backend import hydration_buffer, result_cache
 
 router = APIRouter(prefix="/api/dashboard", tags=["dashboard"])
 
-@router.get("/stats", response_model=schemas.DashboardResponse)
+async def flush_buffered_hydration(user_id: int = Depends(get_current_user_id)):
+    # Writes the user's hydration still in the write-behind buffer before the ETag
+    # and the reads, so the dashboard matches /api/hydration/latest
+    await hydration_buffer.flush([user_id])
+
+async def cached_stats(user_id: int, load) -> schemas.DashboardResponse:
+    # Shared by /stats and /overview; the window is whole days, so the day is part of the key
+    data = await result_cache.cached(user_id, "dashboard.stats", load, variant=datetime.utcnow().date().isoformat())
+    return schemas.DashboardResponse.model_validate(data)
+
+@router.get("/stats", response_model=schemas.DashboardResponse, dependencies=[Depends(flush_buffered_hydration), conditional(daily=True)])
 async def get_dashboard_stats(
-    current_user: str = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_read_db)
+):
+    return await cached_stats(user_id, lambda: crud_async.get_dashboard_stats(db, user_id))
+
+@router.get("/overview", response_model=schemas.DashboardOverview, dependencies=[Depends(flush_buffered_hydration), conditional(daily=True)])
+async def get_dashboard_overview(
+    trend_limit: int = Query(4, ge=1, le=50),
+    user_id: int = Depends(get_current_user_id),
+):
+    # Everything Dashboard.jsx renders in one request. The reads are independent
+    # index lookups, so they run concurrently, each on its own pooled connection
+    # (a read replica when one is configured).
+    cutoff = crud.window_start(datetime.utcnow().date())
+    run = functools.partial(crud_async.run_in_read_session, user_id)
+    stats, latest_mood, latest_hydration, mood, hydration, coding, today = await asyncio.gather(
+        cached_stats(user_id, lambda: run(crud.get_dashboard_stats, user_id)),
+        run(crud.get_latest_logs, MoodLog, user_id),
+        run(crud.get_latest_logs, HydrationLog, user_id),
+        run(crud.get_latest_logs, MoodLog, user_id, trend_limit, cutoff),
+        run(crud.get_latest_logs, HydrationLog, user_id, trend_limit, cutoff),
+        run(crud.get_latest_logs, CodingSession, user_id, trend_limit, cutoff),
+        run(crud.get_daily_rollups, user_id, 1),
+    )
+    today_rollup = today[0] if today else None
+    return schemas.DashboardOverview(
+        stats=stats.stats,
+        insights=stats.insights,
+        latest_mood=latest_mood[0] if latest_mood else None,
+        latest_hydration=latest_hydration[0] if latest_hydration else None,
+        today_coding=schemas.TodayCodingOut(
+            sessions=today_rollup.coding_sessions if today_rollup else 0,
+            minutes=today_rollup.coding_minutes if today_rollup else 0,
+        ),
+        trends=schemas.DashboardTrendsOut(mood=mood, hydration=hydration, coding=coding),
+    )
+
+@router.get("/daily-trends", response_model=List[schemas.DailyRollupOut], dependencies=[Depends(flush_buffered_hydration), conditional(daily=True)])
+async def get_daily_trends(
+    days: int = Query(7, ge=1, le=366),
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_read_db)
 ):
-    user = db.query(crud.User).filter(crud.User.email == current_user).first()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    
-    stats_data = crud.get_dashboard_stats(db, user.id)
-    return stats_data
+    return await crud_async.get_daily_rollups(db, user_id, days)
 
 # Other endpoints (unchanged)
 @router.post("/mood-logs", response_model=schemas.MoodLogOut)
 async def create_mood_log(
     mood_log: schemas.MoodLogCreate,
-    current_user: str = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    user = db.query(crud.User).filter(crud.User.email == current_user).first()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    return crud.create_mood_log(db, user.id, mood_log)
+    return await crud_async.create_mood_log(db, user_id, mood_log)
 
 @router.post("/hydration-logs", response_model=schemas.HydrationLogOut)
 async def create_hydration_log(
     hydration_log: schemas.HydrationLogCreate,
-    current_user: str = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    user = db.query(crud.User).filter(crud.User.email == current_user).first()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    return crud.create_hydration_log(db, user.id, hydration_log)
+    return await crud_async.create_hydration_log(db, user_id, hydration_log)
 
 @router.post("/coding-sessions", response_model=schemas.CodingSessionOut)
 async def create_coding_session(
     session: schemas.CodingSessionCreate,
-    current_user: str = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    user = db.query(crud.User).filter(crud.User.email == current_user).first()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    return crud.create_coding_session(db, user.id, session)
+    return await crud_async.create_coding_session(db, user_id, session)
 
 @router.post("/focus-sessions", response_model=schemas.FocusSessionOut)
 async def create_focus_session(
     session: schemas.FocusSessionCreate,
-    current_user: str = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    user = db.query(crud.User).filter(crud.User.email == current_user).first()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    return crud.create_focus_session(db, user.id, session)
\ No newline at end of file
+    return await crud_async.create_focus_session(db, user_id, session)
\ No newline at end of file
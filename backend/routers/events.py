@@ -0,0 +1,37 @@
+# backend/routers/events.py
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from backend import events
+from backend.security import get_current_user_id
+
+router = APIRouter(prefix="/api/events", tags=["events"])
+
+class EventStreamResponse(StreamingResponse):
+    # stream()'s finally only runs once the body has started; a client that leaves
+    # before the first chunk, or a failed send, would otherwise keep its slot forever
+    def __init__(self, subscription: events.Subscription, content, **kwargs):
+        super().__init__(content, **kwargs)
+        self.subscription = subscription
+
+    async def __call__(self, scope, receive, send):
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            events.unsubscribe(self.subscription)
+
+@router.get("")
+async def event_stream(
+    request: Request,
+    user_id: int = Depends(get_current_user_id)
+):
+    # Server-Sent Events: "entry" (a new log), "day" (today's rollup), "stats"
+    # (dashboard stats and insights) and "resync" (refetch everything)
+    subscription = events.subscribe(user_id)
+    if subscription is None:
+        raise HTTPException(status_code=429, detail="Too many open event streams")
+    return EventStreamResponse(
+        subscription,
+        events.stream(subscription, request.is_disconnected),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
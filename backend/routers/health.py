@@ -0,0 +1,29 @@
+# backend/routers/health.py
+from fastapi import APIRouter
+from backend import events, replicas, result_cache
+from backend.database import pool_metrics
+
+router = APIRouter(prefix="/api/health", tags=["health"])
+
+@router.get("")
+async def health():
+    return {"status": "ok"}
+
+@router.get("/db-pool")
+async def db_pool():
+    # Checked-out/overflow counts and checkout wait times of both engines' pools
+    return pool_metrics()
+
+@router.get("/replicas")
+async def replica_status():
+    return replicas.status()
+
+@router.get("/result-cache")
+async def result_cache_stats():
+    # Hit/miss counts and hit rate per cached endpoint
+    return result_cache.stats()
+
+@router.get("/events")
+async def event_stats():
+    # Open live-update streams and users with a totals refresh in flight
+    return events.stats()
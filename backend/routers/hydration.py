@@ -1,58 +1,79 @@
 # backend/routers/hydration.py
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from datetime import datetime, timedelta
-from typing import List
-from backend.schemas import HydrationLogCreate, HydrationLogOut
-from backend.crud import create_hydration_log, get_user_by_email
-from backend.database import get_db
-from backend.security import get_current_user
+import logging
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime
+from typing import List, Optional, Union
+from backend import hydration_buffer
+from backend.schemas import HydrationLogCreate, HydrationLogOut, HydrationBufferedOut, HistoryPage
+from backend.crud import recent_logs_query, window_start
+from backend.crud_async import get_log_history, create_hydration_log
+from backend.database import get_async_db
+from backend.pagination import decode_cursor, parse_fields
+from backend.security import get_current_user_id, get_read_db
+from backend.http_cache import conditional
+from backend import fast_json, result_cache
 from backend.models import HydrationLog
 
 router = APIRouter(prefix="/api/hydration", tags=["hydration"])
+logger = logging.getLogger(__name__)
 
-@router.post("/log", response_model=HydrationLogOut)
+@router.post("/log", response_model=Union[HydrationLogOut, HydrationBufferedOut])
 async def log_hydration(
     hydration_log: HydrationLogCreate,
-    current_user: str = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    response: Response,
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    user = get_user_by_email(db, current_user)
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    db_hydration = create_hydration_log(db, user.id, hydration_log)
-    print("Created hydration log:", db_hydration.__dict__)  # Debug
+    if hydration_buffer.enabled():
+        # Write-behind: accepted now, written with the next buffer flush
+        pending = await hydration_buffer.add(user_id, hydration_log)
+        response.status_code = 202
+        return HydrationBufferedOut(**pending)
+    db_hydration = await create_hydration_log(db, user_id, hydration_log)
+    logger.debug("Created hydration log", extra={"fields": {"user_id": user_id, "hydration_log_id": db_hydration.id}})
     return db_hydration
 
-@router.get("/weekly-trends", response_model=List[HydrationLogOut])
+@router.get("/weekly-trends", response_model=List[HydrationLogOut], dependencies=[conditional(daily=True)])
 async def get_weekly_hydration_trends(
-    current_user: str = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    response: Response,
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_read_db)
 ):
-    
-    user = get_user_by_email(db, current_user)
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    cutoff = datetime.utcnow() - timedelta(days=7)
-    trends = db.query(HydrationLog).filter(
-        HydrationLog.user_id == user.id,
-        HydrationLog.created_at >= cutoff
-    ).order_by(HydrationLog.created_at.asc()).all()
-    print("Hydration trends:", [t.__dict__ for t in trends])  # Debug
-    return trends
+    today = datetime.utcnow().date()
+    async def load():
+        cutoff = window_start(today)
+        return fast_json.rows(await db.execute(recent_logs_query(HydrationLog, user_id, cutoff, fast_json.columns(HydrationLogOut))))
+    trends = await result_cache.cached(user_id, "hydration.weekly-trends", load, variant=today.isoformat())
+    logger.debug("Hydration trends", extra={"fields": {"user_id": user_id, "count": len(trends)}})
+    return fast_json.respond(trends, response)
 
-@router.get("/latest", response_model=HydrationLogOut)
+@router.get("/latest", response_model=HydrationLogOut, dependencies=[conditional()])
 async def get_latest_hydration(
-    current_user: str = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    user = get_user_by_email(db, current_user)
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    latest_log = db.query(HydrationLog).filter(
-        HydrationLog.user_id == user.id
-    ).order_by(HydrationLog.created_at.desc()).first()
+    latest_log = await hydration_buffer.latest(db, user_id)
     if not latest_log:
         raise HTTPException(status_code=404, detail="No hydration logs found")
-    print("Latest hydration:", latest_log.__dict__)
+    logger.debug("Latest hydration", extra={"fields": {"user_id": user_id, "hydration_log_id": latest_log.id}})
     return latest_log
+
+@router.get("/history", response_model=HistoryPage)
+async def get_hydration_history(
+    response: Response,
+    cursor: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    limit: int = Query(50, ge=1, le=500),
+    fields: Optional[str] = Query(None, description="Comma-separated subset of HydrationLogOut fields"),
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_read_db)
+):
+    try:
+        columns = parse_fields(fields, HydrationLogOut.model_fields)
+        after = decode_cursor(cursor) if cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    page = await get_log_history(db, HydrationLog, user_id, columns, limit, since, until, after)
+    return fast_json.respond(dict(page), response)
@@ -0,0 +1,38 @@
+# backend/routers/logs.py
+import logging
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime, timedelta, timezone
+from backend.schemas import BatchLogRequest, BatchLogResult
+from backend.crud_async import create_logs_batch
+from backend.database import get_async_db
+from backend.security import get_current_user_id
+
+router = APIRouter(prefix="/api/logs", tags=["logs"])
+logger = logging.getLogger(__name__)
+
+# Client clocks drift; anything further ahead than this is rejected as a bad timestamp
+MAX_CLOCK_SKEW = timedelta(minutes=5)
+
+@router.post("/batch", response_model=BatchLogResult)
+async def log_batch(
+    batch: BatchLogRequest,
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_async_db)
+):
+    # Validate the whole batch up front so it is stored all-or-nothing
+    latest = datetime.now(timezone.utc) + MAX_CLOCK_SKEW
+    errors = []
+    for index, entry in enumerate(batch.entries):
+        if entry.type == "coding" and entry.duration_minutes < 1:
+            errors.append({"index": index, "msg": "Duration must be at least 1 minute"})
+        if entry.created_at is not None:
+            created_at = entry.created_at if entry.created_at.tzinfo else entry.created_at.replace(tzinfo=timezone.utc)
+            if created_at > latest:
+                errors.append({"index": index, "msg": "created_at is in the future"})
+    if errors:
+        raise HTTPException(status_code=422, detail=errors)
+
+    result = await create_logs_batch(db, user_id, batch.entries)
+    logger.info("Stored log batch", extra={"fields": {"user_id": user_id, "entries": len(batch.entries), "inserted": result.inserted, "duplicates": len(result.duplicates)}})
+    return result
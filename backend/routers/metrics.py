@@ -0,0 +1,10 @@
+# backend/routers/metrics.py
+from fastapi import APIRouter, Response
+from backend import metrics
+
+router = APIRouter(tags=["metrics"])
+
+@router.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    # Prometheus scrape target; see backend/metrics.py for what is recorded
+    return Response(metrics.render(), media_type=metrics.CONTENT_TYPE)
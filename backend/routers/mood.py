@@ -1,57 +1,72 @@
 # backend/routers/mood.py
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from datetime import datetime, timedelta
-from typing import List
-from backend.schemas import MoodLogCreate, MoodLogOut
-from backend.crud import create_mood_log, get_user_by_email
-from backend.database import get_db
-from backend.security import get_current_user
+import logging
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime
+from typing import List, Optional
+from backend.schemas import MoodLogCreate, MoodLogOut, HistoryPage
+from backend.crud import recent_logs_query, window_start, latest_log_query
+from backend.crud_async import get_log_history, create_mood_log
+from backend.database import get_async_db
+from backend.pagination import decode_cursor, parse_fields
+from backend.security import get_current_user_id, get_read_db
+from backend.http_cache import conditional
+from backend import fast_json, result_cache
 from backend.models import MoodLog
 
 router = APIRouter(prefix="/api/mood", tags=["mood"])
+logger = logging.getLogger(__name__)
 
 @router.post("/log", response_model=MoodLogOut)
 async def log_mood(
     mood_log: MoodLogCreate,
-    current_user: str = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    user = get_user_by_email(db, current_user)
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    db_mood = create_mood_log(db, user.id, mood_log)
-    print("Created mood log:", db_mood.__dict__)  # Debug
+    db_mood = await create_mood_log(db, user_id, mood_log)
+    logger.debug("Created mood log", extra={"fields": {"user_id": user_id, "mood_log_id": db_mood.id}})
     return db_mood
 
-@router.get("/weekly-trends", response_model=List[MoodLogOut])
+@router.get("/weekly-trends", response_model=List[MoodLogOut], dependencies=[conditional(daily=True)])
 async def get_weekly_mood_trends(
-    current_user: str = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    response: Response,
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_read_db)
 ):
-    user = get_user_by_email(db, current_user)
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    cutoff = datetime.utcnow() - timedelta(days=7)
-    trends = db.query(MoodLog).filter(
-        MoodLog.user_id == user.id,
-        MoodLog.created_at >= cutoff
-    ).order_by(MoodLog.created_at.asc()).all()
-    print("Trends:", [t.__dict__ for t in trends])  # Debug
-    return trends
+    today = datetime.utcnow().date()
+    async def load():
+        cutoff = window_start(today)
+        return fast_json.rows(await db.execute(recent_logs_query(MoodLog, user_id, cutoff, fast_json.columns(MoodLogOut))))
+    trends = await result_cache.cached(user_id, "mood.weekly-trends", load, variant=today.isoformat())
+    logger.debug("Mood trends", extra={"fields": {"user_id": user_id, "count": len(trends)}})
+    return fast_json.respond(trends, response)
 
-@router.get("/latest", response_model=MoodLogOut)
+@router.get("/latest", response_model=MoodLogOut, dependencies=[conditional()])
 async def get_latest_mood(
-    current_user: str = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_read_db)
 ):
-    user = get_user_by_email(db, current_user)
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    latest_mood = db.query(MoodLog).filter(
-        MoodLog.user_id == user.id
-    ).order_by(MoodLog.created_at.desc()).first()
+    latest_mood = await db.scalar(latest_log_query(MoodLog, user_id))
     if not latest_mood:
         raise HTTPException(status_code=404, detail="No mood logs found")
-    print("Latest mood:", latest_mood.__dict__)
-    return latest_mood
\ No newline at end of file
+    logger.debug("Latest mood", extra={"fields": {"user_id": user_id, "mood_log_id": latest_mood.id}})
+    return latest_mood
+
+@router.get("/history", response_model=HistoryPage)
+async def get_mood_history(
+    response: Response,
+    cursor: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    limit: int = Query(50, ge=1, le=500),
+    fields: Optional[str] = Query(None, description="Comma-separated subset of MoodLogOut fields"),
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_read_db)
+):
+    try:
+        columns = parse_fields(fields, MoodLogOut.model_fields)
+        after = decode_cursor(cursor) if cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    page = await get_log_history(db, MoodLog, user_id, columns, limit, since, until, after)
+    return fast_json.respond(dict(page), response)
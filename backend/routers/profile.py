@@ -1,45 +1,38 @@
+import logging
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from backend.schemas import UserProfileCreate, UserProfileOut
-from backend.crud import create_user_profile, get_user_profile, get_user_by_email
-from backend.database import get_db
-from backend.security import get_current_user
+from backend.crud_async import create_user_profile, get_user_profile
+from backend.database import get_async_db
+from backend.security import get_current_user_id, get_read_db
+from backend.http_cache import conditional
 from typing import Optional
 
 router = APIRouter(prefix="/api/profile", tags=["profile"])
+logger = logging.getLogger(__name__)
 
 @router.post("/onboarding", response_model=UserProfileOut)
 async def submit_onboarding(
     profile: UserProfileCreate,
-    current_user: str = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    print("Received onboarding payload:", profile.dict())
-    user = get_user_by_email(db, current_user)
-    if not user:
-        print("User not found for email:", current_user)
-        raise HTTPException(status_code=404, detail="User not found")
-    existing_profile = get_user_profile(db, user.id)
+    existing_profile = await get_user_profile(db, user_id)
     if existing_profile:
-        print("Profile already exists for user_id:", user.id)
+        logger.info("Onboarding rejected, profile already exists", extra={"fields": {"user_id": user_id}})
         raise HTTPException(status_code=400, detail="Profile already exists")
-    db_profile = create_user_profile(db, user.id, profile)
-    print("Created user profile:", db_profile.__dict__)
+    db_profile = await create_user_profile(db, user_id, profile)
+    logger.info("Created user profile", extra={"fields": {"user_id": user_id, "profile_id": db_profile.id}})
     return db_profile
 
-@router.get("/me", response_model=Optional[UserProfileOut])
+@router.get("/me", response_model=Optional[UserProfileOut], dependencies=[conditional()])
 async def get_profile(
-    current_user: str = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_read_db)
 ):
-    print("Fetching profile for user:", current_user)
-    user = get_user_by_email(db, current_user)
-    if not user:
-        print("User not found for email:", current_user)
-        raise HTTPException(status_code=404, detail="User not found")
-    profile = get_user_profile(db, user.id)
+    profile = await get_user_profile(db, user_id)
     if not profile:
-        print("No profile found for user_id:", user.id)
+        logger.debug("No profile found", extra={"fields": {"user_id": user_id}})
         return None
-    print("Profile retrieved for user_id:", user.id)
+    logger.debug("Profile retrieved", extra={"fields": {"user_id": user_id}})
     return profile
\ No newline at end of file
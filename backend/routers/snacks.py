@@ -0,0 +1,40 @@
+# backend/routers/snacks.py
+import logging
+from fastapi import APIRouter, Depends, HTTPException, status
+from backend import snack_feedback, snacks
+from backend.models import User
+from backend.schemas import SnackSuggestionRequest, SnackSuggestionOut, SnackFeedbackCreate
+from backend.security import get_current_db_user
+
+router = APIRouter(tags=["snacks"])
+logger = logging.getLogger(__name__)
+
+def _diet_preference(user: User):
+    # The profile comes with the cached user, so this reads no tables on a cache hit
+    return user.profile.diet_preference if user.profile else None
+
+@router.post("/suggest-snack", response_model=SnackSuggestionOut)
+async def suggest_snack(
+    request: SnackSuggestionRequest,
+    user: User = Depends(get_current_db_user)
+):
+    mood = snacks.mood_bucket(request.mood, request.tiredness_level)
+    size = snacks.size_bucket(request.session_duration)
+    diet, candidates = snacks.candidates(_diet_preference(user), mood, size, request.type, request.protein)
+    best, *rest = snack_feedback.rank(user.id, diet, candidates)
+    return SnackSuggestionOut(
+        suggestion=best.name, type=best.type, protein=best.protein, diet=diet, mood=mood, size=size,
+        alternatives=[snack.name for snack in rest],
+    )
+
+@router.post("/log-feedback", status_code=status.HTTP_202_ACCEPTED)
+async def log_feedback(
+    feedback: SnackFeedbackCreate,
+    user: User = Depends(get_current_db_user)
+):
+    diet, _ = snacks.resolve_diet(_diet_preference(user))
+    if not snacks.is_known(diet, feedback.suggestion):
+        logger.info("Feedback for unknown suggestion rejected", extra={"fields": {"user_id": user.id, "diet": diet}})
+        raise HTTPException(status_code=400, detail="Unknown suggestion")
+    await snack_feedback.record(user.id, diet, feedback.suggestion, feedback.liked)
+    return {"status": "accepted"}
@@ -1,6 +1,6 @@
 from pydantic import BaseModel, Field
-from typing import Optional, List
-from datetime import datetime
+from typing import Annotated, Any, Dict, Literal, Optional, List, Union
+from datetime import date, datetime
 
 class UserCreate(BaseModel):
     email: str = Field(..., min_length=1)
@@ -27,6 +27,11 @@ class HydrationLogOut(HydrationLogCreate):
     class Config:
         from_attributes = True
 
+class HydrationBufferedOut(HydrationLogCreate):
+    # Write-behind mode: today's increments not yet flushed to the database
+    day: date
+    buffered: bool = True
+
 class MoodLogCreate(BaseModel):
     mood_score: float = Field(..., ge=0, le=5)
     notes: Optional[str] = None
@@ -77,6 +82,21 @@ class UserProfileOut(UserProfileCreate):
     class Config:
         from_attributes = True
 
+class DailyRollupOut(BaseModel):
+    day: date
+    mood_sum: float
+    mood_count: int
+    tiredness_sum: int
+    tiredness_count: int
+    water_glasses: int
+    coffee_cups: int
+    daily_goal: int
+    coding_minutes: int
+    coding_sessions: int
+    focus_minutes: int
+    class Config:
+        from_attributes = True
+
 class DashboardStat(BaseModel):
     title: str
     value: str
@@ -86,4 +106,75 @@ class DashboardStat(BaseModel):
 
 class DashboardResponse(BaseModel):
     stats: List[DashboardStat]
-    insights: List[str]
\ No newline at end of file
+    insights: List[str]
+
+class TodayCodingOut(BaseModel):
+    sessions: int
+    minutes: int
+
+class DashboardTrendsOut(BaseModel):
+    mood: List[MoodLogOut]
+    hydration: List[HydrationLogOut]
+    coding: List[CodingSessionOut]
+
+class DashboardOverview(DashboardResponse):
+    latest_mood: Optional[MoodLogOut]
+    latest_hydration: Optional[HydrationLogOut]
+    today_coding: TodayCodingOut
+    trends: DashboardTrendsOut
+
+class HistoryPage(BaseModel):
+    items: List[Dict[str, Any]]  # Only the requested fields (plus id and created_at)
+    next_cursor: Optional[str] = None
+
+# Batch ingestion: each entry carries its own type tag, an optional client-side
+# timestamp (offline sync) and an optional idempotency key
+class BatchEntryBase(BaseModel):
+    created_at: Optional[datetime] = None
+    client_key: Optional[str] = Field(None, min_length=1, max_length=64)
+
+class MoodBatchEntry(BatchEntryBase, MoodLogCreate):
+    type: Literal["mood"]
+
+class HydrationBatchEntry(BatchEntryBase, HydrationLogCreate):
+    type: Literal["hydration"]
+
+class CodingBatchEntry(BatchEntryBase, CodingSessionCreate):
+    type: Literal["coding"]
+
+class FocusBatchEntry(BatchEntryBase, FocusSessionCreate):
+    type: Literal["focus"]
+
+BatchEntry = Annotated[
+    Union[MoodBatchEntry, HydrationBatchEntry, CodingBatchEntry, FocusBatchEntry],
+    Field(discriminator="type"),
+]
+
+class BatchLogRequest(BaseModel):
+    entries: List[BatchEntry] = Field(..., min_length=1, max_length=1000)
+
+class BatchLogResult(BaseModel):
+    inserted: Dict[str, int]  # Rows written per entry type
+    duplicates: List[str]  # client_keys that were already stored and skipped
+
+class SnackSuggestionRequest(BaseModel):
+    user_id: Optional[int] = None  # Sent by older clients; the token identifies the user
+    mood: Optional[Union[str, float]] = None  # "tired"/"stressed"/"focused" or a 1-5 mood score
+    tiredness_level: Optional[int] = Field(None, ge=1, le=10)
+    session_duration: Optional[int] = Field(None, ge=0)  # Minutes coded so far
+    type: Optional[Literal["snack", "meal", "drink"]] = None
+    protein: Optional[bool] = None
+
+class SnackSuggestionOut(BaseModel):
+    suggestion: str
+    type: str
+    protein: bool
+    diet: str
+    mood: str
+    size: str  # "quick" or "meal"
+    alternatives: List[str] = []  # Other candidates, best-ranked first
+
+class SnackFeedbackCreate(BaseModel):
+    user_id: Optional[int] = None  # Sent by older clients; the token identifies the user
+    suggestion: str = Field(..., max_length=200)
+    liked: bool
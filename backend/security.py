@@ -1,10 +1,17 @@
 # backend/security.py
+import hashlib
+import time
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy.ext.asyncio import AsyncSession
+from backend.cache import TTLCache
 from backend.config import settings
+from backend.database import get_async_db
+from backend.models import User
+from backend import crud, crud_async, replicas
 
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60
@@ -12,7 +19,13 @@ REMEMBER_ME_EXPIRE_DAYS = 30
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
+# Verified claims keyed by sha256(token), each entry living until the token's exp.
+# A dashboard load sends the same token 5-7 times; only the first pays for the
+# signature check. Claims dicts are shared between requests, treat them as read-only.
+token_cache = TTLCache(settings.TOKEN_CACHE_SIZE, ttl=ACCESS_TOKEN_EXPIRE_MINUTES * 60)
+
 def create_access_token(data: dict, remember_me: bool = False):
+    # data carries "sub" (email) and "uid" (user id) so handlers can skip the user lookup
     to_encode = data.copy()
     expires_delta = timedelta(days=REMEMBER_ME_EXPIRE_DAYS) if remember_me else timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     expire = datetime.utcnow() + expires_delta
@@ -20,17 +33,56 @@ def create_access_token(data: dict, remember_me: bool = False):
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
-async def get_current_user(token: str = Depends(oauth2_scheme)):
-    credentials_exception = HTTPException(
+def credentials_exception():
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+def decode_access_token(token: str) -> dict:
+    key = hashlib.sha256(token.encode()).digest()
+    payload = token_cache.get(key)
+    if payload is not None:
+        return payload
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[ALGORITHM])
-        email: str = payload.get("sub")
-        if email is None:
-            raise credentials_exception
     except JWTError:
-        raise credentials_exception
-    return email
\ No newline at end of file
+        raise credentials_exception()
+    # jwt.decode already rejected expired tokens, so a missing exp is the only way this is unbounded
+    if "exp" in payload:
+        token_cache.set(key, payload, ttl=payload["exp"] - time.time())
+    return payload
+
+async def get_current_user(token: str = Depends(oauth2_scheme)):
+    email: str = decode_access_token(token).get("sub")
+    if email is None:
+        raise credentials_exception()
+    return email
+
+async def get_current_user_id(token: str = Depends(oauth2_scheme)) -> int:
+    # Tokens issued before the "uid" claim existed are rejected; the client re-logs in
+    user_id = decode_access_token(token).get("uid")
+    if not isinstance(user_id, int):
+        raise credentials_exception()
+    return user_id
+
+async def get_current_db_user(
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_async_db)
+) -> User:
+    # Returns a detached, read-only snapshot; use db.merge(user, load=False) before modifying it
+    user = crud.user_cache.get(user_id)
+    if user is None:
+        user = await crud_async.get_user(db, user_id)
+        if user is None:
+            raise credentials_exception()
+        db.expunge(user)
+        crud.user_cache.set(user_id, user)
+    return user
+
+async def get_read_db(user_id: int = Depends(get_current_user_id)):
+    # Session for read-only handlers: a read replica when configured and healthy,
+    # the primary otherwise or right after this user wrote (see backend/replicas.py)
+    async with replicas.read_session(user_id) as db:
+        yield db
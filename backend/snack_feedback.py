@@ -0,0 +1,153 @@
+# backend/snack_feedback.py
+# Feedback on /suggest-snack results (POST /log-feedback) and the ranker it feeds.
+# Likes/dislikes are summed in memory per (user, diet, suggestion) and written every
+# SNACK_FEEDBACK_FLUSH_SECONDS, and on shutdown, as one UPSERT into snack_feedback
+# (crud.flush_snack_feedback) instead of one committed row per click.
+# Ranking is Thompson sampling: each suggestion is an arm whose like rate is drawn
+# from Beta(1 + likes, 1 + dislikes) and candidates are ordered by their draws, so
+# liked items come first while little-shown ones still get tried. A user's own counts
+# are added to a prior from other users on the same diet, scaled down to at most
+# SNACK_BANDIT_PRIOR_WEIGHT votes.
+# Counts are kept in array('I') per (user, diet) and per diet, two slots per arm,
+# indexed through a shared name -> arm id table, and are updated in place as feedback
+# arrives. start() seeds them from snack_feedback. Each process keeps its own counts;
+# feedback received by another worker is picked up on the next restart.
+import asyncio
+import logging
+import random
+from array import array
+from typing import Dict, List, Optional, Sequence, Tuple
+from backend.config import settings
+from backend.crud_async import flush_snack_feedback, get_snack_feedback_counts
+from backend.database import AsyncSessionLocal
+from backend.snacks import Snack
+
+logger = logging.getLogger(__name__)
+
+_arms: Dict[str, int] = {}  # suggestion name -> arm id
+_user_counts: Dict[Tuple[int, str], array] = {}  # (user_id, diet) -> [likes, dislikes] per arm
+_diet_counts: Dict[str, array] = {}
+# (user_id, diet, suggestion) -> [likes, dislikes] not yet written
+_pending: Dict[Tuple[int, str, str], List[int]] = {}
+_flush_lock: Optional[asyncio.Lock] = None
+_task: Optional[asyncio.Task] = None
+
+def _arm(name: str) -> int:
+    arm = _arms.get(name)
+    if arm is None:
+        arm = _arms[name] = len(_arms)
+    return arm
+
+def _add(counts_by_key: dict, key, arm: int, likes: int, dislikes: int) -> None:
+    counts = counts_by_key.get(key)
+    if counts is None:
+        counts = counts_by_key[key] = array("I")
+    if len(counts) < 2 * arm + 2:
+        counts.extend([0] * (2 * arm + 2 - len(counts)))
+    counts[2 * arm] += likes
+    counts[2 * arm + 1] += dislikes
+
+def _get(counts: Optional[array], arm: int) -> Tuple[int, int]:
+    if counts is None or len(counts) < 2 * arm + 2:
+        return 0, 0
+    return counts[2 * arm], counts[2 * arm + 1]
+
+def _count(user_id: int, diet: str, suggestion: str, likes: int, dislikes: int) -> None:
+    arm = _arm(suggestion)
+    _add(_user_counts, (user_id, diet), arm, likes, dislikes)
+    _add(_diet_counts, diet, arm, likes, dislikes)
+
+def _sample(user_counts: Optional[array], diet_counts: Optional[array], name: str) -> float:
+    arm = _arms.get(name)
+    if arm is None:
+        return random.random()  # Beta(1, 1): nobody has rated it yet
+    user_likes, user_dislikes = _get(user_counts, arm)
+    diet_likes, diet_dislikes = _get(diet_counts, arm)
+    others_likes, others_dislikes = diet_likes - user_likes, diet_dislikes - user_dislikes
+    others = others_likes + others_dislikes
+    scale = min(1.0, settings.SNACK_BANDIT_PRIOR_WEIGHT / others) if others else 0.0
+    return random.betavariate(1 + user_likes + others_likes * scale, 1 + user_dislikes + others_dislikes * scale)
+
+def rank(user_id: int, diet: str, candidates: Sequence[Snack]) -> List[Snack]:
+    """Candidates ordered by a fresh draw of each one's like rate, best first."""
+    user_counts = _user_counts.get((user_id, diet))
+    diet_counts = _diet_counts.get(diet)
+    samples = {snack.name: _sample(user_counts, diet_counts, snack.name) for snack in candidates}
+    return sorted(candidates, key=lambda snack: samples[snack.name], reverse=True)
+
+async def record(user_id: int, diet: str, suggestion: str, liked: bool) -> None:
+    """Count one like/dislike now and queue it for the next batched write."""
+    likes, dislikes = (1, 0) if liked else (0, 1)
+    _count(user_id, diet, suggestion, likes, dislikes)
+    key = (user_id, diet, suggestion)
+    pending = _pending.get(key)
+    if pending is None:
+        if len(_pending) >= settings.SNACK_FEEDBACK_MAX_PENDING:
+            await flush()  # Bounded: a full buffer is written out before it grows
+        pending = _pending.setdefault(key, [0, 0])
+    pending[0] += likes
+    pending[1] += dislikes
+
+async def flush() -> int:
+    """Write buffered feedback; returns the number of rows upserted."""
+    if _flush_lock is None or not _pending:
+        return 0
+    async with _flush_lock:
+        keys = list(_pending)
+        counts = [_pending.pop(key) for key in keys]
+        if not keys:
+            return 0
+        rows = [
+            {"user_id": user_id, "diet": diet, "suggestion": suggestion, "likes": likes, "dislikes": dislikes}
+            for (user_id, diet, suggestion), (likes, dislikes) in zip(keys, counts)
+        ]
+        try:
+            async with AsyncSessionLocal() as db:
+                await flush_snack_feedback(db, rows)
+        except Exception:
+            # Put them back, merged with feedback buffered meanwhile
+            for key, (likes, dislikes) in zip(keys, counts):
+                pending = _pending.setdefault(key, [0, 0])
+                pending[0] += likes
+                pending[1] += dislikes
+            raise
+        return len(rows)
+
+async def _load() -> None:
+    _arms.clear()
+    _user_counts.clear()
+    _diet_counts.clear()
+    async with AsyncSessionLocal() as db:
+        rows = await get_snack_feedback_counts(db)
+    for row in rows:
+        _count(row.user_id, row.diet, row.suggestion, row.likes, row.dislikes)
+    logger.info("Loaded snack feedback", extra={"fields": {"rows": len(rows), "arms": len(_arms)}})
+
+async def _run() -> None:
+    while True:
+        await asyncio.sleep(settings.SNACK_FEEDBACK_FLUSH_SECONDS)
+        try:
+            await flush()
+        except Exception:
+            logger.exception("Snack feedback flush failed", extra={"fields": {"pending": len(_pending)}})
+
+async def start() -> None:
+    global _flush_lock, _task
+    if _task is None:
+        _flush_lock = asyncio.Lock()
+        await _load()
+        _task = asyncio.get_running_loop().create_task(_run())
+
+async def stop() -> None:
+    global _task
+    if _task is not None:
+        _task.cancel()
+        try:
+            await _task
+        except asyncio.CancelledError:
+            pass
+        _task = None
+    try:
+        await flush()
+    except Exception:
+        logger.exception("Final snack feedback flush failed", extra={"fields": {"pending": len(_pending)}})
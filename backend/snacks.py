@@ -0,0 +1,173 @@
+# backend/snacks.py
+# Snack/drink suggestions for /suggest-snack and the dashboard insights.
+# snacks.json (diet -> mood state -> "quick"/"meal" -> items) is parsed once into an
+# index keyed by (diet, mood, size, type filter, protein filter), so finding a request's
+# candidates is one dict lookup (backend.snack_feedback ranks them). Every filter
+# combination is precomputed, falling back to a wider bucket when nothing matches,
+# so a lookup never comes back empty.
+# A background task re-reads the file when its mtime changes; a file that fails to
+# parse is logged and the previous index stays in use.
+import asyncio
+import json
+import logging
+from itertools import product
+from pathlib import Path
+from typing import Dict, NamedTuple, Optional, Tuple, Union
+from backend.config import settings
+
+logger = logging.getLogger(__name__)
+
+MOODS = ("tired", "stressed", "focused", "default")
+SIZES = ("quick", "meal")
+TYPES = (None, "snack", "meal", "drink")
+PROTEIN = (None, True, False)
+
+DEFAULT_DIET = "vegetarian"
+# Profile diets snacks.json has no section for: (diet to use, default protein filter)
+DIET_FALLBACKS = {
+    "protein-focused": ("vegetarian", True),
+    "balanced": ("vegetarian", None),
+    "other": ("vegetarian", None),
+}
+
+class Snack(NamedTuple):
+    name: str
+    type: str
+    protein: bool
+
+Key = Tuple[str, str, str, Optional[str], Optional[bool]]
+
+_index: Optional[Dict[Key, Tuple[Snack, ...]]] = None
+_names: Dict[str, frozenset] = {}  # diet -> item names, for validating feedback
+_mtime: Optional[int] = None
+_task: Optional[asyncio.Task] = None
+
+def path() -> Path:
+    return Path(settings.SNACKS_FILE) if settings.SNACKS_FILE else Path(__file__).with_name("snacks.json")
+
+def _matches(snack: Snack, type_: Optional[str], protein: Optional[bool]) -> bool:
+    return (type_ is None or snack.type == type_) and (protein is None or snack.protein == protein)
+
+def build_index(data: dict) -> Dict[Key, Tuple[Snack, ...]]:
+    """Precompute every (diet, mood, size, type, protein) lookup; raises ValueError on a malformed file."""
+    if not isinstance(data, dict) or not data:
+        raise ValueError("snacks file must map diets to mood sections")
+    index: Dict[Key, Tuple[Snack, ...]] = {}
+    for diet, moods in data.items():
+        if not isinstance(moods, dict) or "default" not in moods:
+            raise ValueError(f"diet {diet!r} needs a 'default' mood section")
+        buckets = {}
+        for mood in MOODS:
+            sizes = moods.get(mood, moods["default"])
+            for size in SIZES:
+                items = sizes.get(size) or sizes.get(SIZES[1 - SIZES.index(size)]) or []
+                buckets[mood, size] = tuple(
+                    Snack(item["name"], item.get("type", "snack"), bool(item.get("protein", False)))
+                    for item in items
+                )
+        if not buckets["default", "quick"]:
+            raise ValueError(f"diet {diet!r} has no default suggestions")
+        for mood, size, type_, protein in product(MOODS, SIZES, TYPES, PROTEIN):
+            # Narrowest bucket with a match wins: this mood and size, this mood in either
+            # size, the default mood, and finally the unfiltered bucket
+            candidates = (
+                buckets[mood, size],
+                buckets[mood, size] + buckets[mood, SIZES[1 - SIZES.index(size)]],
+                buckets["default", size] + buckets["default", SIZES[1 - SIZES.index(size)]],
+            )
+            for bucket in candidates:
+                matched = tuple(snack for snack in bucket if _matches(snack, type_, protein))
+                if matched:
+                    break
+            else:
+                matched = buckets[mood, size] or buckets["default", size] or buckets["default", "quick"]
+            index[diet, mood, size, type_, protein] = matched
+    return index
+
+def load() -> bool:
+    """(Re)build the index if the file changed since the last load; returns True if it did."""
+    global _index, _names, _mtime
+    file = path()
+    try:
+        mtime = file.stat().st_mtime_ns
+        if mtime == _mtime and _index is not None:
+            return False
+        with file.open(encoding="utf-8") as f:
+            index = build_index(json.load(f))
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        if _index is None:
+            raise
+        logger.exception("Keeping previous snack index", extra={"fields": {"path": str(file)}})
+        return False
+    names: Dict[str, set] = {}
+    for key, items in index.items():
+        names.setdefault(key[0], set()).update(snack.name for snack in items)
+    _index, _names, _mtime = index, {diet: frozenset(items) for diet, items in names.items()}, mtime
+    logger.info("Loaded snack index", extra={"fields": {"path": str(file), "keys": len(index)}})
+    return True
+
+def index() -> Dict[Key, Tuple[Snack, ...]]:
+    if _index is None:
+        load()
+    return _index
+
+def mood_bucket(mood: Union[str, float, None], tiredness_level: Optional[int] = None) -> str:
+    if tiredness_level is not None and tiredness_level >= 7:
+        return "tired"
+    if isinstance(mood, str):
+        mood = mood.strip().lower()
+        return mood if mood in MOODS else "default"
+    if mood is None:
+        return "default"
+    if mood >= 4:
+        return "focused"
+    return "stressed" if mood <= 2 else "default"
+
+def size_bucket(session_duration: Optional[int]) -> str:
+    return "meal" if session_duration and session_duration >= settings.SNACK_MEAL_AFTER_MINUTES else "quick"
+
+def resolve_diet(diet_preference: Optional[str]) -> Tuple[str, Optional[bool]]:
+    """Diet section to use for a profile's diet_preference, and its default protein filter."""
+    index()
+    if diet_preference in _names:
+        return diet_preference, None
+    diet, protein = DIET_FALLBACKS.get(diet_preference, (DEFAULT_DIET, None))
+    return (diet if diet in _names else min(_names)), protein
+
+def is_known(diet: str, name: str) -> bool:
+    index()
+    return name in _names.get(diet, ())
+
+def candidates(
+    diet_preference: Optional[str],
+    mood: str = "default",
+    size: str = "quick",
+    type_: Optional[str] = None,
+    protein: Optional[bool] = None,
+) -> Tuple[str, Tuple[Snack, ...]]:
+    diet, default_protein = resolve_diet(diet_preference)
+    return diet, index()[diet, mood, size, type_, default_protein if protein is None else protein]
+
+async def _run() -> None:
+    while True:
+        await asyncio.sleep(settings.SNACKS_RELOAD_SECONDS)
+        try:
+            load()
+        except Exception:
+            logger.exception("Snack index reload failed")
+
+def start() -> None:
+    global _task
+    load()  # Fail at startup, not on the first request, if the file is broken
+    if settings.SNACKS_RELOAD_SECONDS > 0 and _task is None:
+        _task = asyncio.get_running_loop().create_task(_run())
+
+async def stop() -> None:
+    global _task
+    if _task is not None:
+        _task.cancel()
+        try:
+            await _task
+        except asyncio.CancelledError:
+            pass
+        _task = None
@@ -0,0 +1,50 @@
+# backend/user_versions.py
+# Per-user data version, bumped after every committed write for that user
+# (backend.crud_async, backend.hydration_buffer). Anything derived from a user's
+# data can be tagged with (EPOCH, user id, version) and reused until it changes;
+# backend.http_cache builds ETags from it.
+# Counters live in this process: run a single worker per database, or move them to
+# a shared store before scaling out, or other workers' writes go unnoticed here.
+# EPOCH changes on restart, so tags issued by a previous process never match.
+# Only the USER_VERSIONS_MAX_USERS most recently used users are kept. Versions come
+# from one process-wide counter, so a user whose entry was evicted comes back with a
+# number never handed out before: like a restart, their next tag is fresh and old
+# tags stop matching (a cache miss, never a stale hit).
+# Each version also records when it was assigned: backend.replicas keeps a user on
+# the primary while it is newer than READ_YOUR_WRITES_SECONDS, so a new tag is never
+# paired with a body from a replica that hasn't caught up.
+import itertools
+import secrets
+import threading
+import time
+from typing import Tuple
+from backend.cache import TTLCache
+from backend.config import settings
+
+EPOCH = secrets.token_hex(4)
+
+_counter = itertools.count(1)
+# user id -> (version, time.monotonic() when it was assigned)
+_versions = TTLCache(settings.USER_VERSIONS_MAX_USERS, float("inf"))
+_lock = threading.Lock()
+
+def _entry(user_id: int) -> Tuple[int, float]:
+    entry = _versions.get(user_id)
+    if entry is None:
+        entry = (next(_counter), time.monotonic())
+        _versions.set(user_id, entry)
+    return entry
+
+def bump(user_id: int) -> None:
+    with _lock:
+        _versions.set(user_id, (next(_counter), time.monotonic()))
+
+def get(user_id: int) -> int:
+    with _lock:
+        return _entry(user_id)[0]
+
+def changed_within(user_id: int, seconds: float) -> bool:
+    """Whether the user's version is younger than `seconds` (a version first handed
+    out now, e.g. after an eviction, counts as a change)."""
+    with _lock:
+        return time.monotonic() - _entry(user_id)[1] < seconds
@@ -0,0 +1,92 @@
+# backend/write_queue.py
+# Single-writer queue for SQLite. SQLite allows one writer at a time; concurrent
+# requests committing through their own connections otherwise spin on busy_timeout
+# (or fail with "database is locked") while holding a pooled connection. Here every
+# write from backend.crud_async is queued and run by one worker task, in arrival
+# order, on the caller's session, so writes never contend while reads keep running
+# concurrently on their own connections (WAL).
+# Each write runs in a task created in the caller's context, so ContextVars (the
+# request's query metrics, see backend/metrics.py) see it as part of the request.
+# A caller cancelled while its write is queued drops it; once the write is running
+# on the caller's session, the caller waits for it to finish before the cancellation
+# propagates, so the request never closes the session while the worker still uses it.
+# Only started for SQLite with SQLITE_SINGLE_WRITER; otherwise run() calls
+# run_sync directly.
+import asyncio
+import contextvars
+import logging
+from typing import Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from backend.config import settings
+from backend.database import async_engine
+
+logger = logging.getLogger(__name__)
+
+_queue: Optional[asyncio.Queue] = None
+_task: Optional[asyncio.Task] = None
+
+class _Job:
+    __slots__ = ("db", "fn", "args", "context", "future", "task")
+
+    def __init__(self, db: AsyncSession, fn, args):
+        self.db = db
+        self.fn = fn
+        self.args = args
+        self.context = contextvars.copy_context()
+        self.future = asyncio.get_running_loop().create_future()
+        self.task: Optional[asyncio.Task] = None  # Set once the worker starts the write
+
+async def _worker() -> None:
+    while True:
+        job = await _queue.get()
+        try:
+            if not job.future.cancelled():  # Caller gave up while queued
+                job.task = job.context.run(asyncio.ensure_future, job.db.run_sync(job.fn, *job.args))
+                result = await job.task
+                if not job.future.cancelled():
+                    job.future.set_result(result)
+        except Exception as e:
+            if not job.future.cancelled():
+                job.future.set_exception(e)
+        finally:
+            _queue.task_done()
+
+async def run(db: AsyncSession, fn, *args):
+    """AsyncSession.run_sync(fn, *args), serialized with every other queued write."""
+    if _queue is None:
+        return await db.run_sync(fn, *args)
+    job = _Job(db, fn, args)
+    await _queue.put(job)  # Waits when the queue is full
+    try:
+        return await asyncio.shield(job.future)
+    except asyncio.CancelledError:
+        job.future.cancel()
+        while job.task is not None and not job.task.done():
+            try:
+                await asyncio.wait({job.task})
+            except asyncio.CancelledError:
+                pass  # Cancelled again; still not safe to hand the session back
+        raise
+
+def depth() -> int:
+    return _queue.qsize() if _queue is not None else 0
+
+def start(enabled: Optional[bool] = None) -> None:
+    global _queue, _task
+    if enabled is None:
+        enabled = settings.SQLITE_SINGLE_WRITER and async_engine.dialect.name == "sqlite"
+    if enabled and _task is None:
+        _queue = asyncio.Queue(maxsize=settings.SQLITE_WRITE_QUEUE_SIZE)
+        _task = asyncio.get_running_loop().create_task(_worker())
+
+async def stop() -> None:
+    global _queue, _task
+    if _task is not None:
+        await _queue.join()  # Let queued writes finish
+        _task.cancel()
+        try:
+            await _task
+        except asyncio.CancelledError:
+            pass
+        _queue = None
+        _task = None
@@ -6,10 +6,13 @@ const Chatbot = ({ userId, mood, sessionDuration }) => {
 
   const fetchSnackSuggestion = async () => {
     try {
+      const token = localStorage.getItem('token') || sessionStorage.getItem('token');
       const response = await axios.post('http://localhost:8000/suggest-snack', {
         user_id: userId,
         mood,
         session_duration: sessionDuration,
+      }, {
+        headers: { Authorization: `Bearer ${token}` },
       });
       setMessages([...messages, {
         sender: 'bot',
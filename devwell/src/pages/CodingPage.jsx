@@ -7,6 +7,7 @@ import 'react-toastify/dist/ReactToastify.css';
 import { BarChart, Bar, XAxis, YAxis, CartesianGrid, Tooltip, Legend } from 'recharts';
 import { cn } from '../lib/utils';
 import { timerService } from '../utils/timerService';
+import { liveUpdates } from '../utils/liveUpdates';
 import { useNavigate } from 'react-router-dom';
 
 const API_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000';
@@ -30,6 +31,36 @@ export const CodingPage = () => {
   const favoriteSnack = 'Dark Chocolate Almonds';
   const optimalSessionLength = 25 * 60; // 25 minutes in seconds
 
+  // Newest first, four at most
+  const latestSessions = (sessions) =>
+    sessions.sort((a, b) => new Date(b.created_at) - new Date(a.created_at)).slice(0, 4);
+
+  const refreshWeeklySessions = async () => {
+    const token = localStorage.getItem('token') || sessionStorage.getItem('token');
+    const response = await fetch(`${API_URL}/api/coding/weekly-trends`, {
+      headers: { Authorization: `Bearer ${token}`, 'Content-Type': 'application/json' },
+    });
+    if (response.ok) {
+      setWeeklySessions(latestSessions(await response.json()));
+    }
+    return response.ok;
+  };
+
+  // Live updates: sessions saved from any tab are added as they arrive, so logging
+  // does not refetch the whole week
+  useEffect(() => {
+    const unsubscribeEntry = liveUpdates.subscribe('entry', ({ kind, entry }) => {
+      if (kind === 'coding') setWeeklySessions((prev) => latestSessions([entry, ...prev]));
+    });
+    const unsubscribeResync = liveUpdates.subscribe('resync', () => {
+      refreshWeeklySessions().catch((err) => console.error('Fetch error for sessions:', err));
+    });
+    return () => {
+      unsubscribeEntry();
+      unsubscribeResync();
+    };
+  }, []);
+
   // Update theme
   useEffect(() => {
     if (isDark) {
@@ -194,17 +225,8 @@ export const CodingPage = () => {
         setIsTracking(false); // Ensure tracking is stopped after saving
         setNotes('');
 
-        // Refresh weekly sessions
-        const trendsResponse = await fetch(`${API_URL}/api/coding/weekly-trends`, {
-          headers: { Authorization: `Bearer ${token}`, 'Content-Type': 'application/json' },
-        });
-        if (trendsResponse.ok) {
-          const data = await trendsResponse.json();
-          const sortedSessions = data
-            .sort((a, b) => new Date(b.created_at) - new Date(a.created_at))
-            .slice(0, 4);
-          setWeeklySessions(sortedSessions);
-        } else {
+        // The live stream delivers the new session; refetch only when it is not open
+        if (!liveUpdates.isConnected() && !(await refreshWeeklySessions())) {
           setError('Failed to refresh coding sessions');
           toast.error('Failed to refresh coding sessions');
         }
@@ -8,6 +8,7 @@ import { Button } from '../components/ui/Button';
 import { Moon, Sun } from 'lucide-react';
 import { toast } from 'react-toastify';
 import { timerService } from '../utils/timerService';
+import { liveUpdates } from '../utils/liveUpdates';
 
 const API_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000';
 
@@ -94,26 +95,33 @@ export const Dashboard = () => {
       }
 
       try {
-        // Fetch dashboard stats
-        const statsResponse = await fetch(`${API_URL}/api/dashboard/stats`, {
+        // Fetch stats, latest entries, today's coding totals and recent trends in one request
+        const overviewResponse = await fetch(`${API_URL}/api/dashboard/overview?trend_limit=4`, {
           headers: {
             Authorization: `Bearer ${token}`,
             'Content-Type': 'application/json',
           },
         });
-        if (statsResponse.ok) {
-          const data = await statsResponse.json();
-          console.log('Dashboard stats response:', data); // Debug
+        if (overviewResponse.ok) {
+          const data = await overviewResponse.json();
+          console.log('Dashboard overview response:', data); // Debug
           setStats({
-            mood_score: data.mood_score || 0,
-            hydration_glasses: data.hydration_glasses || 0,
-            hydration_goal: data.hydration_goal || 8,
-            steps: data.steps || 0,
-            coding_sessions: data.coding_sessions || 0,
-            focus_time: data.focus_time || 0,
+            mood_score: 0,
+            hydration_glasses: data.latest_hydration?.water_glasses || 0,
+            hydration_goal: data.latest_hydration?.daily_goal || 8,
+            steps: 0,
+            coding_sessions: data.today_coding.sessions,
+            focus_time: data.today_coding.minutes,
           });
           setInsights(data.insights || []);
-        } else if (statsResponse.status === 401) {
+          // Trends arrive newest first, already limited to 4 per domain
+          setWeeklyTrends({
+            mood: data.trends.mood || [],
+            hydration: data.trends.hydration || [],
+            coding: data.trends.coding || [],
+          });
+          setLatestMood(data.latest_mood ? data.latest_mood.mood_score : null);
+        } else if (overviewResponse.status === 401) {
           localStorage.removeItem('token');
           sessionStorage.removeItem('token');
           toast.error('Session expired. Please log in again.');
@@ -122,104 +130,11 @@ export const Dashboard = () => {
           }, 1500);
           return;
         } else {
-          const errorData = await statsResponse.json();
-          console.error('Stats API error:', errorData);
+          const errorData = await overviewResponse.json();
+          console.error('Overview API error:', errorData);
           setError('Failed to load dashboard data');
           toast.error(`Failed to load dashboard data: ${errorData.detail || 'Unknown error'}`);
         }
-
-        // Fetch weekly trends
-        const trendEndpoints = [
-          '/api/mood/weekly-trends',
-          '/api/hydration/weekly-trends',
-          '/api/coding/weekly-trends',
-        ];
-        const trendResponses = await Promise.all(
-          trendEndpoints.map((endpoint) =>
-            fetch(`${API_URL}${endpoint}`, {
-              headers: {
-                Authorization: `Bearer ${token}`,
-                'Content-Type': 'application/json',
-              },
-            })
-          )
-        );
-        const [moodTrends, hydrationTrends, codingTrends] = await Promise.all(
-          trendResponses.map(async (res, index) => {
-            if (res.ok) {
-              const data = await res.json();
-              console.log(`Trends response (${trendEndpoints[index]}):`, data); // Debug
-              // Sort by created_at descending and take first 4
-              return data.sort((a, b) => new Date(b.created_at) - new Date(a.created_at)).slice(0, 4);
-            }
-            console.error(`Trend API error (${res.url}):`, await res.json());
-            return []; // Return empty array on error
-          })
-        );
-
-        // Calculate today's coding sessions and focus time from trends
-        const today = new Date().toISOString().split('T')[0];
-        const todayCodingSessions = codingTrends.filter(
-          (trend) => new Date(trend.created_at).toISOString().split('T')[0] === today
-        );
-        const codingSessionsCount = todayCodingSessions.length;
-        const focusTimeMinutes = todayCodingSessions.reduce((sum, trend) => sum + (trend.duration_minutes || 0), 0);
-
-        setWeeklyTrends({
-          mood: moodTrends || [],
-          hydration: hydrationTrends || [],
-          coding: codingTrends || [],
-        });
-
-        // Update stats with today's coding data
-        setStats((prev) => ({
-          ...prev,
-          coding_sessions: codingSessionsCount,
-          focus_time: focusTimeMinutes,
-        }));
-
-        // Fetch latest mood
-        const moodResponse = await fetch(`${API_URL}/api/mood/latest`, {
-          headers: {
-            Authorization: `Bearer ${token}`,
-            'Content-Type': 'application/json',
-          },
-        });
-        if (moodResponse.ok) {
-          const data = await moodResponse.json();
-          console.log('Latest mood response:', data); // Debug
-          setLatestMood(data.mood_score !== undefined ? data.mood_score : null);
-        } else {
-          const errorData = await moodResponse.json();
-          console.error('Mood API error:', errorData);
-          if (errorData.detail === 'No mood logs found') {
-            setLatestMood(null); // Handle no mood logs gracefully
-          } else {
-            setError(`Failed to load latest mood: ${errorData.detail || 'Unknown error'}`);
-            toast.error(`Failed to load latest mood: ${errorData.detail || 'Unknown error'}`);
-          }
-        }
-
-        // Fetch latest hydration
-        const hydrationResponse = await fetch(`${API_URL}/api/hydration/latest`, {
-          headers: {
-            Authorization: `Bearer ${token}`,
-            'Content-Type': 'application/json',
-          },
-        });
-        if (hydrationResponse.ok) {
-          const data = await hydrationResponse.json();
-          console.log('Latest hydration response:', data); // Debug
-          setStats((prev) => ({
-            ...prev,
-            hydration_glasses: data.water_glasses || 0,
-            hydration_goal: data.daily_goal || 8,
-          }));
-        } else {
-          const errorData = await hydrationResponse.json();
-          console.error('Hydration API error:', errorData);
-          toast.error(`Failed to load latest hydration: ${errorData.detail || 'Unknown error'}`);
-        }
       } catch (err) {
         console.error('Fetch error:', err);
         setError('An error occurred while fetching data');
@@ -230,6 +145,25 @@ export const Dashboard = () => {
     };
 
     fetchDashboardData();
+
+    // Live updates: apply deltas from logs saved in any tab instead of reloading the overview
+    const unsubscribers = [
+      liveUpdates.subscribe('entry', ({ kind, entry }) => {
+        if (!['mood', 'hydration', 'coding'].includes(kind)) return;
+        setWeeklyTrends((prev) => ({ ...prev, [kind]: [entry, ...prev[kind]].slice(0, 4) }));
+        if (kind === 'mood') setLatestMood(entry.mood_score);
+        if (kind === 'hydration') {
+          setStats((prev) => ({ ...prev, hydration_glasses: entry.water_glasses, hydration_goal: entry.daily_goal }));
+        }
+      }),
+      liveUpdates.subscribe('day', (day) => {
+        if (!day) return;
+        setStats((prev) => ({ ...prev, coding_sessions: day.coding_sessions, focus_time: day.coding_minutes }));
+      }),
+      liveUpdates.subscribe('stats', (data) => setInsights(data.insights || [])),
+      liveUpdates.subscribe('resync', fetchDashboardData),
+    ];
+    return () => unsubscribers.forEach((unsubscribe) => unsubscribe());
   }, [navigate]);
 
   const toggleTheme = () => setIsDark(!isDark);
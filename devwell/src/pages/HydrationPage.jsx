@@ -3,6 +3,7 @@ import { Button } from '../components/ui/Button';
 import { Card, CardHeader, CardTitle, CardDescription, CardContent } from '../components/ui/Card';
 import { Coffee, Droplet, RotateCcw, Send } from 'lucide-react';
 import { hydrationService } from '../utils/hydrationService';
+import { liveUpdates } from '../utils/liveUpdates';
 const API_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000';
 
 export const HydrationPage = () => {
@@ -33,6 +34,32 @@ export const HydrationPage = () => {
 }, []);
 
 
+  const refreshWeeklyTrends = async () => {
+    const token = localStorage.getItem('token') || sessionStorage.getItem('token');
+    const response = await fetch(`${API_URL}/api/hydration/weekly-trends`, {
+      headers: { Authorization: `Bearer ${token}`, 'Content-Type': 'application/json' },
+    });
+    if (response.ok) {
+      setWeeklyTrends(await response.json());
+    }
+    return response.ok;
+  };
+
+  // Live updates: logs saved from any tab are appended as they arrive, so logging
+  // does not refetch the whole week
+  useEffect(() => {
+    const unsubscribeEntry = liveUpdates.subscribe('entry', ({ kind, entry }) => {
+      if (kind === 'hydration') setWeeklyTrends((prev) => [...prev, entry]);
+    });
+    const unsubscribeResync = liveUpdates.subscribe('resync', () => {
+      refreshWeeklyTrends().catch((err) => console.error('Fetch error for trends:', err));
+    });
+    return () => {
+      unsubscribeEntry();
+      unsubscribeResync();
+    };
+  }, []);
+
   useEffect(() => {
     if (isDark) {
       document.documentElement.classList.add('dark');
@@ -131,12 +158,8 @@ export const HydrationPage = () => {
         setGlasses(0);
         setCoffeeCups(0);
         setDailyGoal(8);
-        const trendsResponse = await fetch(`${API_URL}/api/hydration/weekly-trends`, {
-          headers: { Authorization: `Bearer ${token}`, 'Content-Type': 'application/json' },
-        });
-        if (trendsResponse.ok) {
-          setWeeklyTrends(await trendsResponse.json());
-        } else {
+        // The live stream delivers the new entry; refetch only when it is not open
+        if (!liveUpdates.isConnected() && !(await refreshWeeklyTrends())) {
           setError('Failed to refresh hydration trends');
         }
       } else if (response.status === 401) {
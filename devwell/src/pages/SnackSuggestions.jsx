@@ -8,10 +8,13 @@ const SnackSuggestion = ({ userId, mood, sessionDuration }) => {
   useEffect(() => {
     const fetchSuggestion = async () => {
       try {
+        const token = localStorage.getItem('token') || sessionStorage.getItem('token');
         const response = await axios.post('http://localhost:8000/suggest-snack', {
           user_id: userId,
           mood,
           session_duration: sessionDuration,
+        }, {
+          headers: { Authorization: `Bearer ${token}` },
         });
         setSuggestion(response.data.suggestion);
         setVisible(true);
@@ -30,10 +33,13 @@ const SnackSuggestion = ({ userId, mood, sessionDuration }) => {
 
   const logFeedback = async (liked) => {
     try {
+      const token = localStorage.getItem('token') || sessionStorage.getItem('token');
       await axios.post('http://localhost:8000/log-feedback', {
         user_id: userId,
         suggestion,
         liked,
+      }, {
+        headers: { Authorization: `Bearer ${token}` },
       });
       setVisible(false);
     } catch (error) {
@@ -0,0 +1,109 @@
+// src/utils/liveUpdates.js
+// Live updates from GET /api/events (Server-Sent Events). Read with fetch instead of
+// EventSource so the bearer token goes in a header rather than the URL.
+// Events: "entry" ({kind, entry}), "day" (today's rollup), "stats" (dashboard stats
+// and insights) and "resync" (refetch everything; the server dropped events we were
+// too slow to read).
+
+const API_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000';
+
+class LiveUpdates {
+  constructor() {
+    this.listeners = {}; // event name -> callbacks
+    this.controller = null;
+    this.connected = false;
+    this.retryMs = 3000;
+  }
+
+  // Subscribe to one event type; returns an unsubscribe function.
+  // The stream is open while at least one component is listening.
+  subscribe(event, callback) {
+    (this.listeners[event] = this.listeners[event] || []).push(callback);
+    this.connect();
+    return () => {
+      this.listeners[event] = this.listeners[event].filter(cb => cb !== callback);
+      if (!Object.values(this.listeners).some(callbacks => callbacks.length)) {
+        this.disconnect();
+      }
+    };
+  }
+
+  // True while deltas are arriving, so callers can skip refetching after a write
+  isConnected() {
+    return this.connected;
+  }
+
+  connect() {
+    if (this.controller) return;
+    const token = localStorage.getItem('token') || sessionStorage.getItem('token');
+    if (!token) return;
+    const controller = new AbortController();
+    this.controller = controller;
+    this.read(token, controller).then((retry) => {
+      this.connected = false;
+      if (this.controller !== controller) return; // disconnect() was called
+      this.controller = null;
+      if (!retry) return; // Signed out or too many tabs; pages keep refetching instead
+      // The server ends streams periodically, and after a drop we may have missed events
+      setTimeout(() => {
+        if (this.controller) return;
+        this.emit('resync', {});
+        this.connect();
+      }, this.retryMs);
+    });
+  }
+
+  disconnect() {
+    if (this.controller) {
+      this.controller.abort();
+      this.controller = null;
+    }
+    this.connected = false;
+  }
+
+  // Resolves when the stream ends: true if it is worth reconnecting
+  async read(token, controller) {
+    try {
+      const response = await fetch(`${API_URL}/api/events`, {
+        headers: { Authorization: `Bearer ${token}` },
+        signal: controller.signal,
+      });
+      if (!response.ok) return response.status >= 500;
+      this.connected = true;
+      const reader = response.body.pipeThrough(new TextDecoderStream()).getReader();
+      let buffer = '';
+      for (;;) {
+        const { value, done } = await reader.read();
+        if (done) return true;
+        buffer += value;
+        let end;
+        while ((end = buffer.indexOf('\n\n')) !== -1) {
+          this.dispatch(buffer.slice(0, end));
+          buffer = buffer.slice(end + 2);
+        }
+      }
+    } catch (error) {
+      if (error.name === 'AbortError') return false;
+      console.error('Live updates error:', error);
+      return true;
+    }
+  }
+
+  dispatch(message) {
+    let event = 'message';
+    let data = '';
+    for (const line of message.split('\n')) {
+      if (line.startsWith('event: ')) event = line.slice(7);
+      else if (line.startsWith('data: ')) data += line.slice(6);
+      else if (line.startsWith('retry: ')) this.retryMs = parseInt(line.slice(7), 10) || this.retryMs;
+    }
+    if (data) this.emit(event, JSON.parse(data));
+  }
+
+  emit(event, data) {
+    (this.listeners[event] || []).forEach(cb => cb(data));
+  }
+}
+
+// Export a single instance so all pages share one connection
+export const liveUpdates = new LiveUpdates();